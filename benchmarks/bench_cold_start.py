@@ -0,0 +1,98 @@
+"""
+Cold-start benchmark for the serverless entry point (vercel_api/api.py).
+
+Each run starts a fresh interpreter and measures:
+    import   - importing vercel_api.api (what the runtime does before the first request)
+    app      - importing src/app.py on first use
+    first    - first request end to end, including client creation and init_beanie
+    warm     - median of the following requests, which reuse the client
+
+Usage (from the repository root):
+    python benchmarks/bench_cold_start.py [--runs 5] [--mongo-uri mongodb+srv://...]
+
+Without --mongo-uri an in-memory mongomock client stands in for MongoDB, so
+"first" measures Beanie initialisation without network round trips.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def child(mongo_uri, index_setup):
+    started = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    os.environ["INDEX_SETUP_ON_STARTUP"] = "true" if index_setup else "false"
+    os.environ["MONGODB_URI"] = mongo_uri or "mongodb://localhost:27017"
+    from vercel_api import api
+    imported = time.perf_counter()
+
+    api.get_app()
+    app_loaded = time.perf_counter()
+
+    if not mongo_uri:
+        from mongomock_motor import AsyncMongoMockClient
+        import core.db
+
+        core.db.AsyncIOMotorClient = AsyncMongoMockClient
+
+    import httpx
+
+    async def serve():
+        # The ASGI `app` the runtime calls, one request at a time on one loop
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="https://bench.local") as client:
+            response = await client.get("/api/v1/movies/", params={"limit": 20})
+            assert response.status_code == 200, response.text
+            first_done = time.perf_counter()
+
+            warm = []
+            for _ in range(20):
+                begin = time.perf_counter()
+                await client.get("/api/v1/movies/", params={"limit": 20})
+                warm.append(time.perf_counter() - begin)
+        return first_done, warm
+
+    first_done, warm = asyncio.run(serve())
+
+    print(json.dumps({
+        "import": imported - started,
+        "app": app_loaded - imported,
+        "first": first_done - app_loaded,
+        "warm": statistics.median(warm),
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--mongo-uri", default=None)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--index-setup", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.mongo_uri, args.index_setup)
+        return
+
+    for index_setup in (False, True):
+        samples = []
+        for _ in range(args.runs):
+            command = [sys.executable, os.path.abspath(__file__), "--child"]
+            if args.mongo_uri:
+                command += ["--mongo-uri", args.mongo_uri]
+            if index_setup:
+                command.append("--index-setup")
+            output = subprocess.run(command, capture_output=True, text=True, check=True, cwd=ROOT).stdout
+            samples.append(json.loads(output.strip().splitlines()[-1]))
+
+        print(f"INDEX_SETUP_ON_STARTUP={'true' if index_setup else 'false'} (median of {args.runs} cold starts)")
+        for phase in ("import", "app", "first", "warm"):
+            print(f"  {phase:<7} {statistics.median(s[phase] for s in samples) * 1000:9.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Benchmark: CPU cost versus bytes saved by response compression.
+
+Part 1 serializes movie lists the way GET /movies does (serialize_movie +
+orjson) from a synthetic catalog with varied plot text and cast, and times
+gzip and brotli at several levels on each payload size.
+
+Part 2 drives the app in-process (httpx ASGI transport, mongomock database)
+with GET /movies?limit=100 and compares serving with no compression,
+compressing every response in the middleware, and precompressed cache entries.
+
+Usage (from the repository root):
+    python benchmarks/bench_compression.py [--movies 2000] [--requests 500]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import httpx
+from beanie import init_beanie
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+from core import compression
+from core.cache import ResponseCache, response_cache
+from core.config import settings
+from core.db import DOCUMENT_MODELS
+from core.serialization import dumps, serialize_movie
+from models.movie import title_key_of
+
+GENRES = ["Drama", "Comedy", "Action", "Thriller", "Horror", "Romance", "Sci-Fi", "Documentary", "Animation", "Crime"]
+WORDS = (
+    "a an the young old detective family city war love secret journey town mother father "
+    "friend stranger must find lost past dark night team small world against time island "
+    "murder heist revenge escape dream music school summer winter border ship star hidden "
+    "truth lie power fall rise last first home road river mountain king queen soldier"
+).split()
+
+def catalog(count, rng):
+    base = datetime(2020, 1, 1)
+    for i in range(count):
+        year = rng.randint(1950, 2024)
+        title = " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(1, 4)))
+        yield {
+            "_id": ObjectId(),
+            "title": title,
+            "title_key": title_key_of(title),
+            "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(25, 70))).capitalize() + ".",
+            "genres": rng.sample(GENRES, rng.randint(1, 3)),
+            "release_date": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "release_year": year,
+            "duration": rng.randint(80, 180),
+            "poster_url": f"https://image.example.com/t/p/w500/{rng.getrandbits(64):016x}.jpg",
+            "director": f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}",
+            "cast": [
+                {"name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}", "role": rng.choice(WORDS).title()}
+                for _ in range(rng.randint(3, 8))
+            ],
+            "language": rng.choice(["English", "French", "Hindi", "Japanese", "Spanish"]),
+            "country": rng.choice(["USA", "France", "India", "Japan", "Spain"]),
+            "rating": round(rng.uniform(1, 5), 1),
+            "rating_sum": 0,
+            "rating_count": rng.randint(0, 500),
+            "rating_histogram": {},
+            "status": "approved",
+            "featured": rng.random() < 0.05,
+            "created_at": base + timedelta(minutes=i),
+            "updated_at": base + timedelta(minutes=i),
+        }
+
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - started) / repeat
+
+def cpu_vs_bytes(docs):
+    codecs = [("gzip", level) for level in (1, 6, 9)]
+    if compression.brotli is not None:
+        codecs += [("br", quality) for quality in (1, 5, 9, 11)]
+    else:
+        print("  (brotli not installed: pip install brotli to include it)")
+    for size in (20, 100, 1000):
+        body = dumps([serialize_movie(doc) for doc in docs[:size]])
+        print(f"\n  {size} movies, {len(body) / 1024:,.1f} KiB of JSON")
+        for encoding, level in codecs:
+            repeat = 3 if (encoding, level) == ("br", 11) else 20
+            compressed, seconds = timed(lambda: compression.compress(body, encoding, level), repeat)
+            _, decode = timed(lambda: compression.decompress(compressed, encoding), repeat)
+            print(
+                f"    {encoding:<4} level {level:<2}  {len(compressed) / 1024:8.1f} KiB  "
+                f"saved {100 * (1 - len(compressed) / len(body)):5.1f}%  "
+                f"compress {seconds * 1000:7.2f} ms  decompress {decode * 1000:6.2f} ms"
+            )
+
+async def serve(client, requests, accept_encoding):
+    latency = []
+    sent = 0
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get("/api/v1/movies/", params={"limit": 100}, headers={"Accept-Encoding": accept_encoding})
+        latency.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.text
+        sent += int(response.headers["content-length"])
+    latency.sort()
+    return latency[len(latency) // 2] * 1000, sent / requests
+
+async def end_to_end(args, docs):
+    settings.RATE_LIMIT_ENABLED = False
+    settings.LOG_ACCESS = False
+    database = AsyncMongoMockClient()["bench"]
+    await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+    await database["movies"].insert_many(docs)
+
+    from app import app
+
+    original_storage = ResponseCache.__dict__["storage_encoding"]
+    setups = [
+        ("off", False, original_storage),
+        ("middleware per request", True, staticmethod(lambda body: None)),
+        ("precompressed cache entry", True, original_storage),
+    ]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"\n  GET /movies?limit=100 x {args.requests}, Accept-Encoding: gzip, response cache on")
+        for name, enabled, storage in setups:
+            settings.COMPRESSION_ENABLED = enabled
+            ResponseCache.storage_encoding = storage
+            await response_cache.bump(ResponseCache.LISTS)
+            p50, size = await serve(client, args.requests, "gzip")
+            print(f"    {name:<26} p50 {p50:6.2f} ms  {size / 1024:7.1f} KiB/response")
+    ResponseCache.storage_encoding = original_storage
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--movies", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    docs = list(catalog(args.movies, random.Random(args.seed)))
+    print(f"Compression CPU vs bytes (gzip level default {settings.COMPRESSION_GZIP_LEVEL}, "
+          f"brotli quality default {settings.COMPRESSION_BROTLI_QUALITY})")
+    cpu_vs_bytes(docs)
+    asyncio.run(end_to_end(args, docs))
+
+if __name__ == "__main__":
+    main()
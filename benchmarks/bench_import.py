@@ -0,0 +1,104 @@
+"""
+Throughput benchmark: bulk movie import.
+
+Compares one insert() per movie (what POST /movies does per request) with
+services.import_service.import_movies (chunked validation + unordered bulk upserts).
+
+Usage (from the repository root):
+    python benchmarks/bench_import.py [--movies 10000] [--chunk-size 1000] [--mongo-uri mongodb://localhost:27017]
+
+Without --mongo-uri only the client-side cost is measured (validating and building
+the write for each record), since mongomock upserts scan the whole collection and
+say nothing about server throughput. Pass a real server for the end-to-end numbers.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from beanie import init_beanie
+from models.movie import Movie
+from schemas.movie import CreateMovieRequest
+from services.import_service import _upsert, import_movies
+
+def make_records(count):
+    return [
+        {
+            "title": f"Movie {i}",
+            "description": "A long description of the plot. " * 8,
+            "genres": ["Drama", "Crime"],
+            "release_date": f"{1950 + i % 70}-09-23",
+            "duration": 142,
+            "director": "Frank Darabont",
+            "cast": [{"name": f"Actor {j}", "role": f"Role {j}"} for j in range(6)],
+            "language": "English",
+        }
+        for i in range(count)
+    ]
+
+async def one_by_one(records):
+    for record in records:
+        await Movie(**record, status="pending").insert()
+
+async def bulk(records, chunk_size):
+    report = await import_movies(enumerate(records), chunk_size=chunk_size)
+    assert report["failed"] == 0, report["errors"][:5]
+
+def prepare_documents(records):
+    return [Movie(**record, status="pending") for record in records]
+
+def prepare_upserts(records):
+    now = datetime.utcnow()
+    return [_upsert(CreateMovieRequest.model_validate(record), "pending", now) for record in records]
+
+async def client_side(args):
+    from mongomock_motor import AsyncMongoMockClient
+
+    # Document classes need Beanie initialised to be constructed; an in-memory stand-in is enough
+    await init_beanie(database=AsyncMongoMockClient()["bench"], document_models=[Movie])
+    records = make_records(args.movies)
+    for name, fn in (("Movie(**record)", prepare_documents), ("import_movies prep", prepare_upserts)):
+        best = min(timeit.repeat(lambda: fn(records), number=1, repeat=5))
+        print(f"{name:<20} {best:8.2f} s  {args.movies / best:10,.0f} docs/s")
+
+async def run(args):
+    if not args.mongo_uri:
+        await client_side(args)
+        return
+
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(args.mongo_uri)
+    await init_beanie(database=client["cinecheck_bench_import"], document_models=[Movie])
+    records = make_records(args.movies)
+
+    for name, fn in (("insert() per movie", one_by_one), ("import_movies", lambda r: bulk(r, args.chunk_size))):
+        await Movie.get_motor_collection().delete_many({})
+        started = time.perf_counter()
+        await fn(records)
+        elapsed = time.perf_counter() - started
+        print(f"{name:<20} {elapsed:8.2f} s  {args.movies / elapsed:10,.0f} docs/s")
+
+    # Re-importing the same titles updates in place instead of duplicating
+    started = time.perf_counter()
+    await bulk(records, args.chunk_size)
+    elapsed = time.perf_counter() - started
+    print(f"{'re-import (upsert)':<20} {elapsed:8.2f} s  {args.movies / elapsed:10,.0f} docs/s")
+    assert await Movie.get_motor_collection().count_documents({}) == args.movies
+
+    await client.drop_database("cinecheck_bench_import")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--movies", type=int, default=10000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--mongo-uri", default=None)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
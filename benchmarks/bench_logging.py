@@ -0,0 +1,114 @@
+"""
+Benchmark: what does logging cost per request?
+
+Drives the app in-process (httpx ASGI transport, mongomock database) with
+concurrent GET /movies/{id} requests and reports mean latency and throughput
+for three setups, all writing an access line per request to the same sink:
+
+  off      no log output at all (baseline)
+  queue    core.log pipeline: bounded queue + background writer thread
+  inline   a plain StreamHandler writing on the event loop, like print() did
+
+`--sink-delay-ms` makes every write to the sink block for that long, the
+way stdout does when the log collector falls behind.
+
+Usage (from the repository root):
+    python benchmarks/bench_logging.py [--requests 2000] [--concurrency 16] [--sink-delay-ms 0.2]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import httpx
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+from core import log
+from core.config import settings
+from core.db import DOCUMENT_MODELS
+from models.movie import Movie
+
+class SlowSink:
+    """A stream whose writes block like a congested pipe"""
+    def __init__(self, delay):
+        self.delay = delay
+        self.lines = 0
+
+    def write(self, text):
+        if self.delay:
+            time.sleep(self.delay)
+        self.lines += text.count("\n")
+
+    def flush(self):
+        pass
+
+def configure(mode, sink):
+    root = logging.getLogger()
+    log.shutdown_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    settings.LOG_ACCESS = mode != "off"
+    if mode == "queue":
+        log.setup_logging(fmt="json", stream=sink)
+    elif mode == "inline":
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(log.JsonFormatter())
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+
+async def run(client, path, requests, concurrency):
+    latency = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(path)
+            assert response.status_code == 200, response.text
+            latency.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latency, time.perf_counter() - started
+
+async def main_async(args):
+    settings.RATE_LIMIT_ENABLED = False
+    # Only the app's own lines; the client's per-request INFO line would double the volume
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    await init_beanie(database=AsyncMongoMockClient()["bench"], document_models=DOCUMENT_MODELS)
+    movie = Movie(title="Benchmark", description="desc", genres=["Drama"], status="approved")
+    await movie.insert()
+
+    from app import app
+
+    transport = httpx.ASGITransport(app=app)
+    path = f"/api/v1/movies/{movie.id}"
+    baseline = None
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await run(client, path, 200, args.concurrency)  # warm up (and fill the response cache)
+        print(f"{args.requests} x GET /movies/{{id}}, concurrency {args.concurrency}, sink delay {args.sink_delay_ms} ms/write")
+        for mode in ("off", "queue", "inline"):
+            sink = SlowSink(args.sink_delay_ms / 1000)
+            configure(mode, sink)
+            latency, elapsed = await run(client, path, args.requests, args.concurrency)
+            log.shutdown_logging()
+            mean_us = sum(latency) / len(latency) * 1e6
+            baseline = baseline if baseline is not None else mean_us
+            print(
+                f"  {mode:<7} mean {mean_us:8.0f} µs  overhead {mean_us - baseline:+7.0f} µs/request  "
+                f"{args.requests / elapsed:7.0f} req/s  lines written {sink.lines}"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--sink-delay-ms", type=float, default=0.2)
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
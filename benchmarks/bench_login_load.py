@@ -0,0 +1,100 @@
+"""
+Load test: do concurrent logins slow down other endpoints?
+
+Drives the app in-process (httpx ASGI transport, mongomock database) with a
+stream of concurrent POST /auth/login requests while a second client keeps
+reading GET /movies on a fixed schedule. Reports p50/p95/p99 latency of both,
+once with bcrypt on the worker pool (core.passwords) and once with bcrypt run
+inline on the event loop for comparison.
+
+Usage (from the repository root):
+    python benchmarks/bench_login_load.py [--logins 40] [--concurrency 8] [--rounds 12]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import httpx
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+from core import passwords
+from core.config import settings
+from core.db import DOCUMENT_MODELS
+from models.movie import Movie
+from models.user import User
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    return f"p50 {pick(0.50):7.1f} ms  p95 {pick(0.95):7.1f} ms  p99 {pick(0.99):7.1f} ms"
+
+async def run_load(client, logins, concurrency):
+    login_latency, read_latency = [], []
+    done = asyncio.Event()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post("/api/v1/auth/login", json={"email": "bench@example.com", "password": "pw"})
+            assert response.status_code == 200, response.text
+            login_latency.append(time.perf_counter() - started)
+
+    async def reader():
+        # Open loop: a read is due every 10 ms, and latency counts from when it was due,
+        # so time spent waiting for a blocked event loop is included
+        due = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            response = await client.get("/api/v1/movies/", params={"limit": 20})
+            assert response.status_code == 200
+            read_latency.append(time.perf_counter() - due)
+            due += 0.01
+
+    read_task = asyncio.create_task(reader())
+    await asyncio.gather(*(login() for _ in range(logins)))
+    done.set()
+    await read_task
+    return login_latency, read_latency
+
+async def main_async(args):
+    settings.PASSWORD_BCRYPT_ROUNDS = args.rounds
+    # Every request comes from one client; measure hashing, not the login rate limit
+    settings.RATE_LIMIT_ENABLED = False
+    await init_beanie(database=AsyncMongoMockClient()["bench"], document_models=DOCUMENT_MODELS)
+    await Movie.insert_many([
+        Movie(title=f"Movie {i}", description="desc", genres=["Drama"], status="approved") for i in range(200)
+    ])
+    await User(username="bench", email="bench@example.com", password=await passwords.hash_password("pw")).insert()
+
+    from app import app
+
+    pooled_run = passwords._run
+
+    async def inline_run(fn, *fn_args):
+        return fn(*fn_args)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, runner in (("worker pool", pooled_run), ("inline on event loop", inline_run)):
+            passwords._run = runner
+            login_latency, read_latency = await run_load(client, args.logins, args.concurrency)
+            print(f"{name} (bcrypt rounds={args.rounds}, {args.logins} logins, concurrency {args.concurrency})")
+            print(f"  POST /auth/login  {percentiles(login_latency)}")
+            print(f"  GET  /movies      {percentiles(read_latency)}  ({len(read_latency)} requests)")
+        passwords._run = pooled_run
+    passwords.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=12)
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: item-item neighbour computation on a synthetic likes matrix.
+
+Part 1 generates skewed (Zipf-like) likes, the shape real review data has,
+and times services.recommendation_service.item_neighbors end to end: building
+the sparse matrix, the batched co-like products and the top-K cut.
+
+Part 2 times the full rebuild of content ("more like this") neighbours on
+synthetic metadata.
+
+Usage (from the repository root):
+    python benchmarks/bench_recommendations.py [--users 200000] [--movies 50000] [--likes 3000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import numpy as np
+from services.recommendation_service import content_neighbors, content_tokens, feature_matrix, item_neighbors
+
+GENRES = ["Drama", "Comedy", "Action", "Thriller", "Horror", "Romance", "Sci-Fi", "Documentary", "Animation", "Crime"]
+
+def synthetic_likes(users, movies, likes, seed):
+    rng = np.random.default_rng(seed)
+    popularity = 1.0 / np.arange(1, movies + 1) ** 0.8
+    popularity /= popularity.sum()
+    user_idx = rng.integers(0, users, likes, dtype=np.int32)
+    item_idx = rng.choice(movies, size=likes, p=popularity).astype(np.int32)
+    return user_idx, item_idx
+
+def synthetic_catalog(movies, seed):
+    rng = np.random.default_rng(seed)
+    people = [f"person {n}" for n in range(movies // 2)]
+    for _ in range(movies):
+        yield {
+            "genres": list(rng.choice(GENRES, size=rng.integers(1, 4), replace=False)),
+            "director": people[rng.integers(len(people))],
+            "cast": [{"name": people[n]} for n in rng.integers(0, len(people), 6)],
+            "release_year": int(rng.integers(1950, 2025)),
+            "language": str(rng.choice(["English", "French", "Hindi", "Japanese", "Spanish"])),
+            "country": str(rng.choice(["USA", "France", "India", "Japan", "Spain"])),
+        }
+
+def content(args):
+    started = time.perf_counter()
+    features = feature_matrix([content_tokens(doc) for doc in synthetic_catalog(args.movies, args.seed)])
+    built = time.perf_counter()
+    rebuilt = sum(1 for _ in content_neighbors(features, top_k=args.top_k))
+    finished = time.perf_counter()
+    print(f"\n{args.movies:,} movies, {features.shape[1]:,} content features")
+    print(f"  features {built - started:.1f}s, all neighbour lists ({rebuilt:,}) {finished - built:.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--movies", type=int, default=50_000)
+    parser.add_argument("--likes", type=int, default=3_000_000)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    user_idx, item_idx = synthetic_likes(args.users, args.movies, args.likes, args.seed)
+    print(f"{args.likes:,} likes by {args.users:,} users on {args.movies:,} movies, top {args.top_k}")
+    started = time.perf_counter()
+    with_neighbours = 0
+    for _ in item_neighbors(user_idx, item_idx, args.users, args.movies, top_k=args.top_k):
+        with_neighbours += 1
+    seconds = time.perf_counter() - started
+    print(f"  {with_neighbours:,} movies with neighbours in {seconds:.1f}s "
+          f"({seconds / args.movies * 1e6:.0f} µs/movie)")
+    content(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Micro-benchmark: serializing a page of 1,000 movies.
+
+Compares the previous path (BSON -> Beanie Movie -> MovieOut -> jsonable_encoder
+-> json.dumps) with the shared serializer (BSON -> dict -> orjson).
+
+Usage (from the repository root):
+    python benchmarks/bench_serialization.py [--movies 1000] [--repeat 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+from bson import ObjectId
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from beanie import init_beanie
+from fastapi.encoders import jsonable_encoder
+from mongomock_motor import AsyncMongoMockClient
+from models.movie import Movie
+from schemas.movie import MovieOut
+from core.serialization import dumps, serialize_movie
+
+def make_docs(count):
+    base = datetime(2020, 1, 1)
+    return [
+        {
+            "_id": ObjectId(),
+            "title": f"Movie {i}",
+            "description": "A long description of the plot. " * 8,
+            "genres": ["Drama", "Crime"],
+            "release_date": "1994-09-23",
+            "duration": 142,
+            "poster_url": f"https://img.example.com/{i}.jpg",
+            "trailer_url": None,
+            "director": "Frank Darabont",
+            "cast": [{"name": f"Actor {j}", "role": f"Role {j}"} for j in range(6)],
+            "language": "English",
+            "country": "USA",
+            "age_rating": "R",
+            "rating": 4.5,
+            "submitted_by": "user@example.com",
+            "status": "approved",
+            "featured": bool(i % 2),
+            "created_at": base + timedelta(minutes=i),
+            "updated_at": base + timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+def old_path(docs):
+    movies = [Movie.model_validate(doc) for doc in docs]
+    out = [
+        MovieOut(
+            id=str(m.id), title=m.title, description=m.description, genres=m.genres,
+            release_date=m.release_date, duration=m.duration, poster_url=m.poster_url,
+            trailer_url=m.trailer_url, director=m.director,
+            cast=[c.model_dump() for c in m.cast], language=m.language,
+            country=m.country, age_rating=m.age_rating, rating=m.rating,
+            submitted_by=m.submitted_by, status=m.status, featured=m.featured,
+            created_at=m.created_at, updated_at=m.updated_at,
+        )
+        for m in movies
+    ]
+    return json.dumps(jsonable_encoder(out)).encode()
+
+def new_path(docs):
+    return dumps([serialize_movie(doc) for doc in docs])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # Document classes need Beanie initialised to be constructed; an in-memory stand-in is enough
+    client = AsyncMongoMockClient()
+    asyncio.run(init_beanie(database=client["bench"], document_models=[Movie], skip_indexes=True))
+
+    docs = make_docs(args.movies)
+    assert json.loads(old_path(docs)) == json.loads(new_path(docs)), "serializers disagree"
+
+    results = {}
+    for name, fn in (("model_validate + MovieOut + json", old_path), ("serialize_movie + orjson", new_path)):
+        best = min(timeit.repeat(lambda: fn(docs), number=1, repeat=args.repeat))
+        results[name] = best
+        print(f"{name:<34} {best * 1000:8.2f} ms per {args.movies} movies")
+
+    old, new = results.values()
+    print(f"speedup: {old / new:.1f}x")
+
+if __name__ == "__main__":
+    main()
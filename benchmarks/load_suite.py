@@ -0,0 +1,404 @@
+"""
+Load benchmark suite: seed a synthetic catalog, drive the real routes concurrently,
+and save throughput and latency percentiles as JSON for comparison across commits.
+
+Data is generated deterministically from --seed, so two runs at the same scale
+see the same catalog. The database can be:
+    (default)       an in-memory mongomock stand-in (small scales only)
+    --mongo-uri     any MongoDB server; a throwaway database is created and dropped
+    --spawn-mongod  a disposable mongod (binary on PATH) on a temporary dbpath
+
+Requests go through the app in-process (httpx ASGI transport) unless --base-url
+points at a running server that uses the same database and JWT_SECRET.
+
+Usage (from the repository root):
+    python benchmarks/load_suite.py --movies 1000 --reviews 5000 --users 500 --requests 2000
+    python benchmarks/load_suite.py --spawn-mongod --movies 100000 --reviews 5000000 --users 1000000
+    python benchmarks/load_suite.py ... --compare benchmarks/results/load-abc1234.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import httpx
+from bson import ObjectId
+from beanie import init_beanie
+from core.config import settings
+from core.db import DOCUMENT_MODELS
+from core.security import create_access_token
+from models.movie import Movie, title_key_of
+from models.review import Review
+from models.user import User
+
+GENRES = ["Drama", "Comedy", "Action", "Thriller", "Horror", "Romance", "Sci-Fi", "Documentary", "Animation", "Crime"]
+BASE_TIME = datetime(2020, 1, 1)
+BATCH = 10_000
+
+# scenario -> share of requests
+SCENARIOS = {
+    "GET /movies (filtered)": 0.30,
+    "GET /movies/{id}": 0.25,
+    "GET /reviews/movie/{id}": 0.20,
+    "GET /watchlist/{user}": 0.15,
+    "POST /reviews": 0.10,
+}
+
+# ERROR records logged while the current request is in flight
+_logged_errors: ContextVar[Optional[List[str]]] = ContextVar("logged_errors", default=None)
+
+class LoggedErrors(logging.Handler):
+    """
+    Counts ERROR records against the request that logged them, so a route that
+    logs a failure and still answers 2xx (the rating update after a review
+    write) is a failed request. In-process runs only: ASGITransport runs the app
+    in the caller's task, so the request's context reaches the handler.
+    """
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.messages: Dict[str, int] = {}
+
+    def emit(self, record):
+        errors = _logged_errors.get()
+        if errors is not None:
+            errors.append(record.getMessage())
+            self.messages[record.getMessage()] = self.messages.get(record.getMessage(), 0) + 1
+
+def user_email(i: int) -> str:
+    return f"user{i}@bench.cinecheck.test"
+
+# --- seeding -------------------------------------------------------------------
+
+def movie_docs(count: int, rng: random.Random):
+    for i in range(count):
+        year = rng.randint(1950, 2024)
+        title = f"Movie {i}"
+        yield {
+            "_id": ObjectId(),
+            "title": title,
+            "title_key": title_key_of(title),
+            "description": "A synthetic plot summary for load testing. " * 4,
+            "genres": rng.sample(GENRES, rng.randint(1, 3)),
+            "release_date": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "release_year": year,
+            "duration": rng.randint(80, 180),
+            "poster_url": f"https://img.example.com/{i}.jpg",
+            "director": f"Director {i % 500}",
+            "cast": [{"name": f"Actor {rng.randint(0, 5000)}", "role": f"Role {j}"} for j in range(4)],
+            "language": "English",
+            "country": "USA",
+            "rating": None,
+            "rating_sum": 0,
+            "rating_count": 0,
+            "rating_histogram": {},
+            "status": "approved" if rng.random() < 0.95 else "pending",
+            "featured": rng.random() < 0.02,
+            "created_at": BASE_TIME + timedelta(minutes=i),
+            "updated_at": BASE_TIME + timedelta(minutes=i),
+        }
+
+def review_docs(count: int, movie_ids: List[ObjectId], users: int, rng: random.Random):
+    # review j -> (movie j % M, a user that is unique per movie), so no (movie, user) pair repeats
+    movies = len(movie_ids)
+    for j in range(count):
+        m = j % movies
+        u = (j // movies + m * 7919) % users
+        yield {
+            "movie_id": movie_ids[m],
+            "user_id": user_email(u),
+            "username": f"user{u}",
+            "rating": rng.randint(1, 5),
+            "review_text": "Synthetic review text." if rng.random() < 0.7 else None,
+            "created_at": BASE_TIME + timedelta(seconds=j),
+            "updated_at": BASE_TIME + timedelta(seconds=j),
+        }
+
+def user_docs(count: int, movie_ids: List[ObjectId], watchlist_size: int, rng: random.Random):
+    for i in range(count):
+        size = rng.randint(0, watchlist_size * 2)
+        yield {
+            "username": f"user{i}",
+            "email": user_email(i),
+            "password": "not-used-by-the-benchmark",
+            "role": "user",
+            "created_at": BASE_TIME,
+            "watchlist": [movie_ids[rng.randrange(len(movie_ids))] for _ in range(size)],
+            "token_version": 0,
+        }
+
+async def insert_batched(collection, docs) -> int:
+    batch, total = [], 0
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= BATCH:
+            await collection.insert_many(batch, ordered=False)
+            total += len(batch)
+            batch = []
+    if batch:
+        await collection.insert_many(batch, ordered=False)
+        total += len(batch)
+    return total
+
+async def seed(args) -> Dict[str, Any]:
+    from services.rating_service import rebuild_rating_aggregates
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    movies = list(movie_docs(args.movies, rng))
+    await insert_batched(Movie.get_motor_collection(), movies)
+    movie_ids = [m["_id"] for m in movies]
+    approved = [m["_id"] for m in movies if m["status"] == "approved"]
+    del movies
+
+    if args.reviews > args.movies * args.users:
+        raise SystemExit("--reviews cannot exceed movies x users (one review per user per movie)")
+    await insert_batched(Review.get_motor_collection(), review_docs(args.reviews, movie_ids, args.users, rng))
+    await insert_batched(User.get_motor_collection(), user_docs(args.users, approved, args.watchlist_size, rng))
+    await rebuild_rating_aggregates()
+    return {"approved_ids": approved, "seconds": time.perf_counter() - started}
+
+# --- load ----------------------------------------------------------------------
+
+def percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+    }
+
+async def drive(client: httpx.AsyncClient, args, approved_ids: List[ObjectId]) -> Dict[str, Any]:
+    names = list(SCENARIOS)
+    weights = list(SCENARIOS.values())
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+    remaining = args.requests
+
+    def token_for(user: int) -> Dict[str, str]:
+        identity = SimpleNamespace(email=user_email(user), username=f"user{user}", role="user")
+        return {"Authorization": f"Bearer {create_access_token(identity)}"}
+
+    async def request(rng: random.Random, name: str) -> httpx.Response:
+        movie_id = str(approved_ids[rng.randrange(len(approved_ids))])
+        if name == "GET /movies (filtered)":
+            params = {"limit": 20, "sort_by": rng.choice(["created_at", "rating", "title"])}
+            choice = rng.random()
+            if choice < 0.4:
+                params["genre"] = rng.choice(GENRES)
+            elif choice < 0.6:
+                params["year"] = rng.randint(1950, 2024)
+            elif choice < 0.8:
+                params["min_rating"] = rng.choice([3.0, 3.5, 4.0])
+            return await client.get("/api/v1/movies/", params=params)
+        if name == "GET /movies/{id}":
+            return await client.get(f"/api/v1/movies/{movie_id}")
+        if name == "GET /reviews/movie/{id}":
+            return await client.get(f"/api/v1/reviews/movie/{movie_id}", params={"limit": 20})
+        user = rng.randrange(args.users)
+        if name == "GET /watchlist/{user}":
+            return await client.get(f"/api/v1/watchlist/{user_email(user)}", params={"limit": 50}, headers=token_for(user))
+        return await client.post(
+            "/api/v1/reviews/",
+            json={"movie_id": movie_id, "rating": rng.randint(1, 5), "review_text": "Load test review"},
+            headers=token_for(user),
+        )
+
+    async def worker(index: int):
+        nonlocal remaining
+        rng = random.Random(args.seed * 1000 + index)
+        while remaining > 0:
+            remaining -= 1
+            name = rng.choices(names, weights)[0]
+            logged: List[str] = []
+            _logged_errors.set(logged)
+            started = time.perf_counter()
+            try:
+                response = await request(rng, name)
+                failed = response.status_code >= 400 or bool(logged)
+            except httpx.HTTPError:
+                failed = True
+            latencies[name].append(time.perf_counter() - started)
+            errors[name] += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "total": summarize(all_latencies, sum(errors.values()), elapsed),
+        "routes": {name: summarize(latencies[name], errors[name], elapsed) for name in names},
+    }
+
+# --- database lifecycle ----------------------------------------------------------
+
+def spawn_mongod():
+    binary = shutil.which("mongod")
+    if binary is None:
+        raise SystemExit("--spawn-mongod needs a mongod binary on PATH")
+    dbpath = tempfile.mkdtemp(prefix="cinecheck-bench-")
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    process = subprocess.Popen(
+        [binary, "--dbpath", dbpath, "--port", str(port), "--bind_ip", "127.0.0.1", "--quiet"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+    def stop():
+        process.terminate()
+        process.wait(timeout=30)
+        shutil.rmtree(dbpath, ignore_errors=True)
+
+    return f"mongodb://127.0.0.1:{port}", stop
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def compare(current: Dict[str, Any], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nvs {baseline_path} ({baseline['meta']['commit']})")
+    for name, result in [("total", current["total"])] + list(current["routes"].items()):
+        before = baseline["total"] if name == "total" else baseline["routes"].get(name)
+        if not before or not before["p99_ms"] or not before["throughput_rps"]:
+            continue
+        print(
+            f"  {name:<26} p99 {before['p99_ms']:8.2f} -> {result['p99_ms']:8.2f} ms "
+            f"({result['p99_ms'] / before['p99_ms']:5.2f}x)   "
+            f"rps {before['throughput_rps']:8.1f} -> {result['throughput_rps']:8.1f}"
+        )
+
+async def main_async(args):
+    stop = None
+    mongo_uri = args.mongo_uri
+    if args.spawn_mongod:
+        mongo_uri, stop = spawn_mongod()
+
+    if mongo_uri:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        mongo = AsyncIOMotorClient(mongo_uri, serverSelectionTimeoutMS=30000)
+        backend = "mongod"
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+
+        mongo = AsyncMongoMockClient()
+        backend = "mongomock"
+    db_name = f"cinecheck_bench_{os.getpid()}"
+
+    try:
+        await init_beanie(database=mongo[db_name], document_models=DOCUMENT_MODELS)
+        print(f"Seeding {args.movies:,} movies, {args.reviews:,} reviews, {args.users:,} users ({backend})...")
+        seeded = await seed(args)
+        print(f"  seeded in {seeded['seconds']:.1f}s")
+
+        # One client drives all traffic; admission control would only measure itself
+        settings.RATE_LIMIT_ENABLED = False
+        if args.no_cache:
+            from core.cache import MemoryCacheBackend, response_cache
+
+            response_cache.backend = MemoryCacheBackend(max_entries=0)
+
+        if args.base_url:
+            client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+        else:
+            from app import app
+
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+        logged_errors = LoggedErrors()
+        logging.getLogger().addHandler(logged_errors)
+        async with client:
+            # warm-up, not recorded
+            await client.get("/api/v1/movies/", params={"limit": 20})
+            results = await drive(client, args, seeded["approved_ids"])
+        logging.getLogger().removeHandler(logged_errors)
+        for message, count in logged_errors.messages.items():
+            print(f"  logged {count}x during the run: {message}")
+    finally:
+        if mongo_uri:
+            await mongo.drop_database(db_name)
+        if stop:
+            stop()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "backend": backend,
+            "target": args.base_url or "in-process",
+            "response_cache": not args.no_cache,
+        },
+        "scale": {
+            "movies": args.movies, "reviews": args.reviews, "users": args.users,
+            "watchlist_size": args.watchlist_size, "seed": args.seed,
+        },
+        "load": {"requests": args.requests, "concurrency": args.concurrency},
+        **results,
+    }
+
+    print(f"\n{'route':<26} {'reqs':>7} {'errors':>6} {'rps':>9} {'p50':>8} {'p95':>8} {'p99':>8}  (ms)")
+    for name, result in [("total", report["total"])] + list(report["routes"].items()):
+        print(
+            f"{name:<26} {result['requests']:>7} {result['errors']:>6} {result['throughput_rps']:>9.1f} "
+            f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f}"
+        )
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"load-{report['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {output}")
+    if args.compare:
+        compare(report, args.compare)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    # Defaults suit mongomock, whose unique-index checks make seeding quadratic; use mongod for real scale
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--reviews", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--watchlist-size", type=int, default=20, help="average watchlist length")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mongo-uri", default=None)
+    parser.add_argument("--spawn-mongod", action="store_true")
+    parser.add_argument("--base-url", default=None, help="drive a running server instead of the in-process app")
+    parser.add_argument("--no-cache", action="store_true", help="disable the response cache (in-process only)")
+    parser.add_argument("--output", default=None, help="default: benchmarks/results/load-<commit>.json")
+    parser.add_argument("--compare", default=None, help="earlier results file to compare against")
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
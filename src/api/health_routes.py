@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+from core import db
+from core.indexes import index_failures
+from core.serialization import ORJSONResponse
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+@router.get("/live")
+async def liveness():
+    """The process is up and serving requests"""
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def readiness():
+    """
+    Ready to take traffic: MongoDB answers a ping. Reports the ping latency and
+    connection pool stats; responds 503 while the database is unreachable.
+    Unique indexes duplicates kept from being built make it "degraded" (still 200).
+    """
+    try:
+        latency_ms = await db.ping()
+    except Exception as e:
+        return ORJSONResponse(
+            {"status": "unavailable", "error": str(e), "pool": db.pool_stats.snapshot()},
+            status_code=503,
+        )
+    body = {"status": "ready", "ping_ms": round(latency_ms, 2), "pool": db.pool_stats.snapshot()}
+    if index_failures:
+        body.update(status="degraded", index_failures=index_failures)
+    return body
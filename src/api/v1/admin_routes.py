@@ -1,79 +1,218 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
 from models.movie import Movie
+from models.review import Review
 from schemas.movie import MovieOut
 from beanie import PydanticObjectId
+from utils.pagination import InvalidCursor, paginate
+from core.cache import response_cache
+from core.security import admin_required
+from core import log, rate_limit
+from core.db import get_client
+from core.query_profiler import explain, query_profiler
+from core.serialization import ORJSONResponse, serialize_movie
+from services.movie_service import InvalidFields, movie_projection, resolve_fields
+from services.export_service import export_movies, export_reviews
+from services.import_service import import_movies, parse_records
 
-router = APIRouter(prefix="/admin", tags=["Admin"])
+from services.moderation_service import MAX_BATCH, MODERATION_ACTIONS, moderate_movies, select_movie_ids
+
+logger = logging.getLogger(__name__)
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+class ModerationFilter(BaseModel):
+    status: Optional[str] = "pending"
+    genre: Optional[str] = None
+    submitted_by: Optional[str] = None
+    created_before: Optional[datetime] = None
+    limit: int = Field(MAX_BATCH, ge=1, le=MAX_BATCH)
+
+class BulkModerationRequest(BaseModel):
+    ids: Optional[List[str]] = Field(None, max_length=MAX_BATCH)
+    filter: Optional[ModerationFilter] = None
+
+# Every admin route requires an admin access token (checked without a database lookup)
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(admin_required)])
 
 @router.get("/")
 async def admin_dashboard():
     return {"message": "Welcome Admin"}
 
-# Admin movie management routes - REMOVE current_user=Depends(admin_required)
+@router.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss/eviction counters for the movie response cache"""
+    return response_cache.stats()
+
+@router.get("/load/stats")
+async def load_stats():
+    """Rate-limit rejections per route, in-flight requests, queue depth and log queue for this worker"""
+    return {**rate_limit.stats(), "logging": log.stats()}
+
+@router.get("/queries")
+async def query_shapes(
+    sort: str = Query("total_ms", pattern="^(total_ms|max_ms|count|docs|slow)$"),
+    limit: int = Query(20, ge=1, le=200),
+    explain_top: int = Query(0, ge=0, le=5)  # run explain() for the first N shapes
+):
+    """MongoDB query shapes seen by this worker, worst first"""
+    shapes = query_profiler.top(sort, limit)
+    results = [stats.as_dict() for stats in shapes]
+    for stats, result in zip(shapes[:explain_top], results):
+        try:
+            result["explain"] = await explain(stats, get_client())
+        except Exception as e:
+            logger.exception("Explain error", extra={"shape": stats.key})
+            result["explain"] = {"error": str(e)}
+    return {"since": query_profiler.since, "slow_query_ms": query_profiler.slow_ms, "shapes": results}
+
+@router.delete("/queries")
+async def reset_query_shapes():
+    """Start a fresh profiling window"""
+    query_profiler.reset()
+    return {"message": "Query profile reset"}
+
+@router.get("/export/movies")
+async def export_movies_stream(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: Optional[str] = None,
+    genre: Optional[str] = None,
+    featured: Optional[bool] = None,
+    fields: Optional[str] = None,  # comma-separated field names or "card"
+    batch_size: int = Query(500, ge=1, le=5000)
+):
+    """Stream the movies collection as NDJSON or CSV straight from a database cursor"""
+    try:
+        selected = resolve_fields(fields)
+    except InvalidFields as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    query = {}
+    if status:
+        query["status"] = status
+    if genre:
+        query["genres"] = genre
+    if featured is not None:
+        query["featured"] = featured
+
+    return StreamingResponse(
+        export_movies(Movie.get_motor_collection(), query, selected, format, batch_size),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="movies.{format}"'},
+    )
+
+@router.get("/export/reviews")
+async def export_reviews_stream(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    movie_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    batch_size: int = Query(500, ge=1, le=5000)
+):
+    """Stream the reviews collection as NDJSON or CSV straight from a database cursor"""
+    query = {}
+    if movie_id:
+        try:
+            query["movie_id"] = PydanticObjectId(movie_id)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid movie ID")
+    if user_id:
+        query["user_id"] = user_id
+
+    return StreamingResponse(
+        export_reviews(Review.get_motor_collection(), query, format, batch_size),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="reviews.{format}"'},
+    )
+
+# Admin movie management routes
 @router.get("/movies/pending", response_model=List[MovieOut])
-async def get_pending_movies():
-    """Get all pending movies for admin approval"""
+async def get_pending_movies(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = None,  # comma-separated field names or "card"
+):
+    """Get pending movies for admin approval, oldest submission first"""
     try:
-        movies = await Movie.find(Movie.status == "pending").to_list()
-        movie_list = []
-        for m in movies:
-            movie_list.append(
-                MovieOut(
-                    id=str(m.id),
-                    title=m.title,
-                    description=m.description,
-                    genres=m.genres,
-                    release_date=m.release_date,
-                    duration=m.duration,
-                    poster_url=m.poster_url,
-                    trailer_url=m.trailer_url,
-                    director=m.director,
-                    cast=m.cast,
-                    language=m.language,
-                    country=m.country,
-                    age_rating=m.age_rating,
-                    rating=m.rating,
-                    submitted_by=m.submitted_by,
-                    status=m.status,
-                    featured=m.featured,
-                    created_at=m.created_at,
-                    updated_at=m.updated_at
-                )
-            )
-        return movie_list
+        selected = resolve_fields(fields)
+        movies, next_cursor = await paginate(
+            Movie, {"status": "pending"}, "created_at", 1, limit, cursor=cursor,
+            projection=movie_projection(selected)
+        )
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return ORJSONResponse([serialize_movie(m, selected) for m in movies], headers=headers)
+    except (InvalidCursor, InvalidFields) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"💥 Pending movies error: {e}")
+        logger.exception("Pending movies error")
         raise HTTPException(status_code=500, detail=f"Failed to fetch pending movies: {str(e)}")
 
+@router.post("/movies/import")
+async def import_movies_bulk(
+    request: Request,
+    status: str = Query("pending", pattern="^(pending|approved)$"),
+    chunk_size: int = Query(1000, ge=1, le=10000)
+):
+    """
+    Bulk import movies from an NDJSON body or a JSON array of CreateMovieRequest records.
+    Records are upserted by normalized title + release year; invalid ones are reported
+    individually in `errors` and do not stop the import.
+    """
+    try:
+        body = await request.body()
+        return await import_movies(parse_records(body), status=status, chunk_size=chunk_size)
+    except Exception as e:
+        logger.exception("Import movies error")
+        raise HTTPException(status_code=500, detail=f"Failed to import movies: {str(e)}")
+
+@router.post("/movies/bulk/{action}")
+async def bulk_moderate_movies(action: str, request: BulkModerationRequest):
+    """
+    Approve, reject, feature or unfeature many movies at once, selected either by
+    `ids` or by a `filter` (defaults to the pending queue, oldest first).
+    Returns an outcome per movie id.
+    """
+    if action not in MODERATION_ACTIONS:
+        raise HTTPException(status_code=404, detail=f"Unknown moderation action: {action}")
+    if (request.ids is None) == (request.filter is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of 'ids' or 'filter'")
+    try:
+        if request.ids is not None:
+            movie_ids = request.ids
+        else:
+            movie_ids = await select_movie_ids(**request.filter.model_dump())
+        return await moderate_movies(action, movie_ids)
+    except Exception as e:
+        logger.exception("Bulk moderation error")
+        raise HTTPException(status_code=500, detail=f"Failed to {action} movies: {str(e)}")
+
 @router.post("/movies/{movie_id}/approve")
 async def approve_movie(movie_id: str):
     """Approve a pending movie"""
     try:
-        movie = await Movie.get(PydanticObjectId(movie_id))
-        if not movie:
-            raise HTTPException(status_code=404, detail="Movie not found")
-        
-        movie.status = "approved"
-        await movie.save()
-        
-        return {"message": "Movie approved successfully"}
+        outcome = (await moderate_movies("approve", [movie_id]))["results"][0]["outcome"]
     except Exception as e:
-        print(f"💥 Approve movie error: {e}")
+        logger.exception("Approve movie error")
         raise HTTPException(status_code=500, detail=f"Failed to approve movie: {str(e)}")
+    if outcome in ("invalid_id", "not_found"):
+        raise HTTPException(status_code=404, detail="Movie not found")
+    if outcome == "conflict":
+        raise HTTPException(status_code=409, detail="Movie was moderated by another request; reload and retry")
+    return {"message": "Movie approved successfully"}
 
 @router.post("/movies/{movie_id}/reject")
 async def reject_movie(movie_id: str):
     """Reject a pending movie"""
     try:
-        movie = await Movie.get(PydanticObjectId(movie_id))
-        if not movie:
-            raise HTTPException(status_code=404, detail="Movie not found")
-        
-        movie.status = "rejected"
-        await movie.save()
-        
-        return {"message": "Movie rejected successfully"}
+        outcome = (await moderate_movies("reject", [movie_id]))["results"][0]["outcome"]
     except Exception as e:
-        print(f"💥 Reject movie error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to reject movie: {str(e)}")
\ No newline at end of file
+        logger.exception("Reject movie error")
+        raise HTTPException(status_code=500, detail=f"Failed to reject movie: {str(e)}")
+    if outcome in ("invalid_id", "not_found"):
+        raise HTTPException(status_code=404, detail="Movie not found")
+    if outcome == "conflict":
+        raise HTTPException(status_code=409, detail="Movie was moderated by another request; reload and retry")
+    return {"message": "Movie rejected successfully"}
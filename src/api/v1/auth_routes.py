@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, EmailStr
-from services.user_service import authenticate_user, create_user
+from core.security import TokenUser, create_access_token, get_current_user
+from services.user_service import authenticate_user, create_user, revoke_tokens
 
 router = APIRouter(prefix="/auth", tags=["Auth"])  # CHANGE THIS
 
@@ -12,7 +13,6 @@ class SignupRequest(BaseModel):
     username: str
     email: EmailStr
     password: str
-    role: str = "user"
 
 # LOGIN
 @router.post("/login")
@@ -20,13 +20,27 @@ async def login(data: LoginRequest):
     user = await authenticate_user(data.email, data.password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    return {"user": {"username": user.username, "email": user.email, "role": user.role}}
+    return {
+        "user": {"username": user.username, "email": user.email, "role": user.role},
+        "access_token": create_access_token(user),
+        "token_type": "bearer",
+    }
 
 # SIGNUP
 @router.post("/signup")
 async def signup(data: SignupRequest):
     try:
         user = await create_user(data.dict())
-        return {"user": {"username": user.username, "email": user.email, "role": user.role}}
+        return {
+            "user": {"username": user.username, "email": user.email, "role": user.role},
+            "access_token": create_access_token(user),
+            "token_type": "bearer",
+        }
     except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+# LOGOUT (revokes every token issued to the user so far)
+@router.post("/logout")
+async def logout(user: TokenUser = Depends(get_current_user)):
+    await revoke_tokens(user.email)
+    return {"message": "Logged out"}
\ No newline at end of file
@@ -1,72 +1,34 @@
-from fastapi import APIRouter, HTTPException, Depends
+import logging
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
 from typing import List
 from models.movie import Movie
-from schemas.movie import MovieOut
-from pydantic import BaseModel
+from schemas.movie import CreateMovieRequest, MovieOut
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from beanie import PydanticObjectId
+from pymongo.errors import DuplicateKeyError
 from core.security import admin_required
-from datetime import datetime, timezone
+from services.movie_service import (
+    InvalidFields,
+    build_movie_filter,
+    find_movies_page,
+    get_movies_by_ids,
+    movie_projection,
+    resolve_fields,
+)
+from services.moderation_service import moderate_movies, toggle_featured
+from services.recommendation_service import similar_movies
+from services.leaderboard_service import leaderboard
+from utils.pagination import InvalidCursor, paginate
+from core.cache import ResponseCache, response_cache
+from core.serialization import ORJSONResponse, dumps, serialize_movie
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/movies", tags=["Movies"])
 
-class CreateMovieRequest(BaseModel):
-    title: str
-    description: str
-    genres: List[str]
-    release_date: Optional[str] = None
-    duration: Optional[int] = None
-    poster_url: Optional[str] = None
-    trailer_url: Optional[str] = None
-    director: Optional[str] = None
-    cast: List[dict] = []
-    language: Optional[str] = None
-    country: Optional[str] = None
-    age_rating: Optional[str] = None
-    submitted_by: Optional[str] = None
-
-def _to_epoch(dt: datetime) -> float:
-    """
-    Convert datetime to a UTC epoch float. Handles both naive and tz-aware datetimes.
-    """
-    if dt is None:
-        return 0.0
-    if dt.tzinfo is None:
-        # assume naive datetimes are UTC (adjust if your app uses local time)
-        dt = dt.replace(tzinfo=timezone.utc)
-    else:
-        dt = dt.astimezone(timezone.utc)
-    return dt.timestamp()
-
-def _parse_datetime(val):
-    """
-    Return a timezone-aware datetime (UTC) from datetime or ISO string.
-    Returns None if it cannot be parsed.
-    """
-    if val is None:
-        return None
-    if isinstance(val, datetime):
-        dt = val
-    elif isinstance(val, str):
-        try:
-            # try ISO format first
-            dt = datetime.fromisoformat(val)
-        except Exception:
-            # fallback: attempt basic YYYY-MM-DD parse
-            try:
-                dt = datetime.strptime(val.split("T")[0], "%Y-%m-%d")
-            except Exception:
-                return None
-    else:
-        return None
-
-    # make timezone-aware in UTC
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    else:
-        dt = dt.astimezone(timezone.utc)
-    return dt
+class MovieBatchRequest(BaseModel):
+    ids: List[str] = Field(..., max_length=100)
 
 @router.post("/test-movie")
 async def create_test_movie():
@@ -83,7 +45,10 @@ async def create_test_movie():
             status="approved"
         )
         await test_movie.insert()
+        await response_cache.invalidate_movie(test_movie.id, lists=True)
         return {"message": "Test movie created successfully", "movie_id": str(test_movie.id)}
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Test movie already exists")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create test movie: {str(e)}")
 
@@ -100,32 +65,15 @@ async def create_movie(movie_data: CreateMovieRequest):
         )
         
         await movie.insert()
+        await response_cache.invalidate_movie(movie.id, lists=movie.status == "approved")
         
         # Return the created movie
-        return MovieOut(
-            id=str(movie.id),
-            title=movie.title,
-            description=movie.description,
-            genres=movie.genres,
-            release_date=movie.release_date,
-            duration=movie.duration,
-            poster_url=movie.poster_url,
-            trailer_url=movie.trailer_url,
-            director=movie.director,
-            cast=movie.cast,
-            language=movie.language,
-            country=movie.country,
-            age_rating=movie.age_rating,
-            rating=movie.rating,
-            submitted_by=movie.submitted_by,
-            status=movie.status,
-            featured=movie.featured,
-            created_at=movie.created_at,
-            updated_at=movie.updated_at
-        )
+        return ORJSONResponse(serialize_movie(movie))
         
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="A movie with this title and release year already exists")
     except Exception as e:
-        print(f"💥 Create movie error: {e}")
+        logger.exception("Create movie error")
         raise HTTPException(status_code=400, detail=f"Failed to create movie: {str(e)}")
 
 @router.get("/", response_model=List[MovieOut])
@@ -135,169 +83,198 @@ async def get_all_movies(
     year: Optional[int] = None,
     min_rating: Optional[float] = None,
     sort_by: Optional[str] = "created_at",  # created_at, rating, title
-    featured: Optional[bool] = None
+    featured: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = None,  # comma-separated field names or "card"
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
 ):
     """
-    Fetch all approved movies with optional filtering and sorting
+    Fetch approved movies with optional filtering and sorting.
+    Filtering, sorting and paging all run in MongoDB; the total match count
+    is returned in the X-Total-Count header and the cursor for the next page
+    in X-Next-Cursor. `page` is kept for older clients; prefer `cursor`.
+    `fields` limits the response (and the MongoDB read) to the listed fields.
+    Responses carry an ETag; sending it back in If-None-Match gets a 304 while
+    no movie in the listings has changed.
     """
     try:
-        # Build query
-        query = {"status": "approved"}
-        if featured is not None:
-            query["featured"] = featured
-        
-        movies_query = Movie.find(query)
-        
-        # Apply filters
-        movies = await movies_query.to_list()
-        
-        # Filter in memory (can be optimized with MongoDB aggregation)
-        filtered_movies = []
-        for m in movies:
-            # Search filter
-            if search:
-                search_lower = search.lower()
-                if (search_lower not in m.title.lower() and 
-                    search_lower not in m.description.lower() and
-                    search_lower not in (m.director or "").lower()):
-                    continue
-            
-            # Genre filter
-            if genre and genre not in m.genres:
-                continue
-            
-            # Year filter
-            if year and m.release_date:
-                try:
-                    movie_year = int(m.release_date.split("-")[0])
-                    if movie_year != year:
-                        continue
-                except:
-                    pass
-            
-            # Rating filter
-            if min_rating is not None:
-                if m.rating is None or m.rating < min_rating:
-                    continue
-            
-            filtered_movies.append(m)
-        
-        # Normalize datetimes to avoid naive/aware comparison errors
-        for m in filtered_movies:
-            try:
-                m.created_at = _parse_datetime(getattr(m, "created_at", None))
-                m.updated_at = _parse_datetime(getattr(m, "updated_at", None))
-            except Exception:
-                # keep original if normalization fails
-                pass
-        
-        # Sort
-        if sort_by == "rating":
-            filtered_movies.sort(key=lambda x: x.rating if x.rating else 0, reverse=True)
-        elif sort_by == "title":
-            filtered_movies.sort(key=lambda x: x.title.lower())
-        else:  # created_at (default)
-            filtered_movies.sort(key=lambda x: _to_epoch(getattr(x, "created_at", None)), reverse=True)
-        
-        # Convert to MovieOut
-        movie_list = []
-        for m in filtered_movies:
-            movie_list.append(MovieOut(
-                id=str(m.id),
-                title=m.title,
-                description=m.description,
-                genres=m.genres,
-                release_date=m.release_date,
-                duration=m.duration,
-                poster_url=m.poster_url,
-                trailer_url=m.trailer_url,
-                director=m.director,
-                cast=m.cast,
-                language=m.language,
-                country=m.country,
-                age_rating=m.age_rating,
-                rating=m.rating,
-                submitted_by=m.submitted_by,
-                status=m.status,
-                featured=m.featured,
-                created_at=m.created_at,
-                updated_at=m.updated_at
-            ))
-        return movie_list
+        selected = resolve_fields(fields)
+    except InvalidFields as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    params = dict(search=search, genre=genre, year=year, min_rating=min_rating, sort_by=sort_by,
+                  featured=featured, cursor=cursor, page=page, limit=limit, fields=selected)
+
+    async def build():
+        query = build_movie_filter(
+            search=search,
+            genre=genre,
+            year=year,
+            min_rating=min_rating,
+            featured=featured,
+        )
+        movies, total, next_cursor = await find_movies_page(
+            query, sort_by=sort_by, limit=limit, cursor=cursor, page=page,
+            projection=movie_projection(selected)
+        )
+        headers = {"X-Total-Count": str(total)}
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return dumps([serialize_movie(m, selected) for m in movies]), headers
+
+    try:
+        return await response_cache.cached(
+            ResponseCache.LISTS, "movies", params, build, if_none_match, accept_encoding
+        )
         
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"💥 Get movies error: {e}")
+        logger.exception("Get movies error")
         raise HTTPException(status_code=500, detail=f"Failed to fetch movies: {str(e)}")
 
 @router.get("/featured", response_model=List[MovieOut])
-async def get_featured_movies():
+async def get_featured_movies(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = None,  # comma-separated field names or "card"
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
     """
-    Get all featured movies
+    Get featured movies, best rated first
     """
     try:
-        movies = await Movie.find(Movie.status == "approved", Movie.featured == True).sort(-Movie.rating).to_list()
-        
-        movie_list = []
-        for m in movies:
-            movie_list.append(MovieOut(
-                id=str(m.id),
-                title=m.title,
-                description=m.description,
-                genres=m.genres,
-                release_date=m.release_date,
-                duration=m.duration,
-                poster_url=m.poster_url,
-                trailer_url=m.trailer_url,
-                director=m.director,
-                cast=m.cast,
-                language=m.language,
-                country=m.country,
-                age_rating=m.age_rating,
-                rating=m.rating,
-                submitted_by=m.submitted_by,
-                status=m.status,
-                featured=m.featured,
-                created_at=m.created_at,
-                updated_at=m.updated_at
-            ))
-        return movie_list
+        selected = resolve_fields(fields)
+    except InvalidFields as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def build():
+        movies, next_cursor = await paginate(
+            Movie, {"status": "approved", "featured": True}, "rating", -1, limit, cursor=cursor,
+            projection=movie_projection(selected)
+        )
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return dumps([serialize_movie(m, selected) for m in movies]), headers
+
+    try:
+        return await response_cache.cached(
+            ResponseCache.LISTS, "featured", {"cursor": cursor, "limit": limit, "fields": selected}, build,
+            if_none_match, accept_encoding,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"💥 Get featured movies error: {e}")
+        logger.exception("Get featured movies error")
         raise HTTPException(status_code=500, detail=f"Failed to fetch featured movies: {str(e)}")
+
+async def _leaderboard_response(board, genre, limit, if_none_match, accept_encoding):
+    async def build():
+        return dumps(await leaderboard(board, genre, limit)), {}
+
+    try:
+        return await response_cache.cached(
+            ResponseCache.LISTS, board, {"genre": genre, "limit": limit}, build, if_none_match, accept_encoding
+        )
+    except Exception as e:
+        logger.exception("Leaderboard error")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch leaderboard: {str(e)}")
+
+@router.get("/top-rated")
+async def get_top_rated_movies(
+    genre: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
+    """
+    Best rated movies by Bayesian-weighted average, so a single 5-star review
+    does not outrank hundreds of good ones. Optionally within one genre.
+    """
+    return await _leaderboard_response("top-rated", genre, limit, if_none_match, accept_encoding)
+
+@router.get("/trending")
+async def get_trending_movies(
+    genre: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
+    """
+    Movies with the most (and best) recent reviews; each review's weight
+    halves every LEADERBOARD_TRENDING_HALF_LIFE_HOURS. Optionally within one genre.
+    """
+    return await _leaderboard_response("trending", genre, limit, if_none_match, accept_encoding)
+
+@router.post("/batch", response_model=List[MovieOut])
+async def get_movies_batch(batch: MovieBatchRequest):
+    """
+    Fetch up to 100 approved movies by ID in one query, in the requested order.
+    Unknown or unapproved IDs are left out of the result.
+    """
+    try:
+        ids = [PydanticObjectId(movie_id) for movie_id in batch.ids]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid movie ID in batch")
+    
+    try:
+        movies = await get_movies_by_ids(ids, projection=movie_projection(None))
+        return ORJSONResponse([serialize_movie(m) for m in movies])
+    except Exception as e:
+        logger.exception("Batch movies error")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch movies: {str(e)}")
+
 @router.get("/{movie_id}", response_model=MovieOut)
-async def get_movie_details(movie_id: str):
+async def get_movie_details(
+    movie_id: str,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
     """
     Fetch a single movie by ID
     """
-    try:
-        movie = await Movie.get(PydanticObjectId(movie_id))
+    async def build():
+        movie = await Movie.get_motor_collection().find_one(
+            {"_id": PydanticObjectId(movie_id)}, movie_projection(None)
+        )
         if not movie:
             raise HTTPException(status_code=404, detail="Movie not found")
-        return MovieOut(
-            id=str(movie.id),
-            title=movie.title,
-            description=movie.description,
-            genres=movie.genres,
-            release_date=movie.release_date,
-            duration=movie.duration,
-            poster_url=movie.poster_url,
-            trailer_url=movie.trailer_url,
-            director=movie.director,
-            cast=movie.cast,
-            language=movie.language,
-            country=movie.country,
-            age_rating=movie.age_rating,
-            rating=movie.rating,
-            submitted_by=movie.submitted_by,
-            status=movie.status,
-            featured=movie.featured,
-            created_at=movie.created_at,
-            updated_at=movie.updated_at
+        return dumps(serialize_movie(movie)), {}
+
+    try:
+        return await response_cache.cached(
+            ResponseCache.movie_namespace(movie_id), "detail", {}, build, if_none_match, accept_encoding
         )
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"💥 Movie detail error: {e}")
+        logger.exception("Movie detail error")
         raise HTTPException(status_code=500, detail=f"Movie detail error: {str(e)}")
 
+@router.get("/{movie_id}/similar")
+async def get_similar_movies(
+    movie_id: str,
+    limit: int = Query(10, ge=1, le=50),
+    kind: str = Query("auto", pattern="^(auto|collaborative|content)$"),
+):
+    """
+    Precomputed neighbours, best first: "users who liked this also liked"
+    (collaborative, from reviews) or "more like this" (content, from genres,
+    cast, director...). `auto` falls back to content for movies nobody has
+    reviewed enough yet.
+    """
+    try:
+        oid = PydanticObjectId(movie_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid movie ID")
+    try:
+        return ORJSONResponse(await similar_movies(oid, kind, limit))
+    except Exception as e:
+        logger.exception("Similar movies error")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch similar movies: {str(e)}")
+
 @router.get("/debug/all")
 async def debug_all_movies():
     """Get ALL movies regardless of status"""
@@ -317,87 +294,64 @@ async def debug_all_movies():
         return {"error": str(e)}
     
     # Admin routes for movie management
-@router.get("/admin/pending", response_model=List[MovieOut])
-async def get_pending_movies():
-    """Get all pending movies for admin approval"""
+@router.get("/admin/pending", response_model=List[MovieOut], dependencies=[Depends(admin_required)])
+async def get_pending_movies(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = None,  # comma-separated field names or "card"
+):
+    """Get pending movies for admin approval, oldest submission first"""
     try:
-        movies = await Movie.find(Movie.status == "pending").to_list()
-        movie_list = []
-        for m in movies:
-            movie_list.append(
-                MovieOut(
-                    id=str(m.id),
-                    title=m.title,
-                    description=m.description,
-                    genres=m.genres,
-                    release_date=m.release_date,
-                    duration=m.duration,
-                    poster_url=m.poster_url,
-                    trailer_url=m.trailer_url,
-                    director=m.director,
-                    cast=m.cast,
-                    language=m.language,
-                    country=m.country,
-                    age_rating=m.age_rating,
-                    rating=m.rating,
-                    submitted_by=m.submitted_by,
-                    status=m.status,
-                    featured=m.featured,
-                    created_at=m.created_at,
-                    updated_at=m.updated_at
-                )
-            )
-        return movie_list
+        selected = resolve_fields(fields)
+        movies, next_cursor = await paginate(
+            Movie, {"status": "pending"}, "created_at", 1, limit, cursor=cursor,
+            projection=movie_projection(selected)
+        )
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return ORJSONResponse([serialize_movie(m, selected) for m in movies], headers=headers)
+    except (InvalidCursor, InvalidFields) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"💥 Pending movies error: {e}")
+        logger.exception("Pending movies error")
         raise HTTPException(status_code=500, detail=f"Failed to fetch pending movies: {str(e)}")
 
-@router.post("/admin/{movie_id}/approve")
+@router.post("/admin/{movie_id}/approve", dependencies=[Depends(admin_required)])
 async def approve_movie(movie_id: str):
     """Approve a pending movie"""
     try:
-        movie = await Movie.get(PydanticObjectId(movie_id))
-        if not movie:
-            raise HTTPException(status_code=404, detail="Movie not found")
-        
-        movie.status = "approved"
-        await movie.save()
-        
-        return {"message": "Movie approved successfully"}
+        outcome = (await moderate_movies("approve", [movie_id]))["results"][0]["outcome"]
     except Exception as e:
-        print(f"💥 Approve movie error: {e}")
+        logger.exception("Approve movie error")
         raise HTTPException(status_code=500, detail=f"Failed to approve movie: {str(e)}")
+    if outcome in ("invalid_id", "not_found"):
+        raise HTTPException(status_code=404, detail="Movie not found")
+    if outcome == "conflict":
+        raise HTTPException(status_code=409, detail="Movie was moderated by another request; reload and retry")
+    return {"message": "Movie approved successfully"}
 
-@router.post("/admin/{movie_id}/reject")
+@router.post("/admin/{movie_id}/reject", dependencies=[Depends(admin_required)])
 async def reject_movie(movie_id: str):
     """Reject a pending movie"""
     try:
-        movie = await Movie.get(PydanticObjectId(movie_id))
-        if not movie:
-            raise HTTPException(status_code=404, detail="Movie not found")
-        
-        # You can either delete the movie or mark it as rejected
-        movie.status = "rejected"
-        await movie.save()
-        
-        return {"message": "Movie rejected successfully"}
+        # Rejected movies are kept (status "rejected") rather than deleted
+        outcome = (await moderate_movies("reject", [movie_id]))["results"][0]["outcome"]
     except Exception as e:
-        print(f"💥 Reject movie error: {e}")
+        logger.exception("Reject movie error")
         raise HTTPException(status_code=500, detail=f"Failed to reject movie: {str(e)}")
+    if outcome in ("invalid_id", "not_found"):
+        raise HTTPException(status_code=404, detail="Movie not found")
+    if outcome == "conflict":
+        raise HTTPException(status_code=409, detail="Movie was moderated by another request; reload and retry")
+    return {"message": "Movie rejected successfully"}
 
-@router.post("/admin/{movie_id}/feature")
-async def toggle_featured(movie_id: str):
+@router.post("/admin/{movie_id}/feature", dependencies=[Depends(admin_required)])
+async def toggle_featured_movie(movie_id: str):
     """Toggle featured status of a movie"""
     try:
-        movie = await Movie.get(PydanticObjectId(movie_id))
-        if not movie:
-            raise HTTPException(status_code=404, detail="Movie not found")
-        
-        movie.featured = not movie.featured
-        await movie.save()
-        
-        return {"message": f"Movie {'featured' if movie.featured else 'unfeatured'} successfully", "featured": movie.featured}
+        featured = await toggle_featured(movie_id)
     except Exception as e:
-        print(f"💥 Toggle featured error: {e}")
+        logger.exception("Toggle featured error")
         raise HTTPException(status_code=500, detail=f"Failed to toggle featured: {str(e)}")
-
+    if featured is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    return {"message": f"Movie {'featured' if featured else 'unfeatured'} successfully", "featured": featured}
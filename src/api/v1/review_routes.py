@@ -1,18 +1,30 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
 from models.review import Review
 from schemas.review import ReviewCreate, ReviewOut
 from models.movie import Movie
 from beanie import PydanticObjectId
 from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from utils.pagination import InvalidCursor, paginate
+from services.rating_service import apply_rating_change
+from services.leaderboard_service import record_review
+from core.cache import response_cache
+from core.security import TokenUser, get_current_user
+from core.serialization import REVIEW_PROJECTION, ORJSONResponse, serialize_review
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/reviews", tags=["Reviews"])
 
 @router.post("/", response_model=ReviewOut)
-async def create_review(review_data: ReviewCreate, user_id: str = "anonymous", username: str = "Anonymous"):
+async def create_review(review_data: ReviewCreate, user: TokenUser = Depends(get_current_user)):
     """
-    Create a new review for a movie
+    Create (or update) the caller's review for a movie
     """
+    user_id, username = user.email, user.username
     try:
         # Validate movie exists
         movie = await Movie.get(PydanticObjectId(review_data.movie_id))
@@ -23,152 +35,146 @@ async def create_review(review_data: ReviewCreate, user_id: str = "anonymous", u
         if review_data.rating < 1 or review_data.rating > 5:
             raise HTTPException(status_code=400, detail="Rating must be between 1 and 5")
         
-        # Check if user already reviewed this movie
-        existing_review = await Review.find_one(
-            Review.movie_id == PydanticObjectId(review_data.movie_id),
-            Review.user_id == user_id
-        )
+        # Update the caller's existing review, if any. The write returns the
+        # review as it was, so concurrent edits each see the rating the other
+        # left behind and their deltas add up correctly.
+        now = datetime.utcnow()
+        changes = {"rating": review_data.rating, "review_text": review_data.review_text, "updated_at": now}
+        previous = await _update_review(movie.id, user_id, changes)
         
-        if existing_review:
-            # Update existing review
-            existing_review.rating = review_data.rating
-            existing_review.review_text = review_data.review_text
-            existing_review.updated_at = datetime.utcnow()
-            await existing_review.save()
-            
-            # Recalculate movie rating
-            await update_movie_rating(review_data.movie_id)
-            
-            return ReviewOut(
-                id=str(existing_review.id),
-                movie_id=str(existing_review.movie_id),
-                user_id=existing_review.user_id,
-                username=existing_review.username,
-                rating=existing_review.rating,
-                review_text=existing_review.review_text,
-                created_at=existing_review.created_at,
-                updated_at=existing_review.updated_at
+        if previous is None:
+            # Create new review
+            review = Review(
+                movie_id=movie.id,
+                user_id=user_id,
+                username=username,
+                created_at=now,
+                **changes,
             )
+            try:
+                await review.insert()
+            except DuplicateKeyError:
+                # A concurrent request created it first (movie_user_unique): update that one instead
+                previous = await _update_review(movie.id, user_id, changes)
+            else:
+                # Update movie average rating
+                await update_movie_rating(review_data.movie_id, None, review.rating, now)
+                return ORJSONResponse(serialize_review(review))
         
-        # Create new review
-        review = Review(
-            movie_id=PydanticObjectId(review_data.movie_id),
-            user_id=user_id,
-            username=username,
-            rating=review_data.rating,
-            review_text=review_data.review_text
-        )
-        await review.insert()
-        
-        # Update movie average rating
-        await update_movie_rating(review_data.movie_id)
-        
-        return ReviewOut(
-            id=str(review.id),
-            movie_id=str(review.movie_id),
-            user_id=review.user_id,
-            username=review.username,
-            rating=review.rating,
-            review_text=review.review_text,
-            created_at=review.created_at,
-            updated_at=review.updated_at
-        )
+        # Adjust movie rating by the delta
+        await update_movie_rating(review_data.movie_id, previous["rating"], review_data.rating, previous.get("created_at"))
+        return ORJSONResponse(serialize_review({**previous, **changes}))
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"💥 Create review error: {e}")
+        logger.exception("Create review error")
         raise HTTPException(status_code=500, detail=f"Failed to create review: {str(e)}")
 
+async def _update_review(movie_id: PydanticObjectId, user_id: str, changes: dict) -> Optional[dict]:
+    """Apply `changes` to a user's review of a movie in one write; returns the review before it, or None"""
+    return await Review.get_motor_collection().find_one_and_update(
+        {"movie_id": movie_id, "user_id": user_id},
+        {"$set": changes},
+        return_document=ReturnDocument.BEFORE,
+    )
+
 @router.get("/movie/{movie_id}", response_model=List[ReviewOut])
-async def get_movie_reviews(movie_id: str):
+async def get_movie_reviews(
+    movie_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
     """
-    Get all reviews for a specific movie
+    Get reviews for a specific movie, newest first
     """
     try:
-        reviews = await Review.find(Review.movie_id == PydanticObjectId(movie_id)).sort(-Review.created_at).to_list()
-        
-        return [
-            ReviewOut(
-                id=str(r.id),
-                movie_id=str(r.movie_id),
-                user_id=r.user_id,
-                username=r.username,
-                rating=r.rating,
-                review_text=r.review_text,
-                created_at=r.created_at,
-                updated_at=r.updated_at
-            ) for r in reviews
-        ]
+        reviews, next_cursor = await paginate(
+            Review, {"movie_id": PydanticObjectId(movie_id)}, "created_at", -1, limit, cursor=cursor,
+            projection=REVIEW_PROJECTION
+        )
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return ORJSONResponse([serialize_review(r) for r in reviews], headers=headers)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"💥 Get reviews error: {e}")
+        logger.exception("Get reviews error")
         raise HTTPException(status_code=500, detail=f"Failed to fetch reviews: {str(e)}")
 
 @router.get("/user/{user_id}", response_model=List[ReviewOut])
-async def get_user_reviews(user_id: str):
+async def get_user_reviews(
+    user_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
     """
-    Get all reviews by a specific user
+    Get reviews by a specific user, newest first
     """
     try:
-        reviews = await Review.find(Review.user_id == user_id).sort(-Review.created_at).to_list()
-        
-        return [
-            ReviewOut(
-                id=str(r.id),
-                movie_id=str(r.movie_id),
-                user_id=r.user_id,
-                username=r.username,
-                rating=r.rating,
-                review_text=r.review_text,
-                created_at=r.created_at,
-                updated_at=r.updated_at
-            ) for r in reviews
-        ]
+        reviews, next_cursor = await paginate(
+            Review, {"user_id": user_id}, "created_at", -1, limit, cursor=cursor,
+            projection=REVIEW_PROJECTION
+        )
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return ORJSONResponse([serialize_review(r) for r in reviews], headers=headers)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"💥 Get user reviews error: {e}")
+        logger.exception("Get user reviews error")
         raise HTTPException(status_code=500, detail=f"Failed to fetch user reviews: {str(e)}")
 
 @router.delete("/{review_id}")
-async def delete_review(review_id: str, user_id: str = "anonymous"):
+async def delete_review(review_id: str, user: TokenUser = Depends(get_current_user)):
     """
-    Delete a review (only by the user who created it)
+    Delete a review (only by the user who created it, or an admin)
     """
     try:
         review = await Review.get(PydanticObjectId(review_id))
         if not review:
             raise HTTPException(status_code=404, detail="Review not found")
         
-        if review.user_id != user_id:
+        if review.user_id != user.email and not user.is_admin:
             raise HTTPException(status_code=403, detail="Not authorized to delete this review")
         
-        movie_id = str(review.movie_id)
-        await review.delete()
+        # Only the request that actually deletes it takes the rating back out
+        deleted = await Review.get_motor_collection().find_one_and_delete({"_id": review.id})
+        if deleted is None:
+            raise HTTPException(status_code=404, detail="Review not found")
         
-        # Recalculate movie rating
-        await update_movie_rating(movie_id)
+        # Remove the review from the movie rating
+        await update_movie_rating(str(deleted["movie_id"]), deleted["rating"], None, deleted.get("created_at"))
         
         return {"message": "Review deleted successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"💥 Delete review error: {e}")
+        logger.exception("Delete review error")
         raise HTTPException(status_code=500, detail=f"Failed to delete review: {str(e)}")
 
-async def update_movie_rating(movie_id: str):
+async def update_movie_rating(
+    movie_id: str,
+    old_rating: Optional[int],
+    new_rating: Optional[int],
+    reviewed_at: Optional[datetime] = None,
+):
     """
-    Recalculate and update the average rating for a movie
+    Apply a review change to the movie's rating aggregates with one atomic update,
+    then to its leaderboard entries (`reviewed_at`: when the review was created).
+    Each step logs its own failure, so a leaderboard error never skips invalidation.
     """
     try:
-        reviews = await Review.find(Review.movie_id == PydanticObjectId(movie_id)).to_list()
-        
-        if reviews:
-            avg_rating = sum(r.rating for r in reviews) / len(reviews)
-            movie = await Movie.get(PydanticObjectId(movie_id))
-            if movie:
-                movie.rating = round(avg_rating, 1)
-                await movie.save()
-        else:
-            # No reviews, set rating to None
-            movie = await Movie.get(PydanticObjectId(movie_id))
-            if movie:
-                movie.rating = None
-                await movie.save()
-    except Exception as e:
-        print(f"💥 Update movie rating error: {e}")
+        movie = await apply_rating_change(movie_id, old_rating, new_rating)
+    except Exception:
+        logger.exception("Update movie rating error")
+        return
+    if not movie:
+        return
+    try:
+        await record_review(movie, old_rating, new_rating, reviewed_at)
+    except Exception:
+        logger.exception("Leaderboard update error")
+    try:
+        await response_cache.invalidate_movie(movie_id, lists=movie.get("status") == "approved")
+    except Exception:
+        logger.exception("Movie cache invalidation error")
 
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, EmailStr
 from typing import Optional, Literal
 from datetime import datetime
 from services.user_service import get_user
+from core.security import TokenUser, get_current_user, require_self_or_admin
 
 router = APIRouter(prefix="/users", tags=["Users"])  # CHANGE THIS
 
@@ -30,7 +31,10 @@ async def get_user_profile(user_id: str):
     )
 
 @router.put("/{user_id}")
-async def update_user_profile(user_id: str, profile_data: UserProfileResponse):
+async def update_user_profile(
+    user_id: str, profile_data: UserProfileResponse, caller: TokenUser = Depends(get_current_user)
+):
+    require_self_or_admin(caller, user_id)
     user = await get_user(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
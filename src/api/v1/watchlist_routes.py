@@ -1,17 +1,25 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
 from models.user import User
 from models.movie import Movie
 from schemas.movie import MovieOut
 from beanie import PydanticObjectId
+from services.movie_service import InvalidFields, get_movies_by_ids, movie_projection, resolve_fields
+from services.user_service import get_watchlist_page
+from core.serialization import ORJSONResponse, serialize_movie
+from core.security import TokenUser, get_current_user, require_self_or_admin
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/watchlist", tags=["Watchlist"])
 
 @router.post("/{user_id}/add/{movie_id}")
-async def add_to_watchlist(user_id: str, movie_id: str):
+async def add_to_watchlist(user_id: str, movie_id: str, caller: TokenUser = Depends(get_current_user)):
     """
     Add a movie to user's watchlist
     """
+    require_self_or_admin(caller, user_id)
     try:
         # Find user by email (user_id is email)
         user = await User.find_one(User.email == user_id)
@@ -34,14 +42,15 @@ async def add_to_watchlist(user_id: str, movie_id: str):
         return {"message": "Movie added to watchlist", "watchlist": [str(mid) for mid in user.watchlist]}
         
     except Exception as e:
-        print(f"💥 Add to watchlist error: {e}")
+        logger.exception("Add to watchlist error")
         raise HTTPException(status_code=500, detail=f"Failed to add to watchlist: {str(e)}")
 
 @router.delete("/{user_id}/remove/{movie_id}")
-async def remove_from_watchlist(user_id: str, movie_id: str):
+async def remove_from_watchlist(user_id: str, movie_id: str, caller: TokenUser = Depends(get_current_user)):
     """
     Remove a movie from user's watchlist
     """
+    require_self_or_admin(caller, user_id)
     try:
         user = await User.find_one(User.email == user_id)
         if not user:
@@ -57,60 +66,52 @@ async def remove_from_watchlist(user_id: str, movie_id: str):
         return {"message": "Movie removed from watchlist", "watchlist": [str(mid) for mid in user.watchlist]}
         
     except Exception as e:
-        print(f"💥 Remove from watchlist error: {e}")
+        logger.exception("Remove from watchlist error")
         raise HTTPException(status_code=500, detail=f"Failed to remove from watchlist: {str(e)}")
 
 @router.get("/{user_id}", response_model=List[MovieOut])
-async def get_watchlist(user_id: str):
+async def get_watchlist(
+    user_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = None,  # comma-separated field names or "card"
+    caller: TokenUser = Depends(get_current_user),
+):
     """
-    Get user's watchlist movies
+    Get user's watchlist movies, in the order they were added.
+    Pages over the watchlist array on the server; its length is returned in X-Total-Count.
     """
+    require_self_or_admin(caller, user_id)
     try:
-        user = await User.find_one(User.email == user_id)
-        if not user:
+        selected = resolve_fields(fields)
+    except InvalidFields as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        page = await get_watchlist_page(user_id, offset, limit)
+        if page is None:
             raise HTTPException(status_code=404, detail="User not found")
+        movie_ids, total = page
         
-        if not user.watchlist:
-            return []
-        
-        # Fetch all movies in watchlist
-        movies = []
-        for movie_id in user.watchlist:
-            movie = await Movie.get(movie_id)
-            if movie and movie.status == "approved":
-                movies.append(MovieOut(
-                    id=str(movie.id),
-                    title=movie.title,
-                    description=movie.description,
-                    genres=movie.genres,
-                    release_date=movie.release_date,
-                    duration=movie.duration,
-                    poster_url=movie.poster_url,
-                    trailer_url=movie.trailer_url,
-                    director=movie.director,
-                    cast=movie.cast,
-                    language=movie.language,
-                    country=movie.country,
-                    age_rating=movie.age_rating,
-                    rating=movie.rating,
-                    submitted_by=movie.submitted_by,
-                    status=movie.status,
-                    featured=movie.featured,
-                    created_at=movie.created_at,
-                    updated_at=movie.updated_at
-                ))
-        
-        return movies
+        # Fetch the whole page in one round trip
+        movies = await get_movies_by_ids(movie_ids, projection=movie_projection(selected))
+        return ORJSONResponse(
+            [serialize_movie(m, selected) for m in movies],
+            headers={"X-Total-Count": str(total)},
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"💥 Get watchlist error: {e}")
+        logger.exception("Get watchlist error")
         raise HTTPException(status_code=500, detail=f"Failed to fetch watchlist: {str(e)}")
 
 @router.get("/{user_id}/check/{movie_id}")
-async def check_watchlist(user_id: str, movie_id: str):
+async def check_watchlist(user_id: str, movie_id: str, caller: TokenUser = Depends(get_current_user)):
     """
     Check if a movie is in user's watchlist
     """
+    require_self_or_admin(caller, user_id)
     try:
         user = await User.find_one(User.email == user_id)
         if not user:
@@ -1,41 +1,78 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from api.routes import router as api_router
-from core.db import init_db
+from api.health_routes import router as health_router
+from core.db import close_db, init_db
+from core import passwords
+from core.security import signing_key
 from core.config import settings
+from core.serialization import ORJSONResponse
+from core.rate_limit import RateLimitMiddleware
+from core.metrics import MetricsMiddleware, registry
+from core.log import RequestIdMiddleware, setup_logging
+from core.compression import CompressionMiddleware
+from fastapi.responses import PlainTextResponse
+import hmac
 import os
 
-app = FastAPI(title="CineCheck API")
+# JSON lines through a background writer thread; handlers never block on stdout
+setup_logging()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fail fast: with a placeholder JWT_SECRET anyone could mint admin tokens, and if
+    # MongoDB is unreachable the instance would only serve errors; either aborts startup
+    signing_key()
+    await init_db()
+    yield
+    await close_db()
+    passwords.shutdown()
+
+app = FastAPI(title="CineCheck API", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Enable CORS for frontend
 # Get CORS origins from settings (handles comma-separated string from env)
 cors_origins = settings.get_cors_origins_list()
 
+# Innermost: cached bodies arrive precompressed and pass through, the rest is negotiated here
+app.add_middleware(CompressionMiddleware)
+
+# Added before CORS so rejections (429/503) still carry CORS headers
+app.add_middleware(RateLimitMiddleware)
+# Outside the rate limiter so rejected and shed requests are counted too
+app.add_middleware(MetricsMiddleware)
+# Outermost of ours, so every log line of a request (and its access line) carries the ID
+app.add_middleware(RequestIdMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor", "Retry-After", "Server-Timing", "X-Request-ID", "ETag"],
 )
 
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
-
-# Lifespan startup event
-@app.on_event("startup")  # Render will still call this
-async def startup_event():
-    try:
-        await init_db()
-        print("✅ MongoDB connected and Beanie initialized")
-    except Exception as e:
-        print(f"❌ MongoDB failed: {e}")
-
+app.include_router(health_router)
 
 @app.get("/")
 def root():
     return {"message": "CineCheck API is running!"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    # Exempt from rate limiting so scrapes keep working under load; the token keeps it private
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    supplied = request.headers.get("authorization", "")
+    if not hmac.compare_digest(supplied.encode(), f"Bearer {settings.METRICS_TOKEN}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token", headers={"WWW-Authenticate": "Bearer"})
+    # Prometheus text exposition format
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 # Run on Render
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,340 @@
+import asyncio
+import json
+import time
+import uuid
+import hashlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from fastapi import Response
+from core.config import settings
+from core.compression import (
+    choose_encoding, compress, decompress, encoded_etag, strip_encoded_etag, supported_encodings,
+)
+
+class CacheBackend:
+    """
+    Minimal byte-oriented key/value interface the response cache is built on.
+    `shared` backends are seen by every worker, so a generation bump reaches them all.
+    """
+    shared = False
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float, nx: bool = False) -> bool:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Bounded in-process LRU with per-entry TTL.
+    Each worker process has its own copy, so staleness across workers is bounded by the TTL.
+    """
+    def __init__(self, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float, nx: bool = False) -> bool:
+        now = self._clock()
+        if nx:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return False
+        self._entries[key] = (now + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared cache for multi-worker deployments. Works with any client exposing the
+    redis-py asyncio API (get / set(ex=, nx=) / delete). Eviction is left to Redis'
+    own maxmemory policy, so only hits and misses are counted here.
+    """
+    shared = True
+
+    def __init__(self, client, prefix: str = "cinecheck:cache:"):
+        self.client = client
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.client.get(self.prefix + key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float, nx: bool = False) -> bool:
+        result = await self.client.set(self.prefix + key, value, ex=max(1, int(ttl)), nx=nx)
+        return bool(result)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis", "hits": self.hits, "misses": self.misses}
+
+def build_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis":
+        # Optional dependency, only needed when the Redis backend is configured
+        import redis.asyncio as redis
+
+        return RedisCacheBackend(redis.from_url(settings.REDIS_URL))
+    return MemoryCacheBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+
+class ResponseCache:
+    """
+    Caches serialized JSON responses for the hot movie read endpoints.
+
+    Keys embed a generation token per namespace: "movies" for every list
+    endpoint and "movie:<id>" for a single movie. Writers bump the generation
+    of what they changed, which orphans the old entries instead of having to
+    find and delete them; orphans age out through the TTL / LRU.
+
+    Each entry carries a strong ETag hashed from its uncompressed body when it
+    is built, so the tag changes exactly when the content does, whichever
+    worker built it. A matching If-None-Match is answered with 304 from the
+    cache entry, without a MongoDB read while the entry is live. On a shared
+    backend the entry's validators are also kept for as long as generations
+    (10x TTL), so a conditional request for an expired entry still gets its 304
+    before anything is built. A per-process backend cannot do that safely: a
+    worker that missed another's invalidation would keep confirming the old
+    tag, so there an expired entry is rebuilt (one MongoDB read) and its body
+    hashed before answering.
+
+    Bodies of at least COMPRESSION_MIN_SIZE bytes are stored compressed, so a
+    hot entry is compressed once when it is built rather than on every hit.
+    """
+    LISTS = "movies"
+    VALIDATOR_HEADERS = ("ETag", "Cache-Control", "Content-Encoding")
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def movie_namespace(movie_id: Any) -> str:
+        return f"movie:{movie_id}"
+
+    async def generation(self, namespace: str) -> str:
+        key = f"gen:{namespace}"
+        value = await self.backend.get(key)
+        if value is None:
+            # First writer wins so concurrent readers agree on the generation
+            await self.backend.set(key, uuid.uuid4().hex.encode(), self.ttl * 10, nx=True)
+            value = await self.backend.get(key) or b"0"
+        return value.decode()
+
+    async def bump(self, namespace: str) -> None:
+        await self.backend.set(f"gen:{namespace}", uuid.uuid4().hex.encode(), self.ttl * 10)
+
+    async def make_key(self, namespace: str, route: str, params: Dict[str, Any]) -> str:
+        """
+        Build a key from the route and its resolved parameters, so equivalent
+        requests (reordered query strings, explicit defaults) share one entry.
+        """
+        normalized = json.dumps(
+            {k: v for k, v in params.items() if v is not None}, sort_keys=True, default=str
+        )
+        digest = hashlib.sha1(normalized.encode()).hexdigest()
+        return f"{namespace}:{await self.generation(namespace)}:{route}:{digest}"
+
+    @staticmethod
+    def etag_for(body: bytes) -> str:
+        return '"' + hashlib.sha1(body).hexdigest()[:24] + '"'
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        """If-None-Match uses the weak comparison, so W/"x" matches "x" """
+        # "*" is not honoured: answering it would need to know the resource exists
+        if not if_none_match:
+            return False
+        return any(
+            strip_encoded_etag(tag.strip().removeprefix("W/")) == etag for tag in if_none_match.split(",")
+        )
+
+    @staticmethod
+    def storage_encoding(body: bytes) -> Optional[str]:
+        """Content coding to store a body with, or None to keep it as is"""
+        if not settings.COMPRESSION_ENABLED or len(body) < settings.COMPRESSION_MIN_SIZE:
+            return None
+        encoding = settings.COMPRESSION_CACHE_ENCODING
+        return encoding if encoding in supported_encodings() else "gzip"
+
+    @staticmethod
+    def response_encoding(headers: Dict[str, str], accept_encoding: Optional[str]) -> Optional[str]:
+        """
+        Content coding the client ends up with for a stored entry: the stored
+        one if accepted, else whatever the compression middleware negotiates
+        for a body that was large enough to store compressed.
+        """
+        stored = headers.get("Content-Encoding")
+        if stored is None:
+            return None
+        if choose_encoding(accept_encoding, [stored]):
+            return stored
+        return choose_encoding(accept_encoding) if settings.COMPRESSION_ENABLED else None
+
+    @classmethod
+    def not_modified_response(cls, headers: Dict[str, str], accept_encoding: Optional[str]) -> Response:
+        """304 carrying the same (coding-specific) ETag the 200 would have"""
+        encoding = cls.response_encoding(headers, accept_encoding)
+        validators = {"ETag": headers["ETag"], "Cache-Control": headers["Cache-Control"]}
+        if encoding is not None:
+            validators["ETag"] = encoded_etag(validators["ETag"].encode(), encoding).decode()
+            validators["Vary"] = "Accept-Encoding"
+        return Response(status_code=304, headers=validators)
+
+    @staticmethod
+    def render(body: bytes, headers: Dict[str, str], accept_encoding: Optional[str]) -> Response:
+        """
+        Response for a stored body: sent as stored if the client accepts its
+        coding, otherwise decoded (the compression middleware may re-encode it).
+        """
+        encoding = headers.get("Content-Encoding")
+        if encoding is not None:
+            if choose_encoding(accept_encoding, [encoding]):
+                headers = {**headers, "Vary": "Accept-Encoding"}
+                if "ETag" in headers:
+                    headers["ETag"] = encoded_etag(headers["ETag"].encode(), encoding).decode()
+            else:
+                body = decompress(body, encoding)
+                headers = {name: value for name, value in headers.items() if name != "Content-Encoding"}
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def get_entry(self, key: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        raw = await self.backend.get(key)
+        if raw is None:
+            return None
+        header_line, body = raw.split(b"\n", 1)
+        return body, json.loads(header_line)
+
+    async def set_response(self, key: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        raw = json.dumps(headers or {}).encode() + b"\n" + body
+        await self.backend.set(key, raw, self.ttl)
+        if self.backend.shared and headers and "ETag" in headers:
+            validators = {name: headers[name] for name in self.VALIDATOR_HEADERS if name in headers}
+            await self.backend.set(f"etag:{key}", json.dumps(validators).encode(), self.ttl * 10)
+
+    async def get_validators(self, key: str) -> Optional[Dict[str, str]]:
+        """ETag (and what negotiating its variant needs) of an entry built under `key`, even once it expired"""
+        if not self.backend.shared:
+            return None
+        raw = await self.backend.get(f"etag:{key}")
+        return json.loads(raw) if raw is not None else None
+
+    async def cached(
+        self,
+        namespace: str,
+        route: str,
+        params: Dict[str, Any],
+        build: Callable[[], Awaitable[Tuple[bytes, Dict[str, str]]]],
+        if_none_match: Optional[str] = None,
+        accept_encoding: Optional[str] = None,
+    ) -> Response:
+        """
+        Return the cached response for these parameters, or build, store and return it.
+        Answers 304 Not Modified when `if_none_match` still matches the entry's ETag.
+        """
+        key = await self.make_key(namespace, route, params)
+        entry = await self.get_entry(key)
+        if entry is None and if_none_match:
+            # Expired entry, same generation: its tag still names the current content
+            validators = await self.get_validators(key)
+            if validators is not None and self.etag_matches(if_none_match, validators["ETag"]):
+                self.not_modified += 1
+                return self.not_modified_response(validators, accept_encoding)
+        if entry is not None:
+            self.hits += 1
+            body, headers = entry
+        else:
+            self.misses += 1
+            body, headers = await build()
+            headers = {**headers, "ETag": self.etag_for(body), "Cache-Control": "no-cache"}
+            encoding = self.storage_encoding(body)
+            if encoding is not None:
+                body = compress(body, encoding)
+                headers = {**headers, "Content-Encoding": encoding}
+            await self.set_response(key, body, headers)
+
+        if self.etag_matches(if_none_match, headers["ETag"]):
+            self.not_modified += 1
+            return self.not_modified_response(headers, accept_encoding)
+        return self.render(body, headers, accept_encoding)
+
+    async def invalidate_movie(self, movie_id: Any, lists: bool = True) -> None:
+        """
+        Drop cached reads for one movie, and the list endpoints when `lists` is set
+        (i.e. the change is visible in approved/featured listings).
+        """
+        await self.bump(self.movie_namespace(movie_id))
+        if lists:
+            await self.bump(self.LISTS)
+
+    async def invalidate_movies(self, movie_ids: Iterable[Any], lists: bool = True) -> None:
+        """
+        Batch form of invalidate_movie: every movie generation is bumped concurrently
+        and the list generation at most once.
+        """
+        namespaces = [self.movie_namespace(movie_id) for movie_id in movie_ids]
+        if lists:
+            namespaces.append(self.LISTS)
+        await asyncio.gather(*(self.bump(namespace) for namespace in namespaces))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ttl_seconds": self.ttl,
+            "response_hits": self.hits,
+            "response_misses": self.misses,
+            "not_modified": self.not_modified,
+            "backend": self.backend.stats(),
+        }
+
+response_cache = ResponseCache(build_backend(), ttl=settings.CACHE_TTL_SECONDS)
@@ -0,0 +1,159 @@
+import gzip
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+from core.config import settings
+
+try:
+    # Optional dependency; without it only gzip is offered
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+COMPRESSIBLE_TYPES = re.compile(rb"^(application/(json|x-ndjson|javascript)|text/)")
+
+def supported_encodings() -> List[str]:
+    """Content codings this process can produce, in order of preference"""
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+def choose_encoding(accept_encoding: Optional[str], available: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Pick the preferred coding the client accepts (q > 0) from an Accept-Encoding
+    header, or None for identity.
+    """
+    if not accept_encoding:
+        return None
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+    for encoding in available or supported_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY if level is None else level)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL if level is None else level, mtime=0)
+
+def decompress(body: bytes, encoding: str) -> bytes:
+    return brotli.decompress(body) if encoding == "br" else gzip.decompress(body)
+
+class _StreamCompressor:
+    """Incremental compression for streamed bodies (exports)"""
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+            self.compress, self._finish = self._compressor.process, self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self.compress, self._finish = self._compressor.compress, self._compressor.flush
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+def encoded_etag(etag: bytes, encoding: str) -> bytes:
+    """A strong ETag names exact bytes, so each coding gets its own: "abc" -> "abc-gzip" """
+    if etag.endswith(b'"'):
+        return etag[:-1] + b"-" + encoding.encode() + b'"'
+    return etag
+
+def strip_encoded_etag(etag: str) -> str:
+    """Inverse of encoded_etag, so If-None-Match works for compressed variants"""
+    for encoding in ("br", "gzip"):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + '"'
+    return etag
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+class CompressionMiddleware:
+    """
+    Negotiates br/gzip for responses of compressible types. Bodies under
+    `min_size` are sent as they are; responses that already carry a
+    Content-Encoding (precompressed cache entries) pass through untouched.
+    Streamed responses are compressed incrementally.
+    """
+    def __init__(self, app, min_size: Optional[int] = None):
+        self.app = app
+        self.min_size = settings.COMPRESSION_MIN_SIZE if min_size is None else min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = _header(scope.get("headers", []), b"accept-encoding")
+        encoding = choose_encoding(accept_encoding.decode("latin-1") if accept_encoding else None)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+        stream: Optional[_StreamCompressor] = None
+
+        async def send_compressed(message):
+            nonlocal start, passthrough, stream
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                content_type = _header(headers, b"content-type") or b""
+                passthrough = (
+                    _header(headers, b"content-encoding") is not None
+                    or not COMPRESSIBLE_TYPES.match(content_type)
+                    or message["status"] in (204, 304)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message  # held until the size of the body is known
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                if not more_body and len(body) < self.min_size:
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+                headers = [
+                    (key, value) for key, value in start.get("headers", [])
+                    if key.lower() not in (b"content-length", b"etag")
+                ]
+                etag = _header(start.get("headers", []), b"etag")
+                if etag is not None:
+                    headers.append((b"etag", encoded_etag(etag, encoding)))
+                headers += [(b"content-encoding", encoding.encode()), (b"vary", b"Accept-Encoding")]
+                if not more_body:
+                    compressed = compress(body, encoding)
+                    headers.append((b"content-length", str(len(compressed)).encode()))
+                    await send({**start, "headers": headers})
+                    start = None
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                await send({**start, "headers": headers})
+                start = None
+                stream = _StreamCompressor(encoding)
+            chunk = stream.compress(body)
+            if not more_body:
+                chunk += stream.finish()
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -10,6 +10,63 @@ class Settings(BaseSettings):
     JWT_SECRET: str = os.getenv("JWT_SECRET", "your-secret-key")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+    # How often each worker picks up logouts/role changes made through other workers: a revoked
+    # token keeps working on another worker for at most this long
+    TOKEN_REVOCATION_REFRESH_SECONDS: float = float(os.getenv("TOKEN_REVOCATION_REFRESH_SECONDS", "5"))
+    # bcrypt work factor (2^rounds iterations); stored hashes below it are upgraded on login
+    PASSWORD_BCRYPT_ROUNDS: int = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12"))
+    # Threads doing bcrypt work, so hashing never runs on the event loop
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    # Response cache for hot movie reads: "memory" (per process) or "redis" (shared)
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Request admission: per-client token buckets and a global in-flight limit with a bounded queue
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # "memory" or "redis"
+    # Proxies in front of the app that append to X-Forwarded-For (Render/Vercel: 1). The client is
+    # the hop the outermost of them appended; anything left of it is client-supplied. 0 ignores the header.
+    TRUSTED_PROXY_HOPS: int = int(os.getenv("TRUSTED_PROXY_HOPS", "1"))
+    MAX_CONCURRENT_REQUESTS: int = int(os.getenv("MAX_CONCURRENT_REQUESTS", "64"))
+    MAX_QUEUED_REQUESTS: int = int(os.getenv("MAX_QUEUED_REQUESTS", "128"))
+    QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("QUEUE_TIMEOUT_SECONDS", "2"))
+    # MongoDB client pool / wire settings (one shared client per process)
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+    MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
+    MONGO_CONNECT_TIMEOUT_MS: int = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000"))
+    MONGO_SOCKET_TIMEOUT_MS: int = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "20000"))
+    # Comma-separated, in order of preference; zstd/snappy need their optional packages installed
+    MONGO_COMPRESSORS: str = os.getenv("MONGO_COMPRESSORS", "zlib")
+    # Create and verify indexes in init_db; serverless deployments turn this off to keep cold starts short
+    INDEX_SETUP_ON_STARTUP: bool = os.getenv("INDEX_SETUP_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+    MONGO_DRAIN_TIMEOUT_SECONDS: float = float(os.getenv("MONGO_DRAIN_TIMEOUT_SECONDS", "10"))
+    # GET /metrics answers only with "Authorization: Bearer <METRICS_TOKEN>"; unset, the endpoint is off (404)
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+    # Query-shape profiler: commands at or above SLOW_QUERY_MS are logged with their route
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "100"))
+    QUERY_PROFILER_MAX_SHAPES: int = int(os.getenv("QUERY_PROFILER_MAX_SHAPES", "500"))
+    # Logging: records go through a bounded queue to a writer thread and are dropped (and counted) when it is full
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")  # "json" or "text"
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_DEBUG_SAMPLE_RATE: float = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.01"))
+    LOG_ACCESS: bool = os.getenv("LOG_ACCESS", "true").lower() in ("1", "true", "yes")
+    # Response compression: br (when the optional brotli package is installed) or gzip
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+    # Coding cached response bodies are stored in; gzip is the one every client accepts
+    COMPRESSION_CACHE_ENCODING: str = os.getenv("COMPRESSION_CACHE_ENCODING", "gzip")
+    # Leaderboards: top-rated shrinks each movie's average towards the catalog mean by this many
+    # phantom reviews (mean re-read every LEADERBOARD_PRIOR_TTL_SECONDS); trending halves every half-life
+    LEADERBOARD_PRIOR_VOTES: float = float(os.getenv("LEADERBOARD_PRIOR_VOTES", "10"))
+    LEADERBOARD_PRIOR_TTL_SECONDS: float = float(os.getenv("LEADERBOARD_PRIOR_TTL_SECONDS", "600"))
+    LEADERBOARD_TRENDING_HALF_LIFE_HOURS: float = float(os.getenv("LEADERBOARD_TRENDING_HALF_LIFE_HOURS", "72"))
 
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
@@ -0,0 +1,176 @@
+import logging
+from typing import Any, Dict, List, Tuple
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+from models.movie import Movie
+from models.user import User
+from models.review import Review
+from models.movie_similarity import MovieSimilarity
+from models.leaderboard import LeaderboardEntry
+
+logger = logging.getLogger(__name__)
+
+MODELS = (Movie, User, Review, MovieSimilarity, LeaderboardEntry)
+
+# Unique indexes existing duplicate documents kept from being built (see create_indexes); /health/ready reports them
+index_failures: List[Dict[str, Any]] = []
+
+# The query each route actually sends, as (label, model, filter, sort, find options).
+# Keep in sync with services/movie_service.py and the route handlers.
+CANONICAL_QUERIES: List[Tuple[str, Any, Dict[str, Any], List[Tuple[str, int]], Dict[str, Any]]] = [
+    ("GET /movies", Movie, {"status": "approved"}, [("created_at", -1), ("_id", -1)], {}),
+    ("GET /movies?sort_by=rating", Movie, {"status": "approved"}, [("rating", -1), ("_id", -1)], {}),
+    ("GET /movies?sort_by=title", Movie, {"status": "approved"}, [("title", 1), ("_id", 1)],
+     {"collation": {"locale": "en", "strength": 2}}),
+    ("GET /movies?year=", Movie, {"status": "approved", "release_year": 1994}, [("created_at", -1), ("_id", -1)], {}),
+    ("GET /movies/featured", Movie, {"status": "approved", "featured": True}, [("rating", -1), ("_id", -1)], {}),
+    ("GET /admin/movies/pending", Movie, {"status": "pending"}, [("created_at", 1), ("_id", 1)], {}),
+    ("GET /reviews/movie/{id}", Review, {"movie_id": ObjectId()}, [("created_at", -1), ("_id", -1)], {}),
+    ("GET /reviews/user/{id}", Review, {"user_id": "user@example.com"}, [("created_at", -1), ("_id", -1)], {}),
+    ("auth / profile / watchlist lookup", User, {"email": "user@example.com"}, [], {}),
+    ("GET /movies/top-rated?genre=", LeaderboardEntry, {"genre": "Drama"}, [("top_score", -1), ("movie_id", 1)], {}),
+    ("GET /movies/trending", LeaderboardEntry, {"genre": ""}, [("trending_score", -1), ("movie_id", 1)], {}),
+    ("approve → content candidates", Movie, {"status": "approved", "content_tokens": "genre:drama"}, [], {}),
+    ("GET /movies/{id}/similar", MovieSimilarity, {"movie_id": ObjectId(), "kind": {"$in": ["collaborative", "content"]}}, [], {}),
+]
+
+def _plan_stages(plan: Dict[str, Any]) -> List[str]:
+    stages = [plan.get("stage", "")]
+    for child in plan.get("inputStages", []) + ([plan["inputStage"]] if "inputStage" in plan else []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+def _key_of(spec: Any) -> Tuple[Tuple[str, Any], ...]:
+    # the server may report directions as floats (1.0) while IndexModel uses ints
+    return tuple(
+        (field, int(direction) if isinstance(direction, (int, float)) else direction)
+        for field, direction in dict(spec).items()
+    )
+
+def _declared(model) -> List[Any]:
+    # Beanie wraps declared IndexModels once the document is initialised
+    return [getattr(index, "index", index) for index in model.get_settings().indexes or []]
+
+async def create_indexes(models=MODELS) -> List[Dict[str, Any]]:
+    """
+    Create the declared indexes one at a time. A unique index that documents
+    already in the collection violate (E11000) is logged and recorded in
+    `index_failures` instead of aborting startup, and the remaining indexes
+    are still built; `manage.py find-duplicates` lists the offending documents.
+    Any other error is raised.
+    """
+    index_failures.clear()
+    for model in models:
+        collection = model.get_motor_collection()
+        for index in _declared(model):
+            try:
+                await collection.create_indexes([index])
+            except OperationFailure as e:
+                if e.code != 11000:
+                    raise
+                failure = {"collection": collection.name, "index": index.document["name"], "error": str(e)}
+                logger.error(
+                    "Unique index %s.%s not built, existing documents are duplicates: %s "
+                    "(run `manage.py find-duplicates`)", failure["collection"], failure["index"], e,
+                )
+                index_failures.append(failure)
+    return index_failures
+
+async def find_duplicates(models=MODELS, limit: int = 100) -> List[Dict[str, Any]]:
+    """
+    Documents that share a key of a declared unique index (within its partial
+    filter), up to `limit` groups per index: what keeps the index from being built.
+    """
+    found: List[Dict[str, Any]] = []
+    for model in models:
+        collection = model.get_motor_collection()
+        for index in _declared(model):
+            document = index.document
+            if not document.get("unique"):
+                continue
+            fields = list(dict(document["key"]))
+            pipeline = [
+                {"$match": document.get("partialFilterExpression", {})},
+                {"$group": {"_id": {f"k{i}": f"${field}" for i, field in enumerate(fields)}, "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+                {"$match": {"count": {"$gt": 1}}},
+                {"$limit": limit},
+            ]
+            async for group in collection.aggregate(pipeline, allowDiskUse=True):
+                found.append({
+                    "collection": collection.name,
+                    "index": document["name"],
+                    "key": {field: group["_id"].get(f"k{i}") for i, field in enumerate(fields)},
+                    "ids": group["ids"],
+                })
+    return found
+
+async def verify_indexes(models=MODELS, explain: bool = True) -> Dict[str, Any]:
+    """
+    Compare the declared index set with what exists on the server, report indexes
+    that are missing, undeclared or unused, and explain() each canonical route query
+    to flag collection scans. Never raises: anything the server (or a test stand-in)
+    does not support is recorded in the report instead.
+    """
+    report: Dict[str, Any] = {"collections": {}, "collscans": [], "errors": []}
+
+    for model in models:
+        collection = model.get_motor_collection()
+        name = collection.name
+        declared = {}
+        for index in _declared(model):
+            document = index.document
+            declared[_key_of(document["key"])] = document.get("name")
+        entry: Dict[str, Any] = {"missing": [], "undeclared": [], "unused": []}
+        try:
+            existing = await collection.index_information()
+        except Exception as e:
+            report["errors"].append(f"{name}: index_information failed: {e}")
+            continue
+
+        existing_keys = {_key_of(info["key"]): index_name for index_name, info in existing.items()}
+        entry["missing"] = [index_name for key, index_name in declared.items() if key not in existing_keys]
+        entry["undeclared"] = [
+            index_name for key, index_name in existing_keys.items()
+            if key not in declared and index_name != "_id_"
+        ]
+
+        try:
+            async for stats in collection.aggregate([{"$indexStats": {}}]):
+                if stats["name"] != "_id_" and stats.get("accesses", {}).get("ops", 0) == 0:
+                    entry["unused"].append(stats["name"])
+        except Exception as e:
+            report["errors"].append(f"{name}: $indexStats unavailable: {e}")
+
+        report["collections"][name] = entry
+
+    if explain:
+        for label, model, query, sort, options in CANONICAL_QUERIES:
+            if model not in models:
+                continue
+            try:
+                cursor = model.get_motor_collection().find(query, **options)
+                if sort:
+                    cursor = cursor.sort(sort)
+                plan = await cursor.limit(20).explain()
+                winning = plan.get("queryPlanner", {}).get("winningPlan", {})
+                if "COLLSCAN" in _plan_stages(winning):
+                    report["collscans"].append(label)
+            except Exception as e:
+                report["errors"].append(f"{label}: explain failed: {e}")
+
+    return report
+
+def log_index_report(report: Dict[str, Any]) -> None:
+    for name, entry in report["collections"].items():
+        if entry["missing"]:
+            logger.warning("%s: missing indexes %s", name, entry["missing"])
+        if entry["undeclared"]:
+            logger.info("%s: undeclared indexes %s (drop them if nothing uses them)", name, entry["undeclared"])
+        if entry["unused"]:
+            logger.info("%s: indexes with no recorded use since server start %s", name, entry["unused"])
+    for label in report["collscans"]:
+        logger.warning("COLLSCAN for %s", label)
+    for error in report["errors"]:
+        logger.info("Index check skipped: %s", error)
+    if not any(entry["missing"] for entry in report["collections"].values()) and not report["collscans"]:
+        logger.info("Indexes verified")
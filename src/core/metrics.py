@@ -0,0 +1,234 @@
+import bisect
+import contextvars
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from pymongo import monitoring
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COMMAND_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        # listener callbacks run on Motor's executor threads
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {_number(value)}")
+        return lines
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(buckets)
+        # labels -> (per-bucket counts, +Inf last), sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(float(bound))
+                bucket_labels = _labels(self.label_names, labels, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total[0])}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route", "status")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled", ("method",)
+))
+db_commands_per_request = registry.register(Histogram(
+    "http_request_db_commands", "MongoDB commands issued while handling one request",
+    ("method", "route"), buckets=COMMAND_COUNT_BUCKETS,
+))
+db_time_per_request = registry.register(Histogram(
+    "http_request_db_seconds", "Server-reported MongoDB time spent for one request", ("method", "route")
+))
+mongo_commands = registry.register(Counter(
+    "mongodb_commands_total", "MongoDB commands by name and outcome", ("command", "outcome")
+))
+mongo_command_duration = registry.register(Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command round-trip time", ("command",)
+))
+
+class RequestDBStats:
+    __slots__ = ("commands", "seconds", "scope")
+
+    def __init__(self, scope=None):
+        self.commands = 0
+        self.seconds = 0.0
+        # the ASGI scope, so listeners can tell which route issued a command
+        self.scope = scope
+
+# Set per request by MetricsMiddleware; Motor copies the context onto its executor threads
+current_db_stats: contextvars.ContextVar[Optional[RequestDBStats]] = contextvars.ContextVar(
+    "current_db_stats", default=None
+)
+
+class CommandMetrics(monitoring.CommandListener):
+    """Counts MongoDB commands and their duration, globally and for the current request"""
+    def started(self, event):
+        stats = current_db_stats.get()
+        if stats is not None:
+            stats.commands += 1
+
+    def _finished(self, event, outcome: str):
+        seconds = event.duration_micros / 1_000_000
+        mongo_commands.inc(event.command_name, outcome)
+        mongo_command_duration.observe(seconds, event.command_name)
+        stats = current_db_stats.get()
+        if stats is not None:
+            stats.seconds += seconds
+
+    def succeeded(self, event):
+        self._finished(event, "success")
+
+    def failed(self, event):
+        self._finished(event, "failure")
+
+command_metrics = CommandMetrics()
+
+# id(route) -> label; one entry per route object, so the label set can't grow with traffic
+_route_labels: Dict[int, str] = {}
+
+def _include_prefix(path: str, route) -> str:
+    # The part of the request path in front of what the route's own pattern matched:
+    # the static prefix the route's router was included under ("/api/v1")
+    for index, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[index:]):
+            return path[:index]
+    return ""
+
+def route_template(scope) -> str:
+    """
+    The path template that served this request ("/api/v1/movies/{movie_id}"),
+    so ids don't explode label cardinality. Only known once routing has run.
+    """
+    # scope["route"] (Starlette) only carries the router-local path ("/movies/{movie_id}")
+    # for routes of included routers, so the include prefix is recovered from the request
+    # path once per route and cached. Requests no route matched are all "unmatched".
+    route = scope.get("route")
+    if getattr(route, "path", None) is None or not hasattr(route, "path_regex"):
+        return "unmatched"
+    label = _route_labels.get(id(route))
+    if label is None:
+        label = _route_labels[id(route)] = _include_prefix(scope["path"], route) + route.path
+    return label
+
+class MetricsMiddleware:
+    """
+    Records per-route, per-status latency, in-flight requests, and the
+    MongoDB commands each request triggers. The DB totals are also returned
+    in a Server-Timing header so N+1 query patterns show up in the browser.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestDBStats(scope)
+        token = current_db_stats.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = f'db;dur={stats.seconds * 1000:.1f};desc="{stats.commands} commands"'
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        http_requests_in_flight.inc(method)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            http_requests_in_flight.dec(method)
+            route = route_template(scope)
+            http_request_duration.observe(time.perf_counter() - started, method, route, str(status))
+            db_commands_per_request.observe(stats.commands, method, route)
+            db_time_per_request.observe(stats.seconds, method, route)
+            current_db_stats.reset(token)
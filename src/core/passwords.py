@@ -0,0 +1,81 @@
+import asyncio
+import hmac
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+import bcrypt
+from core.config import settings
+
+T = TypeVar("T")
+
+# bcrypt releases the GIL, so a small thread pool gives real parallelism while
+# capping how many CPU-bound hashes run at once; the event loop only awaits them
+_executor: Optional[ThreadPoolExecutor] = None
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.PASSWORD_HASH_WORKERS), thread_name_prefix="password-hash"
+        )
+    return _executor
+
+async def _run(fn: Callable[..., T], *args) -> T:
+    return await asyncio.get_running_loop().run_in_executor(_pool(), fn, *args)
+
+def _secret(password: str) -> bytes:
+    # bcrypt only uses the first 72 bytes; bcrypt>=5 raises instead of truncating
+    return password.encode("utf-8")[:72]
+
+def is_bcrypt_hash(stored: str) -> bool:
+    return stored.startswith(("$2a$", "$2b$", "$2y$"))
+
+def hash_rounds(stored: str) -> int:
+    """Cost factor of a bcrypt hash ("$2b$12$..." -> 12)"""
+    return int(stored.split("$")[2])
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(_secret(password), bcrypt.gensalt(rounds=rounds)).decode()
+
+def _check(password: str, stored: str) -> bool:
+    try:
+        return bcrypt.checkpw(_secret(password), stored.encode())
+    except ValueError:
+        return False
+
+# Verified against when the user does not exist, so a miss costs as much as a wrong
+# password. Built at the configured cost on first use (one hash, off the import path).
+_dummy_hashes: Dict[int, str] = {}
+
+def dummy_hash() -> str:
+    rounds = settings.PASSWORD_BCRYPT_ROUNDS
+    if rounds not in _dummy_hashes:
+        _dummy_hashes[rounds] = _hash("cinecheck-dummy-password", rounds)
+    return _dummy_hashes[rounds]
+
+def _check_missing_user(password: str) -> bool:
+    _check(password, dummy_hash())
+    return False
+
+async def hash_password(password: str) -> str:
+    return await _run(_hash, password, settings.PASSWORD_BCRYPT_ROUNDS)
+
+async def verify_password(password: str, stored: Optional[str]) -> Tuple[bool, bool]:
+    """
+    Check a password against a stored value. Returns (matches, needs_rehash).
+    Legacy plaintext values and bcrypt hashes below the configured cost still
+    verify, but report needs_rehash so the caller can upgrade them.
+    """
+    if stored is None:
+        await _run(_check_missing_user, password)
+        return False, False
+    if not is_bcrypt_hash(stored):
+        matches = hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+        return matches, matches
+    matches = await _run(_check, password, stored)
+    return matches, matches and hash_rounds(stored) < settings.PASSWORD_BCRYPT_ROUNDS
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
@@ -0,0 +1,214 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import orjson
+from pymongo import monitoring
+from core.config import settings
+from core.metrics import current_db_stats, route_template
+
+logger = logging.getLogger(__name__)
+
+# Handshakes, heartbeats and session bookkeeping are not queries
+IGNORED_COMMANDS = {
+    "hello", "ismaster", "isMaster", "ping", "buildInfo", "saslStart", "saslContinue",
+    "endSessions", "killCursors", "explain", "listIndexes", "createIndexes",
+}
+# Keys whose values define the shape as they are (sort direction, projected fields)
+VERBATIM_KEYS = {"sort", "projection", "$sort", "$project", "hint"}
+# Commands explain() can be asked about, and the parts of them that matter to the plan
+SHAPE_FIELDS = {
+    "find": ("filter", "sort", "projection"),
+    "aggregate": ("pipeline",),
+    "count": ("query",),
+    "distinct": ("key", "query"),
+    "findAndModify": ("query", "sort", "update"),
+}
+
+def normalize(value: Any, verbatim: bool = False) -> Any:
+    """Replace literals with "?" so queries that differ only in values share a shape"""
+    if isinstance(value, dict):
+        return {key: normalize(item, verbatim or key in VERBATIM_KEYS) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if all(not isinstance(item, (dict, list, tuple)) for item in value):
+            return value if verbatim else "?"
+        return [normalize(item, verbatim) for item in value]
+    if verbatim or value is None:
+        return value
+    return "?"
+
+def command_shape(command_name: str, command: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """(collection, normalized shape) of a command as seen by a CommandListener"""
+    collection = command.get(command_name)
+    if not isinstance(collection, str):
+        collection = command.get("collection", "")
+    if command_name in SHAPE_FIELDS:
+        shape = {
+            field: normalize(command[field], field in VERBATIM_KEYS)
+            for field in SHAPE_FIELDS[command_name] if field in command
+        }
+    elif command_name == "update":
+        first = (command.get("updates") or [{}])[0]
+        shape = {"q": normalize(first.get("q")), "u": normalize(first.get("u"))}
+    elif command_name == "delete":
+        shape = {"q": normalize((command.get("deletes") or [{}])[0].get("q"))}
+    else:
+        shape = {}
+    return collection, shape
+
+def documents_returned(command_name: str, reply: Dict[str, Any]) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") is not None else 0
+    if command_name in ("count", "update", "delete", "insert"):
+        return int(reply.get("n", 0))
+    return 0
+
+class ShapeStats:
+    __slots__ = ("key", "database", "collection", "command", "shape", "sample", "count",
+                 "total_ms", "max_ms", "docs", "slow", "last_route")
+
+    def __init__(self, key, database, collection, command, shape):
+        self.key = key
+        self.database = database
+        self.collection = collection
+        self.command = command
+        self.shape = shape
+        # Latest concrete command, kept so admins can explain() it
+        self.sample = None
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.docs = 0
+        self.slow = 0
+        self.last_route = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "collection": self.collection,
+            "command": self.command,
+            "shape": self.shape,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "docs_returned": self.docs,
+            "slow": self.slow,
+            "last_route": self.last_route,
+        }
+
+class QueryProfiler(monitoring.CommandListener):
+    """
+    Aggregates MongoDB commands by query shape (literals stripped): count,
+    total/max duration and documents returned. Commands slower than
+    `slow_ms` are logged with the route that issued them. getMore batches
+    are attributed to the find/aggregate that opened the cursor.
+    """
+    def __init__(self, slow_ms: float, max_shapes: int = 500, max_pending: int = 10_000):
+        self.slow_ms = slow_ms
+        self.max_shapes = max_shapes
+        self.max_pending = max_pending
+        self.since = time.time()
+        self._shapes: Dict[str, ShapeStats] = {}
+        # (connection, request id) -> (shape key, command, cursor id), between started and succeeded/failed
+        self._pending: "OrderedDict[Tuple[Any, int], Tuple[str, str, Optional[int]]]" = OrderedDict()
+        # open cursor id -> shape key, so getMore counts towards the original query
+        self._cursors: "OrderedDict[int, str]" = OrderedDict()
+        # listener callbacks run on Motor's executor threads
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        command_name = event.command_name
+        if command_name in IGNORED_COMMANDS:
+            return
+        command = event.command
+        cursor_id = None
+        with self._lock:
+            if command_name == "getMore":
+                cursor_id = command.get("getMore")
+                key = self._cursors.get(cursor_id)
+                if key is None:
+                    return
+            else:
+                collection, shape = command_shape(command_name, command)
+                key = f"{collection}.{command_name} " + orjson.dumps(shape, option=orjson.OPT_SORT_KEYS, default=str).decode()
+                stats = self._shapes.get(key)
+                if stats is None:
+                    if len(self._shapes) >= self.max_shapes:
+                        # Make room by forgetting the cheapest shape seen so far
+                        del self._shapes[min(self._shapes.values(), key=lambda s: s.total_ms).key]
+                    stats = self._shapes[key] = ShapeStats(key, event.database_name, collection, command_name, shape)
+                if command_name in SHAPE_FIELDS:
+                    keep = (command_name, "cursor") + SHAPE_FIELDS[command_name]
+                    stats.sample = {name: value for name, value in command.items() if name in keep}
+            self._pending[(event.connection_id, event.request_id)] = (key, command_name, cursor_id)
+            while len(self._pending) > self.max_pending:
+                self._pending.popitem(last=False)
+
+    def _finished(self, event, reply: Optional[Dict[str, Any]]):
+        duration_ms = event.duration_micros / 1000
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+            if pending is None:
+                return
+            key, command_name, cursor_id = pending
+            stats = self._shapes.get(key)
+            if stats is None:
+                return
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            if reply is not None:
+                stats.docs += documents_returned(command_name, reply)
+                cursor = reply.get("cursor")
+                if isinstance(cursor, dict) and cursor.get("id"):
+                    self._cursors[cursor["id"]] = key
+                    while len(self._cursors) > self.max_pending:
+                        self._cursors.popitem(last=False)
+                elif cursor_id is not None:
+                    # exhausted
+                    self._cursors.pop(cursor_id, None)
+            request = current_db_stats.get()
+            route = route_template(request.scope) if request is not None and request.scope is not None else None
+            stats.last_route = route or stats.last_route
+            slow = duration_ms >= self.slow_ms
+            if slow:
+                stats.slow += 1
+        if slow:
+            logger.warning(
+                "Slow query (%.1f ms) on %s: %s", duration_ms, route or "background task", key,
+                extra={"duration_ms": duration_ms, "route": route, "shape": key},
+            )
+
+    def succeeded(self, event):
+        self._finished(event, event.reply)
+
+    def failed(self, event):
+        self._finished(event, None)
+
+    def top(self, sort: str = "total_ms", limit: int = 20) -> List[ShapeStats]:
+        with self._lock:
+            shapes = list(self._shapes.values())
+        return sorted(shapes, key=lambda s: getattr(s, sort), reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+            self._pending.clear()
+            self._cursors.clear()
+            self.since = time.time()
+
+async def explain(stats: ShapeStats, client) -> Optional[Dict[str, Any]]:
+    """queryPlanner output for the shape's latest sample, or None if it cannot be explained"""
+    if stats.sample is None:
+        return None
+    result = await client[stats.database].command(
+        {"explain": stats.sample, "verbosity": "queryPlanner"}
+    )
+    planner = result.get("queryPlanner", {})
+    return {"winningPlan": planner.get("winningPlan"), "namespace": planner.get("namespace")}
+
+query_profiler = QueryProfiler(settings.SLOW_QUERY_MS, settings.QUERY_PROFILER_MAX_SHAPES)
@@ -0,0 +1,242 @@
+import asyncio
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+import orjson
+from core.config import settings
+
+class RateRule(NamedTuple):
+    """`burst` requests at once, refilled at `rate` requests per second, per client"""
+    name: str
+    method: Optional[str]  # None matches any method
+    pattern: "re.Pattern[str]"
+    rate: float
+    burst: int
+
+# First match wins; "default" is the overall per-client budget for everything else
+DEFAULT_RULES: List[RateRule] = [
+    RateRule("login", "POST", re.compile(r"^/api/v1/auth/(login|signup)$"), rate=10 / 60, burst=5),
+    RateRule("review_write", "POST", re.compile(r"^/api/v1/reviews/?$"), rate=30 / 60, burst=10),
+    RateRule("movie_list", "GET", re.compile(r"^/api/v1/movies/?$"), rate=20, burst=40),
+    RateRule("default", None, re.compile(r"^/"), rate=50, burst=100),
+]
+
+# Probes and metric scrapes must keep answering while the app is shedding load
+EXEMPT_PATHS = re.compile(r"^/(health/|metrics$)")
+
+class BucketBackend:
+    """Storage for per-(rule, client) budgets"""
+    async def take(self, key: str, rate: float, burst: int) -> Tuple[bool, float]:
+        """Consume one request from the budget; returns (allowed, seconds until retry)"""
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        pass
+
+class MemoryBucketBackend(BucketBackend):
+    """
+    Token buckets in a bounded LRU. Per process, so with N workers a client
+    effectively gets N times the budget; use the Redis backend to share it.
+    """
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: int) -> Tuple[bool, float]:
+        now = self._clock()
+        tokens, updated = self._buckets.get(key, (float(burst), now))
+        tokens = min(float(burst), tokens + (now - updated) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+    def reset(self) -> None:
+        self._buckets.clear()
+
+class RedisBucketBackend(BucketBackend):
+    """
+    Shared budgets for multi-worker deployments, using only INCR and EXPIRE so
+    it works with any Redis-protocol server. Each bucket is approximated by a
+    fixed window of burst / rate seconds allowing `burst` requests, which is
+    the same long-run rate with slightly burstier window edges.
+    """
+    def __init__(self, client, prefix: str = "cinecheck:ratelimit:", clock: Callable[[], float] = time.time):
+        self.client = client
+        self.prefix = prefix
+        self._clock = clock
+
+    async def take(self, key: str, rate: float, burst: int) -> Tuple[bool, float]:
+        window = burst / rate
+        now = self._clock()
+        window_start = math.floor(now / window) * window
+        redis_key = f"{self.prefix}{key}:{int(window_start)}"
+        count = await self.client.incr(redis_key)
+        if count == 1:
+            await self.client.expire(redis_key, max(1, math.ceil(window)))
+        if count <= burst:
+            return True, 0.0
+        return False, window_start + window - now
+
+def build_bucket_backend() -> BucketBackend:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        # Optional dependency, only needed when the Redis backend is configured
+        import redis.asyncio as redis
+
+        return RedisBucketBackend(redis.from_url(settings.REDIS_URL))
+    return MemoryBucketBackend()
+
+class RateLimiter:
+    def __init__(self, backend: BucketBackend, rules: List[RateRule] = DEFAULT_RULES):
+        self.backend = backend
+        self.rules = rules
+        self.rejected: Dict[str, int] = {}
+
+    def match(self, method: str, path: str) -> Optional[RateRule]:
+        for rule in self.rules:
+            if (rule.method is None or rule.method == method) and rule.pattern.match(path):
+                return rule
+        return None
+
+    async def check(self, method: str, path: str, client: str) -> Tuple[bool, float]:
+        rule = self.match(method, path)
+        if rule is None:
+            return True, 0.0
+        allowed, retry_after = await self.backend.take(f"{rule.name}:{client}", rule.rate, rule.burst)
+        if not allowed:
+            self.rejected[rule.name] = self.rejected.get(rule.name, 0) + 1
+        return allowed, retry_after
+
+    def reset(self) -> None:
+        self.backend.reset()
+        self.rejected.clear()
+
+class LoadShedder:
+    """
+    Caps requests in flight at `max_concurrent`. Up to `max_queue` more wait
+    (at most `queue_timeout` seconds) for a slot; anything beyond that is turned
+    away immediately instead of piling onto the database pool.
+    """
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.active = 0
+        self.queued = 0
+        self.max_queued_seen = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+
+    async def acquire(self) -> bool:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            self.active += 1
+            return True
+        if self.queued >= self.max_queue:
+            self.shed_queue_full += 1
+            return False
+        self.queued += 1
+        self.max_queued_seen = max(self.max_queued_seen, self.queued)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.shed_timeout += 1
+            return False
+        finally:
+            self.queued -= 1
+        self.active += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+    def reset(self) -> None:
+        self._semaphore = None
+        self.active = self.queued = self.max_queued_seen = 0
+        self.shed_queue_full = self.shed_timeout = 0
+
+rate_limiter = RateLimiter(build_bucket_backend())
+load_shedder = LoadShedder(
+    settings.MAX_CONCURRENT_REQUESTS, settings.MAX_QUEUED_REQUESTS, settings.QUEUE_TIMEOUT_SECONDS
+)
+
+def stats() -> Dict[str, Any]:
+    return {
+        "rate_limited": dict(rate_limiter.rejected),
+        "in_flight": load_shedder.active,
+        "queue_depth": load_shedder.queued,
+        "max_queue_depth_seen": load_shedder.max_queued_seen,
+        "max_concurrent": load_shedder.max_concurrent,
+        "max_queue": load_shedder.max_queue,
+        "shed_queue_full": load_shedder.shed_queue_full,
+        "shed_queue_timeout": load_shedder.shed_timeout,
+    }
+
+def client_id(scope, trusted_hops: Optional[int] = None) -> str:
+    """
+    Rate-limit key of the caller. Each trusted proxy appends the address it
+    received the request from to X-Forwarded-For, so the client is the
+    `trusted_hops`-th hop from the right; hops further left are whatever the
+    client sent and are ignored. Without enough hops, the socket peer is used.
+    """
+    trusted = settings.TRUSTED_PROXY_HOPS if trusted_hops is None else trusted_hops
+    hops: List[str] = []
+    for name, value in scope.get("headers", []):
+        if name == b"x-forwarded-for":
+            hops += [hop.strip() for hop in value.decode("latin-1").split(",") if hop.strip()]
+    if trusted > 0 and len(hops) >= trusted:
+        return hops[-trusted]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+async def _reject(send, status: int, detail: str, retry_after: float) -> None:
+    body = orjson.dumps({"detail": detail})
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+class RateLimitMiddleware:
+    """
+    Per-client/per-route token buckets (429) in front of a global concurrency
+    limit with a bounded queue (503). Both answer with Retry-After.
+    """
+    def __init__(self, app, limiter: Optional[RateLimiter] = None, shedder: Optional[LoadShedder] = None):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+        self.shedder = shedder or load_shedder
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED or EXEMPT_PATHS.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        allowed, retry_after = await self.limiter.check(scope["method"], scope["path"], client_id(scope))
+        if not allowed:
+            await _reject(send, 429, "Too many requests", retry_after)
+            return
+
+        if not await self.shedder.acquire():
+            await _reject(send, 503, "Server busy, try again shortly", 1)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.shedder.release()
@@ -1,24 +1,192 @@
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+import jwt
 from fastapi import HTTPException, Depends
-from fastapi.security import HTTPBearer
-from models.user import User
-
-security = HTTPBearer()
-
-async def admin_required(token: str = Depends(security)):
-    # TEMPORARY: Allow all access for testing
-    # In production, you'll need proper JWT validation
-    user = await User.find_one({"role": "admin"})
-    if not user:
-        # For now, just get any user to test the functionality
-        user = await User.find_one()
-        if not user:
-            raise HTTPException(status_code=403, detail="No users found")
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import BaseModel
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+security = HTTPBearer(auto_error=False)
+
+# The placeholder default in core.config: anyone who has read the source can sign tokens with it
+PLACEHOLDER_JWT_SECRET = "your-secret-key"
+
+class InsecureSecretError(RuntimeError):
+    pass
+
+def signing_key() -> str:
+    """JWT_SECRET, refusing to sign or verify anything with an unset or placeholder secret"""
+    if settings.JWT_SECRET in ("", PLACEHOLDER_JWT_SECRET):
+        raise InsecureSecretError("JWT_SECRET is unset or the placeholder default; set it to a long random value")
+    return settings.JWT_SECRET
+
+class TokenUser(BaseModel):
+    """The caller, as described by the claims of a verified access token"""
+    email: str
+    username: str
+    role: str
+    version: int = 0
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == "admin"
+
+def create_access_token(user: Any) -> str:
+    """Issue a signed access token for a User (sub = email, ver = user.token_version)"""
+    now = datetime.now(timezone.utc)
+    claims = {
+        "sub": user.email,
+        "name": user.username,
+        "role": user.role,
+        "ver": getattr(user, "token_version", 0),
+        "iat": now,
+        "exp": now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    }
+    return jwt.encode(claims, signing_key(), algorithm=settings.JWT_ALGORITHM)
+
+class RevocationList:
+    """
+    Minimum valid token version per user. Bumping a user's token_version (logout)
+    revokes every token issued before it. Tokens carry their version, so the list
+    only decides anything for the few users whose version has moved on.
+
+    Each worker holds its own copy: loaded at startup, then topped up every
+    TOKEN_REVOCATION_REFRESH_SECONDS with the users whose token_revoked_at is
+    recent, so a revocation made through any worker is honoured by all of them
+    within that interval.
+    """
+    # Re-read revocations this far behind the newest one seen, for writers with skewed clocks
+    OVERLAP = timedelta(seconds=60)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._versions: Dict[str, int] = {}
+        self._watermark: Optional[datetime] = None  # newest token_revoked_at seen
+        self._next_refresh = 0.0
+
+    def current(self, email: str) -> int:
+        return self._versions.get(email, 0)
+
+    def set(self, email: str, version: int) -> None:
+        if version > self._versions.get(email, 0):
+            self._versions[email] = version
+
+    def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        return claims.get("ver", 0) < self._versions.get(claims["sub"], 0)
+
+    def _apply(self, doc: Dict[str, Any]) -> None:
+        self.set(doc["email"], doc["token_version"])
+        revoked_at = doc.get("token_revoked_at")
+        if revoked_at is not None and (self._watermark is None or revoked_at > self._watermark):
+            self._watermark = revoked_at
+
+    async def load(self) -> int:
+        """Fill the list from users that have revoked tokens; one query at startup"""
+        from models.user import User
+
+        cursor = User.get_motor_collection().find(
+            {"token_version": {"$gt": 0}}, {"email": 1, "token_version": 1, "token_revoked_at": 1}
+        )
+        async for doc in cursor:
+            self._apply(doc)
+        self._next_refresh = time.monotonic() + settings.TOKEN_REVOCATION_REFRESH_SECONDS
+        return len(self._versions)
+
+    async def refresh(self) -> None:
+        """Pick up revocations made since the newest one seen (by any worker); one indexed query"""
+        from models.user import User
+
+        since = (self._watermark or datetime(1970, 1, 1)) - self.OVERLAP
+        cursor = User.get_motor_collection().find(
+            {"token_revoked_at": {"$gte": since}}, {"email": 1, "token_version": 1, "token_revoked_at": 1}
+        )
+        async for doc in cursor:
+            self._apply(doc)
+
+    async def maybe_refresh(self) -> None:
+        """refresh() at most once per TOKEN_REVOCATION_REFRESH_SECONDS; failures wait for the next interval"""
+        if time.monotonic() < self._next_refresh:
+            return
+        self._next_refresh = time.monotonic() + settings.TOKEN_REVOCATION_REFRESH_SECONDS
+        try:
+            await self.refresh()
+        except Exception:
+            logger.exception("Token revocation refresh error")
+
+class TokenVerifier:
+    """
+    Verifies access tokens without touching the database. Decoded claims of
+    recently seen tokens are kept in a bounded LRU until the token expires, so
+    repeat requests skip the signature check entirely.
+    """
+    def __init__(self, revocations: RevocationList, max_entries: int = 4096):
+        self.revocations = revocations
+        self.max_entries = max_entries
+        self._verified: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Return the token's claims, or raise jwt.InvalidTokenError"""
+        entry = self._verified.get(token)
+        if entry is not None and entry[0] > time.time():
+            self._verified.move_to_end(token)
+            self.hits += 1
+            claims = entry[1]
+        else:
+            self.misses += 1
+            claims = jwt.decode(
+                token,
+                signing_key(),
+                algorithms=[settings.JWT_ALGORITHM],
+                options={"require": ["sub", "exp"]},
+            )
+            self._verified[token] = (float(claims["exp"]), claims)
+            while len(self._verified) > self.max_entries:
+                self._verified.popitem(last=False)
+
+        if self.revocations.is_revoked(claims):
+            self._verified.pop(token, None)
+            raise jwt.InvalidTokenError("Token has been revoked")
+        return claims
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._verified), "hits": self.hits, "misses": self.misses}
+
+revocations = RevocationList()
+token_verifier = TokenVerifier(revocations)
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+) -> TokenUser:
+    """Authenticated caller from the Bearer token; no per-request database access"""
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    await revocations.maybe_refresh()
+    try:
+        claims = token_verifier.verify(credentials.credentials)
+    except jwt.InvalidTokenError as e:
+        raise HTTPException(status_code=401, detail=f"Invalid token: {e}", headers={"WWW-Authenticate": "Bearer"})
+    return TokenUser(
+        email=claims["sub"],
+        username=claims.get("name", claims["sub"]),
+        role=claims.get("role", "user"),
+        version=claims.get("ver", 0),
+    )
+
+async def admin_required(user: TokenUser = Depends(get_current_user)) -> TokenUser:
+    if not user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
     return user
 
-# OR even simpler - remove auth temporarily:
-async def admin_required():
-    # Bypass authentication for testing
-    user = await User.find_one()
-    if not user:
-        raise HTTPException(status_code=403, detail="No users found")
-    return user
\ No newline at end of file
+def require_self_or_admin(user: TokenUser, user_id: str) -> None:
+    """Guard for routes scoped to one user (user_id is the email)"""
+    if user.email != user_id and not user.is_admin:
+        raise HTTPException(status_code=403, detail="Not allowed to access another user's data")
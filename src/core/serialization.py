@@ -0,0 +1,61 @@
+from typing import Any, Dict, Optional, Sequence
+import orjson
+from bson import ObjectId
+from pydantic import BaseModel
+from fastapi.responses import JSONResponse
+
+# Public movie fields, in MovieOut order ("id" is derived from _id)
+MOVIE_FIELDS = (
+    "title", "description", "genres", "release_date", "duration", "poster_url",
+    "trailer_url", "director", "cast", "language", "country", "age_rating",
+    "rating", "submitted_by", "status", "featured", "created_at", "updated_at",
+)
+# Values used when an older document is missing a field (same defaults as models.movie.Movie)
+MOVIE_DEFAULTS: Dict[str, Any] = {"genres": [], "cast": [], "status": "pending", "featured": False}
+
+REVIEW_FIELDS = ("user_id", "username", "rating", "review_text", "created_at", "updated_at")
+REVIEW_PROJECTION = {name: 1 for name in ("movie_id",) + REVIEW_FIELDS}
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def dumps(content: Any) -> bytes:
+    """Serialize straight to JSON bytes (datetimes as ISO 8601, ObjectIds as strings)"""
+    return orjson.dumps(content, default=_default)
+
+class ORJSONResponse(JSONResponse):
+    """Default response class: same JSON as JSONResponse, rendered by orjson"""
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def serialize_movie(doc: Any, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Shape a raw BSON document (or a Movie document) into the MovieOut representation,
+    optionally restricted to `fields`. No Pydantic validation happens on this path.
+    """
+    names = MOVIE_FIELDS if fields is None else fields
+    if isinstance(doc, dict):
+        out = {"id": str(doc["_id"])}
+        for name in names:
+            out[name] = doc.get(name, MOVIE_DEFAULTS.get(name))
+    else:
+        out = {"id": str(doc.id)}
+        for name in names:
+            out[name] = getattr(doc, name, MOVIE_DEFAULTS.get(name))
+    return out
+
+def serialize_review(doc: Any) -> Dict[str, Any]:
+    """Shape a raw BSON document (or a Review document) into the ReviewOut representation"""
+    if isinstance(doc, dict):
+        out = {"id": str(doc["_id"]), "movie_id": str(doc["movie_id"])}
+        for name in REVIEW_FIELDS:
+            out[name] = doc.get(name)
+    else:
+        out = {"id": str(doc.id), "movie_id": str(doc.movie_id)}
+        for name in REVIEW_FIELDS:
+            out[name] = getattr(doc, name)
+    return out
@@ -0,0 +1,182 @@
+"""
+Maintenance commands for CineCheck.
+
+Usage (from the src/ directory):
+    python manage.py rebuild-ratings
+    python manage.py backfill-release-year
+    python manage.py backfill-title-key
+    python manage.py verify-indexes
+    python manage.py find-duplicates
+    python manage.py import-movies movies.ndjson [--status approved]
+    python manage.py set-role someone@example.com admin
+    python manage.py rebuild-leaderboards
+    python manage.py recompute-similar [--kind all|collaborative|content] [--top-k 20]   (pip install -r requirements-recs.txt)
+"""
+import argparse
+import asyncio
+from core.db import close_db, init_db
+from core.log import setup_logging
+
+async def rebuild_ratings(args):
+    from services.rating_service import rebuild_rating_aggregates
+
+    rated = await rebuild_rating_aggregates(batch_size=args.batch_size)
+    print(f"✅ Rebuilt rating aggregates for {rated} movies with reviews")
+
+async def backfill_release_year(args):
+    from models.movie import Movie
+
+    # Server-side: release_year = int(first four characters of release_date)
+    result = await Movie.get_motor_collection().update_many(
+        {"release_year": {"$exists": False}, "release_date": {"$regex": "^[0-9]{4}"}},
+        [{"$set": {"release_year": {"$toInt": {"$substrBytes": ["$release_date", 0, 4]}}}}],
+    )
+    print(f"✅ Set release_year on {result.modified_count} movies")
+
+async def backfill_title_key(args):
+    from services.import_service import backfill_title_keys
+
+    report = await backfill_title_keys(batch_size=args.batch_size)
+    for movie_id in report["conflicts"]:
+        print(f"   {movie_id}: another movie has the same title and release year; merge them by hand")
+    print(f"✅ Set title_key on {report['keyed']} movies ({len(report['conflicts'])} conflicts)")
+
+async def verify_indexes(args):
+    from core.indexes import log_index_report, verify_indexes as run_verifier
+
+    log_index_report(await run_verifier())
+
+async def find_duplicates(args):
+    from core.indexes import find_duplicates as run_finder
+
+    groups = await run_finder(limit=args.limit)
+    for group in groups:
+        ids = ", ".join(str(document_id) for document_id in group["ids"])
+        print(f"   {group['collection']}.{group['index']} {group['key']}: {ids}")
+    if groups:
+        raise SystemExit(f"❌ {len(groups)} duplicate keys; merge or delete the extra documents, then restart to build the indexes")
+    print("✅ No duplicates for any unique index")
+
+async def import_movies(args):
+    import time
+    from services.import_service import import_movies as run_import, parse_records
+
+    with open(args.path, "rb") as f:
+        body = f.read()
+    started = time.perf_counter()
+    report = await run_import(parse_records(body), status=args.status, chunk_size=args.chunk_size)
+    elapsed = max(time.perf_counter() - started, 1e-6)
+    for error in report["errors"]:
+        print(f"   record {error['record']}: {error['error']}")
+    print(
+        f"✅ Imported {report['received']} records in {elapsed:.1f}s "
+        f"({report['received'] / elapsed:,.0f}/s): {report['inserted']} inserted, "
+        f"{report['updated']} updated, {report['duplicates']} duplicates, {report['failed']} failed"
+    )
+
+async def set_role(args):
+    from services.user_service import set_role as run_set_role
+
+    if not await run_set_role(args.email, args.role):
+        raise SystemExit(f"❌ No user with email {args.email}")
+    print(f"✅ {args.email} is now {args.role}; their existing tokens were revoked")
+
+async def rebuild_leaderboards(args):
+    from services.leaderboard_service import rebuild_leaderboards as run_rebuild
+
+    report = await run_rebuild(batch_size=args.batch_size)
+    print(
+        f"✅ Rebuilt leaderboards for {report['movies']:,} movies from {report['reviews']:,} reviews "
+        f"(catalog mean {report['prior_mean']})"
+    )
+
+async def recompute_similar(args):
+    from services.recommendation_service import recompute_collaborative, recompute_content
+
+    if args.kind in ("all", "collaborative"):
+        report = await recompute_collaborative(
+            top_k=args.top_k, min_support=args.min_support, like_threshold=args.like_threshold,
+            batch_size=args.batch_size,
+        )
+        print(
+            f"✅ Collaborative neighbours for {report['movies_with_neighbors']:,} of {report['movies']:,} movies from "
+            f"{report['likes']:,} likes by {report['users']:,} users in {report['total_seconds']}s "
+            f"(loading {report['load_seconds']}s)"
+        )
+    if args.kind in ("all", "content"):
+        report = await recompute_content(top_k=args.top_k)
+        print(
+            f"✅ Content neighbours for {report['movies_with_neighbors']:,} of {report['movies']:,} movies "
+            f"in {report['total_seconds']}s (loading {report['load_seconds']}s)"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="CineCheck maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rebuild-ratings", help="Rebuild movie rating aggregates from the reviews collection")
+    rebuild.add_argument("--batch-size", type=int, default=1000)
+    rebuild.set_defaults(handler=rebuild_ratings)
+
+    backfill = commands.add_parser("backfill-release-year", help="Derive release_year for movies stored before it existed")
+    backfill.set_defaults(handler=backfill_release_year)
+
+    title_key = commands.add_parser(
+        "backfill-title-key", help="Derive the import natural key for movies stored before it existed"
+    )
+    title_key.add_argument("--batch-size", type=int, default=1000)
+    title_key.set_defaults(handler=backfill_title_key)
+
+    verify = commands.add_parser("verify-indexes", help="Report missing/unused indexes and collection scans")
+    verify.set_defaults(handler=verify_indexes)
+
+    duplicates = commands.add_parser(
+        "find-duplicates", help="List documents that keep a unique index from being built (run before deploying)"
+    )
+    duplicates.add_argument("--limit", type=int, default=100, help="duplicate keys to show per index")
+    duplicates.set_defaults(handler=find_duplicates)
+
+    importer = commands.add_parser("import-movies", help="Bulk upsert movies from an NDJSON file or JSON array")
+    importer.add_argument("path")
+    importer.add_argument("--status", choices=["pending", "approved"], default="pending")
+    importer.add_argument("--chunk-size", type=int, default=1000)
+    importer.set_defaults(handler=import_movies)
+
+    role = commands.add_parser("set-role", help="Promote a user to admin (or demote back to user)")
+    role.add_argument("email")
+    role.add_argument("role", choices=["user", "admin"])
+    role.set_defaults(handler=set_role)
+
+    leaderboards = commands.add_parser(
+        "rebuild-leaderboards", help="Recompute top-rated and trending leaderboards from movies and reviews"
+    )
+    leaderboards.add_argument("--batch-size", type=int, default=1000)
+    leaderboards.set_defaults(handler=rebuild_leaderboards)
+
+    similar = commands.add_parser(
+        "recompute-similar", help="Rebuild similar-movie lists from reviews (collaborative) and metadata (content)"
+    )
+    similar.add_argument("--kind", choices=["all", "collaborative", "content"], default="all")
+    similar.add_argument("--top-k", type=int, default=20)
+    similar.add_argument("--min-support", type=int, default=2, help="minimum users who liked both movies")
+    similar.add_argument("--like-threshold", type=int, default=4, help="lowest rating that counts as a like")
+    similar.add_argument("--batch-size", type=int, default=10_000)
+    similar.set_defaults(handler=recompute_similar)
+
+    args = parser.parse_args()
+
+    # Plain lines on the terminal instead of JSON
+    setup_logging(fmt="text")
+
+    async def run():
+        # Maintenance always runs against a fully indexed database
+        await init_db(setup_indexes=True)
+        try:
+            await args.handler(args)
+        finally:
+            await close_db()
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
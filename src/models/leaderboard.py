@@ -0,0 +1,35 @@
+from beanie import Document, PydanticObjectId
+from typing import Optional
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from datetime import datetime
+
+# `genre` of the entries that make up the all-genres boards
+ALL_GENRES = ""
+
+class LeaderboardEntry(Document):
+    """
+    One approved movie on the boards of one genre (and one more entry with
+    genre ALL_GENRES). Every entry of a movie carries the same scores, so a
+    review write refreshes them all with one update_many.
+    """
+    movie_id: PydanticObjectId
+    genre: str
+    top_score: float  # Bayesian-weighted average rating
+    trending_score: float  # log of the scaled, decaying review activity (-inf for none); see services.leaderboard_service
+    rating: Optional[float] = None
+    rating_count: int = 0
+    title: str
+    poster_url: Optional[str] = None
+    release_year: Optional[int] = None
+    updated_at: datetime = datetime.utcnow()
+
+    class Settings:
+        name = "leaderboard_entries"
+        # Top-N of a board is the first N keys of one of these; movie_id breaks ties
+        indexes = [
+            IndexModel([("genre", ASCENDING), ("top_score", DESCENDING), ("movie_id", ASCENDING)], name="genre_top_score"),
+            IndexModel(
+                [("genre", ASCENDING), ("trending_score", DESCENDING), ("movie_id", ASCENDING)], name="genre_trending_score"
+            ),
+            IndexModel([("movie_id", ASCENDING), ("genre", ASCENDING)], name="movie_genre_unique", unique=True),
+        ]
@@ -1,17 +1,33 @@
+import re
 from beanie import Document
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import Dict, List, Optional
+from pydantic import BaseModel, model_validator
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from datetime import datetime
 
 class CastMember(BaseModel):
     name: str
     role: str
 
+def release_year_of(release_date: Optional[str]) -> Optional[int]:
+    """Year part of a "YYYY-MM-DD" release date, or None"""
+    if release_date and release_date[:4].isdigit():
+        return int(release_date[:4])
+    return None
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+def title_key_of(title: str) -> str:
+    """Title with case, punctuation and repeated whitespace folded away ("The  Matrix!" -> "the matrix")"""
+    return " ".join(_NON_WORD.sub(" ", title.casefold()).split())
+
 class Movie(Document):
     title: str
+    title_key: Optional[str] = None  # derived from title; (title_key, release_year) identifies a movie on import
     description: str
     genres: List[str] = []
     release_date: Optional[str] = None
+    release_year: Optional[int] = None  # derived from release_date, indexed for the year filter
     duration: Optional[int] = None
     poster_url: Optional[str] = None
     trailer_url: Optional[str] = None
@@ -20,12 +36,47 @@ class Movie(Document):
     language: Optional[str] = None
     country: Optional[str] = None
     age_rating: Optional[str] = None
-    rating: Optional[float] = None
+    rating: Optional[float] = None  # derived from rating_sum / rating_count
+    rating_sum: int = 0
+    rating_count: int = 0
+    rating_histogram: Dict[str, int] = {}  # "1".."5" -> number of reviews
+    ratings_rebuilt_at: Optional[datetime] = None  # stamp of the last `manage.py rebuild-ratings`
     submitted_by: Optional[str] = None
     status: str = "pending"
     featured: bool = False
+    # "field:value" keys of the content feature vector, set when the movie enters the catalog
+    content_tokens: List[str] = []
     created_at: datetime = datetime.utcnow()
     updated_at: datetime = datetime.utcnow()
 
+    @model_validator(mode="after")
+    def derive_natural_key(self):
+        self.title_key = title_key_of(self.title)
+        self.release_year = release_year_of(self.release_date)
+        return self
+
     class Settings:
-        name = "movies"
\ No newline at end of file
+        name = "movies"
+        # One index per /movies query shape; `status` always comes first
+        indexes = [
+            IndexModel([("status", ASCENDING), ("featured", ASCENDING), ("rating", DESCENDING)], name="status_featured_rating"),
+            IndexModel([("status", ASCENDING), ("created_at", DESCENDING)], name="status_created_at"),
+            IndexModel([("status", ASCENDING), ("rating", DESCENDING)], name="status_rating"),
+            IndexModel([("status", ASCENDING), ("release_year", ASCENDING), ("created_at", DESCENDING)], name="status_release_year"),
+            # Natural key for imports, unique among live (pending/approved) movies: a rejected
+            # submission never blocks a new one. Movies stored before title_key existed are left
+            # out until backfilled. ($in in a partial filter needs MongoDB 6.0+)
+            IndexModel(
+                [("title_key", ASCENDING), ("release_year", ASCENDING)],
+                name="title_key_release_year_unique",
+                unique=True,
+                partialFilterExpression={"title_key": {"$type": "string"}, "status": {"$in": ["pending", "approved"]}},
+            ),
+            # candidates for a newly approved movie's "more like this" list: movies sharing a feature
+            IndexModel([("status", ASCENDING), ("content_tokens", ASCENDING)], name="status_content_tokens"),
+            IndexModel(
+                [("status", ASCENDING), ("title", ASCENDING)],
+                name="status_title",
+                collation={"locale": "en", "strength": 2},
+            ),
+        ]
\ No newline at end of file
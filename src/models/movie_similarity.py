@@ -0,0 +1,30 @@
+from beanie import Document, PydanticObjectId
+from typing import List, Optional
+from pydantic import BaseModel
+from pymongo import ASCENDING, IndexModel
+from datetime import datetime
+
+class SimilarMovie(BaseModel):
+    """A neighbour, with enough of the movie card to render it without another read"""
+    movie_id: PydanticObjectId
+    score: float
+    title: str
+    poster_url: Optional[str] = None
+    release_year: Optional[int] = None
+
+class MovieSimilarity(Document):
+    """Precomputed nearest neighbours of one movie, best first"""
+    movie_id: PydanticObjectId
+    kind: str  # "collaborative" (from reviews) or "content" (from metadata)
+    neighbors: List[SimilarMovie] = []
+    computed_at: datetime = datetime.utcnow()
+
+    class Settings:
+        name = "movie_similarities"
+        indexes = [
+            # GET /movies/{id}/similar is a single lookup on this index
+            IndexModel([("movie_id", ASCENDING), ("kind", ASCENDING)], name="movie_kind_unique", unique=True),
+            IndexModel([("kind", ASCENDING), ("computed_at", ASCENDING)], name="kind_computed_at"),
+            # pulling a movie out of every list when it leaves the catalog
+            IndexModel([("neighbors.movie_id", ASCENDING)], name="neighbors_movie_id"),
+        ]
@@ -3,6 +3,7 @@ from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 from beanie import PydanticObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class Review(Document):
     movie_id: PydanticObjectId
@@ -15,5 +16,10 @@ class Review(Document):
     
     class Settings:
         name = "reviews"
-        indexes = ["movie_id", "user_id"]
+        indexes = [
+            # one review per user per movie
+            IndexModel([("movie_id", ASCENDING), ("user_id", ASCENDING)], name="movie_user_unique", unique=True),
+            IndexModel([("movie_id", ASCENDING), ("created_at", DESCENDING)], name="movie_created_at"),
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created_at"),
+        ]
 
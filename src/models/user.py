@@ -3,6 +3,7 @@ from pydantic import EmailStr
 from typing import Literal, Optional, List
 from datetime import datetime
 from beanie import PydanticObjectId
+from pymongo import ASCENDING, IndexModel
 
 class User(Document):
     username: str
@@ -13,6 +14,12 @@ class User(Document):
     profile_picture: Optional[str] = None
     bio: Optional[str] = None
     watchlist: List[PydanticObjectId] = []  # List of movie IDs
+    token_version: int = 0  # bumped on logout; tokens carrying an older version are rejected
+    token_revoked_at: Optional[datetime] = None  # when token_version last moved; workers poll for recent ones
 
     class Settings:
-        name = "users"
\ No newline at end of file
+        name = "users"
+        indexes = [
+            IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+            IndexModel([("token_revoked_at", ASCENDING)], name="token_revoked_at", sparse=True),
+        ]
\ No newline at end of file
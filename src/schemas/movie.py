@@ -6,6 +6,21 @@ class CastMember(BaseModel):
     name: str
     role: str
 
+class CreateMovieRequest(BaseModel):
+    title: str
+    description: str
+    genres: List[str]
+    release_date: Optional[str] = None
+    duration: Optional[int] = None
+    poster_url: Optional[str] = None
+    trailer_url: Optional[str] = None
+    director: Optional[str] = None
+    cast: List[dict] = []
+    language: Optional[str] = None
+    country: Optional[str] = None
+    age_rating: Optional[str] = None
+    submitted_by: Optional[str] = None
+
 class MovieOut(BaseModel):
     id: str
     title: str
@@ -0,0 +1,80 @@
+import csv
+import io
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Sequence
+import orjson
+from core.serialization import MOVIE_FIELDS, REVIEW_FIELDS, dumps, serialize_movie, serialize_review
+
+EXPORT_FORMATS = ("ndjson", "csv")
+REVIEW_EXPORT_FIELDS = ("movie_id",) + REVIEW_FIELDS
+
+def _csv_value(value: Any) -> Any:
+    # lists of scalars (genres) stay readable; anything nested (cast) is embedded as JSON
+    if isinstance(value, list):
+        if all(isinstance(item, (str, int, float)) for item in value):
+            return "|".join(str(item) for item in value)
+        return orjson.dumps(value).decode()
+    if isinstance(value, dict):
+        return orjson.dumps(value).decode()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+async def stream_documents(
+    cursor,
+    columns: Sequence[str],
+    serialize: Callable[[Dict[str, Any]], Dict[str, Any]],
+    export_format: str = "ndjson",
+    batch_size: int = 500,
+) -> AsyncIterator[bytes]:
+    """
+    Encode a Motor cursor as NDJSON or CSV, yielding one chunk per `batch_size` documents.
+    Only the current batch is ever held in memory, whatever the collection size.
+    """
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=["id", *columns], extrasaction="ignore")
+        writer.writeheader()
+        rows = 0
+        async for doc in cursor:
+            writer.writerow({key: _csv_value(value) for key, value in serialize(doc).items()})
+            rows += 1
+            if rows >= batch_size:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+                rows = 0
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+        return
+
+    lines = []
+    async for doc in cursor:
+        lines.append(dumps(serialize(doc)))
+        if len(lines) >= batch_size:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+def export_movies(
+    collection,
+    query: Dict[str, Any],
+    fields: Optional[Sequence[str]] = None,
+    export_format: str = "ndjson",
+    batch_size: int = 500,
+) -> AsyncIterator[bytes]:
+    columns = MOVIE_FIELDS if fields is None else fields
+    cursor = collection.find(query, {name: 1 for name in columns}, batch_size=batch_size).sort("_id", 1)
+    return stream_documents(
+        cursor, columns, lambda doc: serialize_movie(doc, columns), export_format, batch_size
+    )
+
+def export_reviews(
+    collection,
+    query: Dict[str, Any],
+    export_format: str = "ndjson",
+    batch_size: int = 500,
+) -> AsyncIterator[bytes]:
+    projection = {name: 1 for name in REVIEW_EXPORT_FIELDS}
+    cursor = collection.find(query, projection, batch_size=batch_size).sort("_id", 1)
+    return stream_documents(cursor, REVIEW_EXPORT_FIELDS, serialize_review, export_format, batch_size)
@@ -0,0 +1,200 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+import orjson
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from core.cache import response_cache
+from models.movie import CastMember, Movie, release_year_of, title_key_of
+from schemas.movie import CreateMovieRequest
+from services.moderation_service import update_catalog_views
+from services.rating_service import empty_histogram
+
+logger = logging.getLogger(__name__)
+
+# Errors reported back to the caller are capped so one bad file can't produce a huge response
+MAX_REPORTED_ERRORS = 1000
+
+# Rejected movies are not part of the natural key: importing their title creates a new submission
+LIVE = {"$in": ["pending", "approved"]}
+
+# Set after the first backfill pass in this process; new movies are always keyed on write, and
+# conflicts it leaves behind are logged once (`manage.py backfill-title-key` retries them)
+_keys_backfilled = False
+
+async def backfill_title_keys(batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Set title_key (and release_year) on movies stored before they existed, so imports
+    update them instead of inserting a copy. A live movie whose key another live movie
+    already holds is left unkeyed and its id reported under "conflicts", to be merged by hand.
+    """
+    global _keys_backfilled
+    collection = Movie.get_motor_collection()
+    report: Dict[str, Any] = {"keyed": 0, "conflicts": []}
+
+    async def flush(ids: List[Any], operations: List[UpdateOne]) -> None:
+        try:
+            result = await collection.bulk_write(operations, ordered=False)
+            report["keyed"] += result.modified_count
+        except BulkWriteError as e:
+            report["keyed"] += e.details.get("nModified", 0)
+            report["conflicts"].extend(ids[write_error["index"]] for write_error in e.details.get("writeErrors", []))
+
+    ids: List[Any] = []
+    operations: List[UpdateOne] = []
+    async for doc in collection.find({"title_key": None}, {"title": 1, "release_date": 1}):
+        ids.append(doc["_id"])
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {
+            "title_key": title_key_of(doc.get("title") or ""),
+            "release_year": release_year_of(doc.get("release_date")),
+        }}))
+        if len(operations) >= batch_size:
+            await flush(ids, operations)
+            ids, operations = [], []
+    if operations:
+        await flush(ids, operations)
+
+    _keys_backfilled = True
+    return report
+
+def parse_records(body: bytes) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (record number, decoded JSON) from a JSON array or NDJSON payload.
+    Lines that are not valid JSON are yielded as the JSONDecodeError itself,
+    so they can be reported per record instead of failing the whole import.
+    """
+    stripped = body.lstrip()
+    if stripped.startswith(b"["):
+        try:
+            records = orjson.loads(stripped)
+        except orjson.JSONDecodeError as e:
+            yield 0, e
+            return
+        yield from enumerate(records)
+        return
+
+    number = 0
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            yield number, orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield number, e
+        number += 1
+
+def _upsert(data: CreateMovieRequest, status: str, now: datetime) -> Tuple[Tuple[str, Any], UpdateOne]:
+    fields = data.model_dump()
+    fields["cast"] = [CastMember.model_validate(member).model_dump() for member in data.cast]
+    fields["title_key"] = title_key_of(data.title)
+    fields["release_year"] = release_year_of(data.release_date)
+    fields["updated_at"] = now
+    key = (fields["title_key"], fields["release_year"])
+    operation = UpdateOne(
+        {"title_key": key[0], "release_year": key[1], "status": LIVE},
+        {
+            "$set": fields,
+            # Moderation state and rating aggregates belong to the existing document
+            "$setOnInsert": {
+                "status": status,
+                "featured": False,
+                "rating": None,
+                "rating_sum": 0,
+                "rating_count": 0,
+                "rating_histogram": empty_histogram(),
+                "created_at": now,
+            },
+        },
+        upsert=True,
+    )
+    return key, operation
+
+async def import_movies(
+    records: Iterable[Tuple[int, Any]],
+    status: str = "pending",
+    chunk_size: int = 1000,
+) -> Dict[str, Any]:
+    """
+    Validate and upsert movies in chunks, keyed on (normalized title, release year).
+    Each chunk is one unordered bulk_write, so a bad record never blocks the rest.
+    Approved movies that were inserted or changed go through the same leaderboard
+    and similar-movie upkeep as moderation. Returns counts plus a list of
+    {"record", "error"} entries for rejected records.
+    """
+    if not _keys_backfilled:
+        # Unkeyed movies would never match an upsert filter and get imported a second time
+        backfill = await backfill_title_keys()
+        if backfill["conflicts"]:
+            logger.warning(
+                "%d movies share a title and year with another movie and cannot be matched on import",
+                len(backfill["conflicts"]), extra={"movie_ids": [str(i) for i in backfill["conflicts"][:20]]},
+            )
+    collection = Movie.get_motor_collection()
+    report: Dict[str, Any] = {"received": 0, "inserted": 0, "updated": 0, "duplicates": 0, "failed": 0,
+                              "errors": []}
+    approved: List[Any] = []
+
+    def reject(number: int, error: str) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"record": number, "error": error})
+
+    async def flush(pending: Dict[Tuple[str, Any], Tuple[int, UpdateOne]]) -> None:
+        numbers = [number for number, _ in pending.values()]
+        operations = [operation for _, operation in pending.values()]
+        try:
+            result = await collection.bulk_write(operations, ordered=False)
+            details = result.bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+            for write_error in details.get("writeErrors", []):
+                reject(numbers[write_error["index"]], write_error.get("errmsg", "write failed"))
+        report["inserted"] += details.get("nUpserted", 0)
+        report["updated"] += details.get("nMatched", 0)
+        if status == "approved":
+            approved.extend(upserted["_id"] for upserted in details.get("upserted", []))
+
+        if details.get("nMatched", 0):
+            # Existing movies keep their original created_at, which tells them apart from this chunk's inserts
+            keys = [{"title_key": title_key, "release_year": year} for title_key, year in pending]
+            updated = [
+                doc async for doc in collection.find(
+                    {"$or": keys, "status": LIVE, "created_at": {"$lt": now}}, {"_id": 1, "status": 1}
+                )
+            ]
+            await response_cache.invalidate_movies([doc["_id"] for doc in updated], lists=False)
+            approved.extend(doc["_id"] for doc in updated if doc.get("status") == "approved")
+
+    # Keyed by natural key: a title repeated within a chunk is written once, last record wins
+    pending: Dict[Tuple[str, Any], Tuple[int, UpdateOne]] = {}
+    now = datetime.utcnow()
+    for number, raw in records:
+        report["received"] += 1
+        if isinstance(raw, Exception):
+            reject(number, f"invalid JSON: {raw}")
+            continue
+        try:
+            data = CreateMovieRequest.model_validate(raw)
+            key, operation = _upsert(data, status, now)
+        except ValidationError as e:
+            reject(number, "; ".join(
+                f"{'.'.join(str(part) for part in err['loc']) or 'record'}: {err['msg']}" for err in e.errors()
+            ))
+            continue
+
+        if pending.pop(key, None) is not None:
+            report["duplicates"] += 1
+        pending[key] = (number, operation)
+        if len(pending) >= chunk_size:
+            await flush(pending)
+            pending = {}
+            now = datetime.utcnow()
+
+    if pending:
+        await flush(pending)
+    if report["inserted"] or report["updated"]:
+        await response_cache.bump(response_cache.LISTS)
+    if approved:
+        await update_catalog_views("approve", approved)
+    return report
@@ -0,0 +1,231 @@
+import math
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+from core.config import settings
+from models.leaderboard import ALL_GENRES, LeaderboardEntry
+from models.movie import Movie
+from models.review import Review
+
+# board name -> score field, highest first
+BOARDS = {"top-rated": "top_score", "trending": "trending_score"}
+CARD_FIELDS = ("title", "poster_url", "release_year")
+MOVIE_FIELDS = CARD_FIELDS + ("genres", "status", "rating", "rating_sum", "rating_count")
+
+# Trending is a sum over reviews of (rating / 5) halved every half-life since
+# the review was created (editing a rating swaps its weight, it does not make
+# the review new again). Contributions are scaled by 2 ** (time since this epoch /
+# half-life) instead, which orders movies the same way at every moment: old
+# entries never need rewriting as time passes, and the decayed value is one
+# subtraction at read time. The scale grows without bound, so the stored score
+# is the natural log of the scaled sum: ln(rating / 5) + half-lives * ln 2 per
+# review, combined with log-sum-exp. It stays a modest float for any date and
+# half-life; an empty sum is -inf.
+TRENDING_EPOCH = datetime(2026, 1, 1)
+NO_TRENDING = float("-inf")
+_LN2 = math.log(2)
+
+def _half_lives_since_epoch(at: datetime) -> float:
+    return (at - TRENDING_EPOCH).total_seconds() / (settings.LEADERBOARD_TRENDING_HALF_LIFE_HOURS * 3600)
+
+def _log_scale(at: datetime) -> float:
+    return _half_lives_since_epoch(at) * _LN2
+
+def trending_weight(rating: Optional[int], at: Optional[datetime]) -> float:
+    """Stored (log) trending contribution of a review rated `rating` and created at `at` (NO_TRENDING for none)"""
+    if not rating or at is None:
+        return NO_TRENDING
+    return math.log(rating / 5) + _log_scale(at)
+
+def log_add(a: float, b: float) -> float:
+    """ln(e**a + e**b) without overflow: adds two stored trending scores"""
+    if a == NO_TRENDING:
+        return b
+    if b == NO_TRENDING:
+        return a
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+def trending_now(stored: float, now: Optional[datetime] = None) -> float:
+    """Decayed trending score as of `now`: the sum of (rating / 5) / 2 ** (age / half-life)"""
+    if stored == NO_TRENDING:
+        return 0.0
+    return math.exp(stored - _log_scale(now or datetime.utcnow()))
+
+def _trending_change(old_rating: Optional[int], new_rating: Optional[int], reviewed_at: Optional[datetime]) -> Dict[str, Any]:
+    """
+    Aggregation expression for trending_score after one review's rating changes
+    from `old_rating` to `new_rating`. In linear terms it adds
+    (new - old) / 5 * 2 ** half-lives; in log space that is
+    ref + ln(e**(score - ref) + delta * e**(scale - ref)) with ref = max(score, scale),
+    so neither exponential can overflow. Sums that cancel out (within float
+    precision) become NO_TRENDING.
+    """
+    delta = ((new_rating or 0) - (old_rating or 0)) / 5
+    if reviewed_at is None or delta == 0:
+        return "$trending_score"
+    scale = _log_scale(reviewed_at)
+    return {"$let": {
+        "vars": {"ref": {"$max": ["$trending_score", scale]}},
+        "in": {"$let": {
+            "vars": {"ref": "$$ref", "sum": {"$add": [
+                {"$exp": {"$subtract": ["$trending_score", "$$ref"]}},
+                {"$multiply": [delta, {"$exp": {"$subtract": [scale, "$$ref"]}}]},
+            ]}},
+            "in": {"$cond": [{"$gt": ["$$sum", 1e-12]}, {"$add": ["$$ref", {"$ln": "$$sum"}]}, NO_TRENDING]},
+        }},
+    }}
+
+def bayesian_score(rating_sum: int, rating_count: int, prior_mean: float, prior_votes: Optional[float] = None) -> float:
+    """
+    Average rating after adding `prior_votes` phantom reviews at the catalog
+    mean: one 5-star review barely moves a movie, hundreds of them do.
+    """
+    votes = settings.LEADERBOARD_PRIOR_VOTES if prior_votes is None else prior_votes
+    return (rating_sum + prior_mean * votes) / (rating_count + votes)
+
+class _Prior:
+    """Catalog-wide mean rating, recomputed from the movie aggregates at most every TTL"""
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.mean: Optional[float] = None
+        self.expires = 0.0
+
+    async def get(self) -> float:
+        if self.mean is None or time.monotonic() >= self.expires:
+            rows = await Movie.get_motor_collection().aggregate([
+                {"$match": {"status": "approved", "rating_count": {"$gt": 0}}},
+                {"$group": {"_id": None, "sum": {"$sum": "$rating_sum"}, "count": {"$sum": "$rating_count"}}},
+            ]).to_list(None)
+            self.mean = rows[0]["sum"] / rows[0]["count"] if rows and rows[0]["count"] else 3.0
+            self.expires = time.monotonic() + settings.LEADERBOARD_PRIOR_TTL_SECONDS
+        return self.mean
+
+prior = _Prior()
+
+def _entries(movie: Dict[str, Any], prior_mean: float, trending: float, now: datetime) -> List[Dict[str, Any]]:
+    fields = {
+        "movie_id": movie["_id"],
+        "top_score": bayesian_score(movie.get("rating_sum") or 0, movie.get("rating_count") or 0, prior_mean),
+        "trending_score": trending,
+        "rating": movie.get("rating"),
+        "rating_count": movie.get("rating_count") or 0,
+        **{name: movie.get(name) for name in CARD_FIELDS},
+        "updated_at": now,
+    }
+    genres = dict.fromkeys([ALL_GENRES] + list(movie.get("genres") or []))
+    return [{**fields, "genre": genre} for genre in genres]
+
+async def add_to_leaderboards(movie_ids: Sequence[PydanticObjectId]) -> int:
+    """Put newly approved movies on the boards, trending from their existing reviews; returns entries written"""
+    if not movie_ids:
+        return 0
+    trending: Dict[Any, float] = defaultdict(lambda: NO_TRENDING)
+    async for review in Review.get_motor_collection().find(
+        {"movie_id": {"$in": list(movie_ids)}}, {"_id": 0, "movie_id": 1, "rating": 1, "created_at": 1}
+    ):
+        movie_id = review["movie_id"]
+        trending[movie_id] = log_add(trending[movie_id], trending_weight(review["rating"], review.get("created_at")))
+
+    prior_mean = await prior.get()
+    now = datetime.utcnow()
+    documents = [
+        entry
+        async for movie in Movie.get_motor_collection().find(
+            {"_id": {"$in": list(movie_ids)}, "status": "approved"}, {name: 1 for name in MOVIE_FIELDS}
+        )
+        for entry in _entries(movie, prior_mean, trending[movie["_id"]], now)
+    ]
+    collection = LeaderboardEntry.get_motor_collection()
+    await collection.delete_many({"movie_id": {"$in": list(movie_ids)}})
+    if documents:
+        await collection.insert_many(documents, ordered=False)
+    return len(documents)
+
+async def remove_from_leaderboards(movie_ids: Sequence[PydanticObjectId]) -> None:
+    if movie_ids:
+        await LeaderboardEntry.get_motor_collection().delete_many({"movie_id": {"$in": list(movie_ids)}})
+
+async def record_review(
+    movie: Dict[str, Any],
+    old_rating: Optional[int],
+    new_rating: Optional[int],
+    reviewed_at: Optional[datetime],
+) -> None:
+    """
+    Refresh an approved movie's entries after one review write, given the
+    aggregates apply_rating_change returned: the Bayesian score is recomputed
+    and the review's trending contribution swapped, in one pipeline update_many.
+    """
+    if movie.get("status") != "approved":
+        return
+    prior_mean = await prior.get()
+    await LeaderboardEntry.get_motor_collection().update_many(
+        {"movie_id": movie["_id"]},
+        [{"$set": {
+            "top_score": bayesian_score(movie.get("rating_sum") or 0, movie.get("rating_count") or 0, prior_mean),
+            "rating": movie.get("rating"),
+            "rating_count": movie.get("rating_count") or 0,
+            "updated_at": datetime.utcnow(),
+            "trending_score": _trending_change(old_rating, new_rating, reviewed_at),
+        }}],
+    )
+
+async def rebuild_leaderboards(batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Recompute every entry from the movies and reviews collections (after an
+    import, a half-life change, or to re-anchor scores to the current mean),
+    then drop entries the rebuild did not write.
+    """
+    started = datetime.utcnow()
+    trending: Dict[Any, float] = defaultdict(lambda: NO_TRENDING)
+    reviews = 0
+    async for review in Review.get_motor_collection().find(
+        {}, {"_id": 0, "movie_id": 1, "rating": 1, "created_at": 1}, batch_size=10_000
+    ):
+        movie_id = review["movie_id"]
+        trending[movie_id] = log_add(trending[movie_id], trending_weight(review["rating"], review.get("created_at")))
+        reviews += 1
+
+    prior.reset()
+    prior_mean = await prior.get()
+    collection = LeaderboardEntry.get_motor_collection()
+    operations: List[UpdateOne] = []
+    movies = 0
+    async for movie in Movie.get_motor_collection().find(
+        {"status": "approved"}, {name: 1 for name in MOVIE_FIELDS}, batch_size=10_000
+    ):
+        movies += 1
+        for entry in _entries(movie, prior_mean, trending.get(movie["_id"], NO_TRENDING), started):
+            operations.append(UpdateOne({"movie_id": entry["movie_id"], "genre": entry["genre"]}, {"$set": entry}, upsert=True))
+        if len(operations) >= batch_size:
+            await collection.bulk_write(operations, ordered=False)
+            operations = []
+    if operations:
+        await collection.bulk_write(operations, ordered=False)
+    await collection.delete_many({"updated_at": {"$lt": started}})
+    return {"movies": movies, "reviews": reviews, "prior_mean": round(prior_mean, 3)}
+
+async def leaderboard(board: str, genre: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    """Top `limit` movies of a board, read in index order from the materialized entries"""
+    field = BOARDS[board]
+    cursor = LeaderboardEntry.get_motor_collection().find(
+        {"genre": genre or ALL_GENRES},
+        {"_id": 0, "movie_id": 1, field: 1, "rating": 1, "rating_count": 1, **{name: 1 for name in CARD_FIELDS}},
+    ).sort([(field, -1), ("movie_id", 1)]).limit(limit)
+    now = datetime.utcnow()
+    return [
+        {
+            "id": str(entry["movie_id"]),
+            **{name: entry.get(name) for name in CARD_FIELDS},
+            "rating": entry.get("rating"),
+            "rating_count": entry.get("rating_count", 0),
+            "score": round(trending_now(entry[field], now) if field == "trending_score" else entry[field], 4),
+        }
+        async for entry in cursor
+    ]
@@ -0,0 +1,152 @@
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from beanie import PydanticObjectId
+from pymongo import ReturnDocument
+from core.cache import response_cache
+from models.movie import Movie
+from services.leaderboard_service import add_to_leaderboards, remove_from_leaderboards
+from services.recommendation_service import update_content_neighbors
+
+logger = logging.getLogger(__name__)
+
+# action -> fields it sets
+MODERATION_ACTIONS: Dict[str, Dict[str, Any]] = {
+    "approve": {"status": "approved"},
+    "reject": {"status": "rejected"},
+    "feature": {"featured": True},
+    "unfeature": {"featured": False},
+}
+
+# Upper bound on the movies a single bulk request may touch
+MAX_BATCH = 1000
+
+def _affects_lists(action: str, before: Dict[str, Any]) -> bool:
+    # Public lists only show approved movies
+    if action == "approve":
+        return before.get("status") != "approved"
+    return before.get("status") == "approved"
+
+async def select_movie_ids(
+    status: Optional[str] = "pending",
+    genre: Optional[str] = None,
+    submitted_by: Optional[str] = None,
+    created_before: Optional[datetime] = None,
+    limit: int = MAX_BATCH,
+) -> List[PydanticObjectId]:
+    """Resolve a moderation filter to movie ids, oldest submission first (same order as the queue)"""
+    query: Dict[str, Any] = {}
+    if status:
+        query["status"] = status
+    if genre:
+        query["genres"] = genre
+    if submitted_by:
+        query["submitted_by"] = submitted_by
+    if created_before:
+        query["created_at"] = {"$lt": created_before}
+    cursor = Movie.get_motor_collection().find(query, {"_id": 1}).sort([("created_at", 1), ("_id", 1)])
+    return [doc["_id"] async for doc in cursor.limit(min(limit, MAX_BATCH))]
+
+async def moderate_movies(action: str, movie_ids: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Apply a moderation action to many movies with one read and one update_many
+    per current state. Every requested id gets an outcome: "updated",
+    "unchanged" (already in that state), "conflict" (another request changed it
+    between the read and the write; nothing was done), "not_found" or
+    "invalid_id". The response cache is invalidated once for the whole batch.
+    """
+    changes = MODERATION_ACTIONS[action]
+    (field, value), = changes.items()
+    requested = list(dict.fromkeys(str(movie_id) for movie_id in movie_ids))
+    outcomes: Dict[str, str] = {}
+    valid: Dict[str, PydanticObjectId] = {}
+    for raw in requested:
+        try:
+            valid[raw] = PydanticObjectId(raw)
+        except Exception:
+            outcomes[raw] = "invalid_id"
+
+    collection = Movie.get_motor_collection()
+    projection = {"status": 1, "featured": 1}
+    current = {
+        doc["_id"]: doc
+        async for doc in collection.find({"_id": {"$in": list(valid.values())}}, projection)
+    }
+
+    # Grouped by the value the action replaces: each update only matches movies still
+    # in the state they were read in, so side effects follow what was actually written
+    to_update: Dict[Any, List[PydanticObjectId]] = defaultdict(list)
+    for raw, movie_id in valid.items():
+        before = current.get(movie_id)
+        if before is None:
+            outcomes[raw] = "not_found"
+        elif before.get(field) == value:
+            outcomes[raw] = "unchanged"
+        else:
+            to_update[before.get(field)].append(movie_id)
+
+    now = datetime.utcnow()
+    updated: List[PydanticObjectId] = []
+    for expected, ids in to_update.items():
+        result = await collection.update_many(
+            {"_id": {"$in": ids}, field: expected},
+            {"$set": {**changes, "updated_at": now}},
+        )
+        if result.modified_count == len(ids):
+            updated.extend(ids)
+        else:
+            # Some moved on since the read; keep the ones this write changed
+            written = {"_id": {"$in": ids}, field: value, "updated_at": now}
+            updated.extend([doc["_id"] async for doc in collection.find(written, {"_id": 1})])
+
+    done = set(updated)
+    for raw, movie_id in valid.items():
+        if raw not in outcomes:
+            outcomes[raw] = "updated" if movie_id in done else "conflict"
+
+    listed = [movie_id for movie_id in updated if _affects_lists(action, current[movie_id])]
+    if updated:
+        await response_cache.invalidate_movies(updated, lists=bool(listed))
+    if listed and action in ("approve", "reject"):
+        # entering (approve) or leaving (reject) the public catalog
+        await update_catalog_views(action, listed)
+
+    return {
+        "action": action,
+        "requested": len(requested),
+        "updated": len(updated),
+        "results": [{"id": raw, "outcome": outcomes[raw]} for raw in requested],
+    }
+
+async def update_catalog_views(action: str, movie_ids: List[PydanticObjectId]) -> None:
+    """Leaderboard and similar-movie upkeep for movies entering ("approve") or leaving the public catalog"""
+    # Best effort: moderation has already happened; a failure here is caught up by
+    # `manage.py rebuild-leaderboards` / `recompute-similar`
+    added, removed = (movie_ids, []) if action == "approve" else ([], movie_ids)
+    try:
+        await add_to_leaderboards(added)
+        await remove_from_leaderboards(removed)
+    except Exception:
+        logger.exception("Leaderboard update error")
+    try:
+        await update_content_neighbors(added, removed)
+    except Exception:
+        logger.exception("Content neighbours update error")
+
+async def toggle_featured(movie_id: str) -> Optional[bool]:
+    """Flip a movie's featured flag in one write; returns the new value, or None if it does not exist"""
+    try:
+        object_id = PydanticObjectId(movie_id)
+    except Exception:
+        return None
+    movie = await Movie.get_motor_collection().find_one_and_update(
+        {"_id": object_id},
+        [{"$set": {"featured": {"$cond": [{"$eq": ["$featured", True]}, False, True]}, "updated_at": datetime.utcnow()}}],
+        projection={"featured": 1, "status": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if movie is None:
+        return None
+    await response_cache.invalidate_movie(movie["_id"], lists=movie.get("status") == "approved")
+    return movie["featured"]
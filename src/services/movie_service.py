@@ -0,0 +1,140 @@
+import re
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from beanie import PydanticObjectId
+from models.movie import Movie
+from utils.pagination import paginate
+from core.serialization import MOVIE_FIELDS
+
+# Case-insensitive ordering for title sorts, matching the old in-memory `.lower()` sort
+TITLE_COLLATION = {"locale": "en", "strength": 2}
+
+# Named field profiles for `fields=`
+FIELD_PROFILES = {
+    "card": ("title", "poster_url", "rating", "genres"),
+}
+
+SORT_FIELDS = {
+    "created_at": ("created_at", -1),
+    "rating": ("rating", -1),
+    "title": ("title", 1),
+}
+
+def build_movie_filter(
+    search: Optional[str] = None,
+    genre: Optional[str] = None,
+    year: Optional[int] = None,
+    min_rating: Optional[float] = None,
+    featured: Optional[bool] = None,
+    status: str = "approved",
+) -> Dict[str, Any]:
+    """
+    Translate the public /movies query parameters into a MongoDB filter document.
+    """
+    query: Dict[str, Any] = {"status": status}
+    if featured is not None:
+        query["featured"] = featured
+
+    if search:
+        pattern = {"$regex": re.escape(search), "$options": "i"}
+        query["$or"] = [
+            {"title": pattern},
+            {"description": pattern},
+            {"director": pattern},
+        ]
+
+    if genre:
+        query["genres"] = genre
+
+    if year:
+        query["release_year"] = year
+
+    if min_rating is not None:
+        query["rating"] = {"$gte": min_rating}
+
+    return query
+
+class InvalidFields(ValueError):
+    pass
+
+def resolve_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a `fields=` value (comma-separated names or a profile such as "card").
+    Returns None for the full document; raises InvalidFields for unknown fields.
+    """
+    if not fields:
+        return None
+    if fields in FIELD_PROFILES:
+        return FIELD_PROFILES[fields]
+    requested = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in requested if name != "id" and name not in MOVIE_FIELDS]
+    if unknown:
+        raise InvalidFields(f"Unknown movie fields: {', '.join(unknown)}")
+    return tuple(name for name in requested if name != "id")
+
+def movie_projection(fields: Optional[Tuple[str, ...]]) -> Dict[str, int]:
+    """Mongo projection for a resolved field list (None means every public field)"""
+    return {name: 1 for name in (MOVIE_FIELDS if fields is None else fields)}
+
+def movie_sort(sort_by: Optional[str]) -> Tuple[str, int]:
+    """
+    Return the (field, direction) pair for a sort_by value, defaulting to newest first.
+    """
+    return SORT_FIELDS.get(sort_by or "created_at", SORT_FIELDS["created_at"])
+
+async def find_movies_page(
+    query: Dict[str, Any],
+    sort_by: Optional[str] = "created_at",
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    page: int = 1,
+    projection: Optional[Dict[str, int]] = None,
+) -> Tuple[List[Any], int, Optional[str]]:
+    """
+    Run the filter, sort and page in MongoDB.
+    Returns (movies, total matching count, cursor for the next page); movies are
+    raw projected dicts when a projection is given, Movie documents otherwise.
+    """
+    field, direction = movie_sort(sort_by)
+    find_kwargs = {"collation": TITLE_COLLATION} if field == "title" else {}
+
+    (movies, next_cursor), total = await asyncio.gather(
+        paginate(
+            Movie,
+            query,
+            field,
+            direction,
+            limit,
+            cursor=cursor,
+            skip=(page - 1) * limit,
+            projection=projection,
+            **find_kwargs,
+        ),
+        Movie.find(query).count(),
+    )
+    return movies, total, next_cursor
+
+async def get_movies_by_ids(
+    ids: Iterable[PydanticObjectId],
+    approved_only: bool = True,
+    projection: Optional[Dict[str, int]] = None,
+) -> List[Any]:
+    """
+    Fetch many movies with one $in query, returned in the order of `ids`.
+    Unknown ids (and unapproved movies when approved_only) are skipped.
+    With a projection the raw projected dicts are returned instead of documents.
+    """
+    ordered_ids = list(dict.fromkeys(ids))
+    if not ordered_ids:
+        return []
+
+    query: Dict[str, Any] = {"_id": {"$in": ordered_ids}}
+    if approved_only:
+        query["status"] = "approved"
+    if projection is not None:
+        movies = await Movie.get_motor_collection().find(query, projection).to_list(None)
+        by_id = {movie["_id"]: movie for movie in movies}
+    else:
+        movies = await Movie.find(query).to_list()
+        by_id = {movie.id: movie for movie in movies}
+    return [by_id[movie_id] for movie_id in ordered_ids if movie_id in by_id]
@@ -0,0 +1,128 @@
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from beanie import PydanticObjectId
+from pymongo import ReturnDocument, UpdateOne
+from models.movie import Movie
+from models.review import Review
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+def _plus(field: str, delta: int) -> Dict[str, Any]:
+    return {"$add": [{"$ifNull": [f"${field}", 0]}, delta]}
+
+# rating = round(rating_sum / rating_count, 1), or null when there are no reviews.
+# Written with $floor rather than $round so it also runs on older servers.
+_DERIVED_RATING = {
+    "$cond": [
+        {"$gt": ["$rating_count", 0]},
+        {"$divide": [
+            {"$floor": {"$add": [{"$multiply": [{"$divide": ["$rating_sum", "$rating_count"]}, 10]}, 0.5]}},
+            10,
+        ]},
+        None,
+    ]
+}
+
+def round_rating(average: float) -> float:
+    """Half-up rounding to one decimal, identical to the server-side expression above"""
+    return math.floor(average * 10 + 0.5) / 10
+
+def empty_histogram() -> Dict[str, int]:
+    return {str(value): 0 for value in RATING_VALUES}
+
+def rating_update_pipeline(old_rating: Optional[int], new_rating: Optional[int]) -> List[Dict[str, Any]]:
+    """
+    Update pipeline that moves a movie's aggregates from one review rating to another.
+    Pass old_rating=None for a new review and new_rating=None for a deleted one.
+    """
+    sum_delta = (new_rating or 0) - (old_rating or 0)
+    count_delta = (new_rating is not None) - (old_rating is not None)
+
+    histogram_delta: Dict[int, int] = {}
+    if old_rating is not None:
+        histogram_delta[old_rating] = histogram_delta.get(old_rating, 0) - 1
+    if new_rating is not None:
+        histogram_delta[new_rating] = histogram_delta.get(new_rating, 0) + 1
+
+    increments = {
+        "rating_sum": _plus("rating_sum", sum_delta),
+        "rating_count": _plus("rating_count", count_delta),
+    }
+    for value, delta in histogram_delta.items():
+        if delta:
+            increments[f"rating_histogram.{value}"] = _plus(f"rating_histogram.{value}", delta)
+
+    return [{"$set": increments}, {"$set": {"rating": _DERIVED_RATING}}]
+
+async def apply_rating_change(
+    movie_id: str,
+    old_rating: Optional[int],
+    new_rating: Optional[int],
+) -> Optional[Dict[str, Any]]:
+    """
+    Atomically adjust a movie's rating aggregates and derived rating in a single write.
+    Returns the updated aggregate fields, or None if nothing changed or the movie does not exist.
+    """
+    if old_rating == new_rating:
+        return None
+
+    collection = Movie.get_motor_collection()
+    return await collection.find_one_and_update(
+        {"_id": PydanticObjectId(movie_id)},
+        rating_update_pipeline(old_rating, new_rating),
+        projection={"rating": 1, "rating_sum": 1, "rating_count": 1, "rating_histogram": 1, "status": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+
+async def rebuild_rating_aggregates(batch_size: int = 1000) -> int:
+    """
+    Recompute every movie's aggregates from the reviews collection in one aggregation pass.
+    Every movie written is stamped with this run's start time, so movies without reviews
+    are then reset with one filter on the stamp (never a list of ids). Returns the number
+    of movies with reviews.
+    """
+    reviews = Review.get_motor_collection()
+    movies = Movie.get_motor_collection()
+    stamp = datetime.utcnow()
+
+    pipeline = [
+        {"$group": {"_id": {"movie_id": "$movie_id", "rating": "$rating"}, "n": {"$sum": 1}}},
+        {"$group": {
+            "_id": "$_id.movie_id",
+            "rating_count": {"$sum": "$n"},
+            "rating_sum": {"$sum": {"$multiply": ["$_id.rating", "$n"]}},
+            "histogram": {"$push": {"k": {"$toString": "$_id.rating"}, "v": "$n"}},
+        }},
+    ]
+
+    rated = 0
+    operations = []
+    async for row in reviews.aggregate(pipeline, allowDiskUse=True):
+        rated += 1
+        histogram = empty_histogram()
+        histogram.update({item["k"]: item["v"] for item in row["histogram"]})
+        operations.append(UpdateOne(
+            {"_id": row["_id"]},
+            {"$set": {
+                "rating_sum": row["rating_sum"],
+                "rating_count": row["rating_count"],
+                "rating_histogram": histogram,
+                "rating": round_rating(row["rating_sum"] / row["rating_count"]),
+                "ratings_rebuilt_at": stamp,
+            }},
+        ))
+        if len(operations) >= batch_size:
+            await movies.bulk_write(operations, ordered=False)
+            operations = []
+    if operations:
+        await movies.bulk_write(operations, ordered=False)
+
+    await movies.update_many(
+        {"ratings_rebuilt_at": {"$ne": stamp}},
+        {"$set": {
+            "rating_sum": 0, "rating_count": 0, "rating_histogram": empty_histogram(), "rating": None,
+            "ratings_rebuilt_at": stamp,
+        }},
+    )
+    return rated
@@ -0,0 +1,414 @@
+import math
+import time
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+from models.movie import Movie, title_key_of
+from models.movie_similarity import MovieSimilarity
+from models.review import Review
+
+COLLABORATIVE = "collaborative"
+CONTENT = "content"
+SIMILARITY_KINDS = (COLLABORATIVE, CONTENT)
+AUTO = "auto"  # collaborative when there are any, content otherwise
+CARD_FIELDS = ("title", "poster_url", "release_year")
+
+# Content features: field -> weight of the whole field in the movie vector.
+# Weights are fixed (no catalog-wide IDF), so a movie's vector depends only on
+# the movie itself and approving one movie never changes anyone else's.
+CONTENT_WEIGHTS = {"genre": 1.0, "director": 0.8, "cast": 0.8, "decade": 0.4, "language": 0.4, "country": 0.3}
+CONTENT_FIELDS = ("genres", "cast.name", "director", "language", "country", "release_year")
+CAST_LIMIT = 5  # top-billed names only
+CONTENT_TOP_K = 20
+# On approval, the new movie is scored against at most this many approved movies
+# per shared token, so the cost is bounded by its token count, not the catalog size
+CANDIDATES_PER_TOKEN = 200
+
+def _numeric():
+    # Optional dependencies, declared in requirements-recs.txt: only the batch recompute
+    # needs them; the incremental update on approval scores its few candidates in plain Python
+    try:
+        import numpy as np
+        import scipy.sparse as sparse
+    except ImportError as e:
+        raise RuntimeError("Similarity recompute needs numpy and scipy: pip install -r requirements-recs.txt") from e
+    return np, sparse
+
+def _top_k(np, scores, k: int):
+    """Column indices and values of the k largest scores of every row, best first"""
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+def item_neighbors(
+    user_idx, item_idx, n_users: int, n_items: int,
+    top_k: int = 20, min_support: int = 2, max_batch_cells: int = 1 << 23,
+) -> Iterator[Tuple[int, Any, Any]]:
+    """
+    Top-K cosine neighbours of every item in a binary user x item "liked" matrix.
+
+    Items are processed in row batches: one sparse product gives the co-like
+    counts of a batch against every item, which is densified (at most
+    `max_batch_cells` floats), scaled by the item norms and cut to the top K
+    with argpartition. Pairs liked together by fewer than `min_support` users
+    are ignored. Yields (item, neighbour items, scores), best first.
+    """
+    np, sparse = _numeric()
+    likes = sparse.csr_matrix(
+        (np.ones(len(user_idx), dtype=np.float32), (user_idx, item_idx)), shape=(n_users, n_items)
+    )
+    likes.sum_duplicates()
+    likes.data[:] = 1
+    items = likes.T.tocsr()
+    norms = np.sqrt(np.asarray(items.sum(axis=1), dtype=np.float32).ravel())
+    k = min(top_k, n_items - 1)
+    if k <= 0:
+        return
+
+    batch = max(1, max_batch_cells // n_items)
+    for start in range(0, n_items, batch):
+        stop = min(start + batch, n_items)
+        rows = np.arange(stop - start)
+        co = (items[start:stop] @ likes).toarray()
+        co[rows, rows + start] = 0  # an item is not its own neighbour
+        co[co < min_support] = 0
+        denominator = norms[start:stop, None] * norms[None, :]
+        scores = np.divide(co, denominator, out=np.zeros_like(co), where=denominator > 0)
+
+        top, top_scores = _top_k(np, scores, k)
+        for row in rows:
+            keep = top_scores[row] > 0
+            if keep.any():
+                yield start + row, top[row][keep], top_scores[row][keep]
+
+def content_tokens(doc: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Sparse feature vector of a movie document as {"field:value": weight}.
+    Values are folded like titles ("Sci-Fi" == "sci fi"); a field's weight is
+    spread over its values so five cast names count as much as one director.
+    """
+    year = doc.get("release_year")
+    fields = {
+        "genre": doc.get("genres") or [],
+        "director": [doc.get("director")],
+        "cast": [member.get("name") for member in (doc.get("cast") or [])[:CAST_LIMIT]],
+        "decade": [f"{year // 10 * 10}s"] if year else [],
+        "language": [doc.get("language")],
+        "country": [doc.get("country")],
+    }
+    tokens: Dict[str, float] = {}
+    for field, values in fields.items():
+        keys = {title_key_of(value) for value in values if value}
+        keys.discard("")
+        for key in keys:
+            tokens[f"{field}:{key}"] = CONTENT_WEIGHTS[field] / math.sqrt(len(keys))
+    return tokens
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(b) < len(a):
+        a, b = b, a
+    dot = sum(weight * b.get(token, 0.0) for token, weight in a.items())
+    norms = math.sqrt(sum(w * w for w in a.values())) * math.sqrt(sum(w * w for w in b.values()))
+    return dot / norms if norms else 0.0
+
+def feature_matrix(vectors: Sequence[Dict[str, float]]):
+    """L2-normalised CSR matrix with one row per token dict, so row dot products are cosines"""
+    np, sparse = _numeric()
+    vocabulary: Dict[str, int] = {}
+    indptr, indices, data = array("q", [0]), array("i"), array("f")
+    for tokens in vectors:
+        norm = math.sqrt(sum(weight * weight for weight in tokens.values())) or 1.0
+        for token, weight in tokens.items():
+            indices.append(vocabulary.setdefault(token, len(vocabulary)))
+            data.append(weight / norm)
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.frombuffer(data, dtype=np.float32), np.frombuffer(indices, dtype=np.int32), np.frombuffer(indptr, dtype=np.int64)),
+        shape=(len(vectors), max(len(vocabulary), 1)),
+    )
+
+def content_neighbors(
+    features, rows: Optional[Sequence[int]] = None, top_k: int = CONTENT_TOP_K, max_batch_cells: int = 1 << 23,
+) -> Iterator[Tuple[int, Any, Any]]:
+    """
+    Top-K cosine neighbours of the given rows (all by default) of a
+    feature_matrix against every row, in batches of one sparse product each.
+    Yields (row, neighbour rows, scores), best first.
+    """
+    np, _ = _numeric()
+    n_items = features.shape[0]
+    rows = np.arange(n_items) if rows is None else np.asarray(rows, dtype=np.int64)
+    k = min(top_k, n_items - 1)
+    if k <= 0:
+        return
+    columns = features.T.tocsc()
+    batch = max(1, max_batch_cells // n_items)
+    for start in range(0, len(rows), batch):
+        chunk = rows[start:start + batch]
+        scores = (features[chunk] @ columns).toarray()
+        scores[np.arange(len(chunk)), chunk] = 0  # a movie is not its own neighbour
+        top, top_scores = _top_k(np, scores, k)
+        for n, row in enumerate(chunk.tolist()):
+            keep = top_scores[n] > 1e-6
+            if keep.any():
+                yield row, top[n][keep], top_scores[n][keep]
+
+async def load_movie_cards(with_features: bool = False):
+    """
+    Approved movies in a fixed order, and the card fields stored with each
+    neighbour; with `with_features`, also each movie's content_tokens.
+    """
+    ids: List[PydanticObjectId] = []
+    cards: Dict[PydanticObjectId, Dict[str, Any]] = {}
+    vectors: List[Dict[str, float]] = []
+    projection = {name: 1 for name in CARD_FIELDS + (CONTENT_FIELDS if with_features else ())}
+    cursor = Movie.get_motor_collection().find({"status": "approved"}, projection, batch_size=10_000)
+    async for doc in cursor:
+        ids.append(doc["_id"])
+        cards[doc["_id"]] = {name: doc.get(name) for name in CARD_FIELDS}
+        if with_features:
+            vectors.append(content_tokens(doc))
+    if with_features:
+        return ids, cards, vectors
+    return ids, cards
+
+async def load_likes(movie_index: Dict[Any, int], like_threshold: int, batch_size: int):
+    """
+    Stream (user, movie) pairs of reviews rated `like_threshold` or better into
+    flat index arrays; only the two ids of each review cross the wire.
+    """
+    user_index: Dict[str, int] = {}
+    users, movies = array("i"), array("i")
+    cursor = Review.get_motor_collection().find(
+        {"rating": {"$gte": like_threshold}}, {"_id": 0, "movie_id": 1, "user_id": 1}, batch_size=batch_size
+    )
+    async for doc in cursor:
+        movie = movie_index.get(doc["movie_id"])
+        if movie is None:
+            continue  # not approved (any more)
+        users.append(user_index.setdefault(doc["user_id"], len(user_index)))
+        movies.append(movie)
+    return users, movies, len(user_index)
+
+def _neighbor(movie_id, score: float, cards) -> Dict[str, Any]:
+    return {"movie_id": movie_id, "score": round(float(score), 4), **cards[movie_id]}
+
+async def write_neighbors(
+    kind: str, results: Iterable[Tuple[int, Any, Any]], movie_ids, cards, computed_at: datetime, write_batch: int,
+) -> int:
+    """Upsert neighbour lists from a *_neighbors generator in unordered bulk writes; returns how many"""
+    collection = MovieSimilarity.get_motor_collection()
+    operations: List[UpdateOne] = []
+    written = 0
+    for item, neighbours, scores in results:
+        neighbors = [
+            _neighbor(movie_ids[other], score, cards) for other, score in zip(neighbours.tolist(), scores.tolist())
+        ]
+        operations.append(UpdateOne(
+            {"movie_id": movie_ids[item], "kind": kind},
+            {"$set": {"neighbors": neighbors, "computed_at": computed_at}},
+            upsert=True,
+        ))
+        if len(operations) >= write_batch:
+            await collection.bulk_write(operations, ordered=False)
+            written += len(operations)
+            operations = []
+    if operations:
+        await collection.bulk_write(operations, ordered=False)
+        written += len(operations)
+    return written
+
+async def recompute_collaborative(
+    top_k: int = 20,
+    min_support: int = 2,
+    like_threshold: int = 4,
+    batch_size: int = 10_000,
+    write_batch: int = 1000,
+) -> Dict[str, Any]:
+    """
+    Rebuild the "users who liked this also liked" neighbour lists from the
+    reviews collection and replace the stored ones. Movies left without
+    neighbours lose their entry.
+    """
+    np, _ = _numeric()
+    started = time.perf_counter()
+    computed_at = datetime.utcnow()
+    movie_ids, cards = await load_movie_cards()
+    movie_index = {movie_id: n for n, movie_id in enumerate(movie_ids)}
+    users, movies, n_users = await load_likes(movie_index, like_threshold, batch_size)
+    loaded = time.perf_counter()
+
+    written = await write_neighbors(
+        COLLABORATIVE,
+        item_neighbors(
+            np.frombuffer(users, dtype=np.int32), np.frombuffer(movies, dtype=np.int32),
+            max(n_users, 1), len(movie_ids), top_k=top_k, min_support=min_support,
+        ),
+        movie_ids, cards, computed_at, write_batch,
+    )
+    await MovieSimilarity.get_motor_collection().delete_many({"kind": COLLABORATIVE, "computed_at": {"$lt": computed_at}})
+
+    return {
+        "movies": len(movie_ids),
+        "users": n_users,
+        "likes": len(users),
+        "movies_with_neighbors": written,
+        "load_seconds": round(loaded - started, 2),
+        "total_seconds": round(time.perf_counter() - started, 2),
+    }
+
+async def recompute_content(top_k: int = CONTENT_TOP_K, write_batch: int = 1000) -> Dict[str, Any]:
+    """Rebuild every "more like this" list from movie metadata and replace the stored ones"""
+    started = time.perf_counter()
+    computed_at = datetime.utcnow()
+    movie_ids, cards, vectors = await load_movie_cards(with_features=True)
+    loaded = time.perf_counter()
+    await _store_content_tokens(zip(movie_ids, vectors), write_batch)
+    written = await write_neighbors(
+        CONTENT, content_neighbors(feature_matrix(vectors), top_k=top_k), movie_ids, cards, computed_at, write_batch
+    )
+    await MovieSimilarity.get_motor_collection().delete_many({"kind": CONTENT, "computed_at": {"$lt": computed_at}})
+    return {
+        "movies": len(movie_ids),
+        "movies_with_neighbors": written,
+        "load_seconds": round(loaded - started, 2),
+        "total_seconds": round(time.perf_counter() - started, 2),
+    }
+
+async def remove_from_similar(movie_ids: Sequence[PydanticObjectId], kind: Optional[str] = None) -> None:
+    """Drop movies from every neighbour list, and their own lists (of one kind, or all)"""
+    if not movie_ids:
+        return
+    collection = MovieSimilarity.get_motor_collection()
+    scope = {} if kind is None else {"kind": kind}
+    await collection.delete_many({"movie_id": {"$in": list(movie_ids)}, **scope})
+    await collection.update_many(
+        {"neighbors.movie_id": {"$in": list(movie_ids)}, **scope},
+        {"$pull": {"neighbors": {"movie_id": {"$in": list(movie_ids)}}}},
+    )
+
+async def _store_content_tokens(vectors: Iterable[Tuple[PydanticObjectId, Dict[str, float]]], write_batch: int = 1000) -> None:
+    """Save each movie's token keys, which the incremental update finds candidates by"""
+    collection = Movie.get_motor_collection()
+    operations: List[UpdateOne] = []
+    for movie_id, tokens in vectors:
+        keys = sorted(tokens)
+        operations.append(UpdateOne({"_id": movie_id, "content_tokens": {"$ne": keys}}, {"$set": {"content_tokens": keys}}))
+        if len(operations) >= write_batch:
+            await collection.bulk_write(operations, ordered=False)
+            operations = []
+    if operations:
+        await collection.bulk_write(operations, ordered=False)
+
+async def _content_candidates(tokens: Dict[str, float], exclude: PydanticObjectId) -> Dict[PydanticObjectId, Dict[str, Any]]:
+    """Approved movies sharing a token, up to CANDIDATES_PER_TOKEN per token (index status_content_tokens)"""
+    collection = Movie.get_motor_collection()
+    projection = {name: 1 for name in CARD_FIELDS + CONTENT_FIELDS}
+    candidates: Dict[PydanticObjectId, Dict[str, Any]] = {}
+    for token in tokens:
+        cursor = collection.find({"status": "approved", "content_tokens": token}, projection).limit(CANDIDATES_PER_TOKEN)
+        async for doc in cursor:
+            if doc["_id"] != exclude:
+                candidates.setdefault(doc["_id"], doc)
+    return candidates
+
+async def update_content_neighbors(
+    added: Sequence[PydanticObjectId] = (),
+    removed: Sequence[PydanticObjectId] = (),
+    top_k: int = CONTENT_TOP_K,
+) -> Dict[str, int]:
+    """
+    Incremental "more like this" upkeep for moderation and approved imports.
+    Movies leaving the catalog are pulled from every list. Each newly approved
+    movie is scored against the approved movies that share one of its content
+    tokens (bounded by CANDIDATES_PER_TOKEN, never the whole catalog), gets
+    its own list, and is pushed into the lists of candidates where it beats
+    the current K-th entry. Common tokens (a genre, a decade) are truncated, so
+    the result can differ slightly from a full recompute, which remains exact.
+    """
+    await remove_from_similar(removed)
+    await remove_from_similar(added, kind=CONTENT)  # re-approval must not leave duplicates behind
+    report = {"added": 0, "removed": len(removed), "reverse_updates": 0}
+    if not added:
+        return report
+    projection = {name: 1 for name in CARD_FIELDS + CONTENT_FIELDS}
+    new = {
+        doc["_id"]: doc
+        async for doc in Movie.get_motor_collection().find({"_id": {"$in": list(added)}, "status": "approved"}, projection)
+    }
+    if not new:
+        return report
+    vectors = {movie_id: content_tokens(doc) for movie_id, doc in new.items()}
+    await _store_content_tokens(vectors.items())
+
+    computed_at = datetime.utcnow()
+    cards = {movie_id: {name: doc.get(name) for name in CARD_FIELDS} for movie_id, doc in new.items()}
+    operations: List[UpdateOne] = []
+    pushes: List[Tuple[PydanticObjectId, PydanticObjectId, float]] = []
+    for movie_id, tokens in vectors.items():
+        scored = []
+        for other, doc in (await _content_candidates(tokens, exclude=movie_id)).items():
+            cards.setdefault(other, {name: doc.get(name) for name in CARD_FIELDS})
+            score = _cosine(tokens, content_tokens(doc))
+            if score > 1e-6:
+                scored.append((score, other))
+        scored.sort(key=lambda pair: (-pair[0], str(pair[1])))
+        operations.append(UpdateOne(
+            {"movie_id": movie_id, "kind": CONTENT},
+            {"$set": {
+                "neighbors": [_neighbor(other, score, cards) for score, other in scored[:top_k]],
+                "computed_at": computed_at,
+            }},
+            upsert=True,
+        ))
+        pushes += [(other, movie_id, score) for score, other in scored if other not in new]
+
+    # Only push where the new movie would make the cut: read each candidate's K-th score
+    collection = MovieSimilarity.get_motor_collection()
+    kth = {
+        doc["movie_id"]: doc["neighbors"][0]["score"] if doc.get("neighbors") else 0.0
+        async for doc in collection.find(
+            {"movie_id": {"$in": list({target for target, _, _ in pushes})}, "kind": CONTENT},
+            {"_id": 0, "movie_id": 1, "neighbors": {"$slice": [top_k - 1, 1]}},
+        )
+    }
+    for target, movie_id, score in pushes:
+        if round(score, 4) > kth.get(target, 0.0):
+            operations.append(UpdateOne(
+                {"movie_id": target, "kind": CONTENT},
+                {
+                    "$push": {"neighbors": {
+                        "$each": [_neighbor(movie_id, score, cards)], "$sort": {"score": -1}, "$slice": top_k,
+                    }},
+                    "$setOnInsert": {"computed_at": computed_at},
+                },
+                upsert=True,
+            ))
+            report["reverse_updates"] += 1
+    await collection.bulk_write(operations, ordered=False)
+    report["added"] = len(new)
+    return report
+
+async def similar_movies(movie_id: PydanticObjectId, kind: str = AUTO, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Stored neighbours of a movie, best first; one indexed read. AUTO serves
+    the collaborative list and falls back to content for movies without one
+    (new or rarely reviewed).
+    """
+    kinds = list(SIMILARITY_KINDS) if kind == AUTO else [kind]
+    docs = {
+        doc["kind"]: doc
+        async for doc in MovieSimilarity.get_motor_collection().find(
+            {"movie_id": movie_id, "kind": {"$in": kinds}}, {"_id": 0, "kind": 1, "neighbors": {"$slice": limit}}
+        )
+    }
+    doc = next((docs[name] for name in kinds if docs.get(name, {}).get("neighbors")), None)
+    if doc is None:
+        return []
+    return [
+        {"id": str(neighbor["movie_id"]), "score": neighbor["score"], **{name: neighbor.get(name) for name in CARD_FIELDS}}
+        for neighbor in doc["neighbors"]
+    ]
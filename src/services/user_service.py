@@ -1,7 +1,12 @@
-from typing import Optional, Dict, Any
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
 from models.user import User
+from pymongo import ReturnDocument
+from core.passwords import hash_password, verify_password
+from core.security import revocations
 
 async def create_user(user_data: Dict[str, Any]) -> User:
+    """Register a regular user; roles are only ever raised by set_role"""
     # Check if user already exists in MongoDB
     existing_user = await User.find_one({"email": user_data["email"]})
     if existing_user:
@@ -11,17 +16,69 @@ async def create_user(user_data: Dict[str, Any]) -> User:
     user = User(
         username=user_data["username"],
         email=user_data["email"],
-        password=user_data["password"],
-        role=user_data.get("role", "user")
+        password=await hash_password(user_data["password"]),
+        role="user",
     )
     await user.insert()
     return user
 
 async def authenticate_user(email: str, password: str) -> Optional[User]:
     user = await User.find_one({"email": email})
-    if user and user.password == password:
-        return user
-    return None
+    matches, needs_rehash = await verify_password(password, user.password if user else None)
+    if not matches:
+        return None
+    if needs_rehash:
+        # Upgrade plaintext / low-cost hashes; conditional on the old value so a
+        # concurrent password change is never overwritten
+        new_hash = await hash_password(password)
+        await User.get_motor_collection().update_one(
+            {"_id": user.id, "password": user.password}, {"$set": {"password": new_hash}}
+        )
+        user.password = new_hash
+    return user
+
+async def revoke_tokens(email: str) -> None:
+    """Invalidate all outstanding access tokens of a user"""
+    doc = await User.get_motor_collection().find_one_and_update(
+        {"email": email},
+        {"$inc": {"token_version": 1}, "$set": {"token_revoked_at": datetime.utcnow()}},
+        projection={"token_version": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if doc:
+        revocations.set(email, doc["token_version"])
+
+async def set_role(email: str, role: str) -> bool:
+    """
+    Change a user's role (admin tooling only). Outstanding tokens carry the old
+    role in their claims, so they are revoked. Returns False for unknown users.
+    """
+    doc = await User.get_motor_collection().find_one_and_update(
+        {"email": email},
+        {"$set": {"role": role, "token_revoked_at": datetime.utcnow()}, "$inc": {"token_version": 1}},
+        projection={"token_version": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if doc is None:
+        return False
+    revocations.set(email, doc["token_version"])
+    return True
 
 async def get_user(user_id: str) -> Optional[User]:
-    return await User.find_one({"email": user_id})
\ No newline at end of file
+    return await User.find_one({"email": user_id})
+
+async def get_watchlist_page(email: str, offset: int, limit: int) -> Optional[Tuple[List[Any], int]]:
+    """
+    One page of a user's watchlist (movie ids in the order they were added) and
+    the watchlist's length, sliced on the server so only the page is transferred;
+    None if there is no such user.
+    """
+    watchlist = {"$ifNull": ["$watchlist", []]}
+    rows = await User.get_motor_collection().aggregate([
+        {"$match": {"email": email}},
+        {"$limit": 1},
+        {"$project": {"_id": 0, "page": {"$slice": [watchlist, offset, limit]}, "total": {"$size": watchlist}}},
+    ]).to_list(1)
+    if not rows:
+        return None
+    return rows[0]["page"], rows[0]["total"]
@@ -0,0 +1,106 @@
+import base64
+from typing import Any, Dict, List, Optional, Tuple
+from bson import ObjectId, json_util
+
+class InvalidCursor(ValueError):
+    pass
+
+def _sort_value(doc: Any, field: str) -> Any:
+    if isinstance(doc, dict):
+        return doc.get(field)
+    return getattr(doc, field, None)
+
+def _doc_id(doc: Any) -> ObjectId:
+    if isinstance(doc, dict):
+        return doc["_id"]
+    return doc.id
+
+def encode_cursor(sort_field: str, value: Any, doc_id: ObjectId) -> str:
+    """
+    Build an opaque cursor from the last item of a page.
+    The sort field is embedded so a cursor cannot be replayed against a different ordering.
+    """
+    payload = json_util.dumps({"f": sort_field, "v": value, "id": doc_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_field: str) -> Tuple[Any, ObjectId]:
+    """
+    Return the (sort value, _id) pair stored in a cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        value, doc_id = payload["v"], payload["id"]
+        field = payload["f"]
+    except Exception:
+        raise InvalidCursor("Malformed cursor")
+    if field != sort_field or not isinstance(doc_id, ObjectId):
+        raise InvalidCursor("Cursor does not match this sort order")
+    return value, doc_id
+
+def keyset_filter(sort_field: str, direction: int, value: Any, doc_id: ObjectId) -> Dict[str, Any]:
+    """
+    Filter matching every document that sorts strictly after (value, doc_id).
+
+    MongoDB sorts null/missing values before any number, string or date, and
+    range operators never match null, so those documents are handled explicitly.
+    """
+    id_op = "$lt" if direction < 0 else "$gt"
+    value_op = "$lt" if direction < 0 else "$gt"
+
+    if value is None:
+        same_value = {sort_field: None, "_id": {id_op: doc_id}}
+        if direction < 0:
+            # nothing sorts below null
+            return same_value
+        return {"$or": [same_value, {sort_field: {"$ne": None}}]}
+
+    clauses = [
+        {sort_field: {value_op: value}},
+        {sort_field: value, "_id": {id_op: doc_id}},
+    ]
+    if direction < 0:
+        clauses.append({sort_field: None})
+    return {"$or": clauses}
+
+async def paginate(
+    model,
+    query: Dict[str, Any],
+    sort_field: str,
+    direction: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    projection: Optional[Dict[str, Any]] = None,
+    **find_kwargs: Any,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Keyset-paginate `model.find(query)` ordered by (sort_field, _id).
+
+    Returns the page and the cursor for the next one (None on the last page).
+    Every page is an index range scan of `limit + 1` documents, however deep it is.
+    `skip` only exists for legacy page-number clients and is ignored when a cursor is given.
+    With a `projection` the query goes straight to the collection and returns raw
+    dicts holding only the projected fields (plus _id and the sort field).
+    """
+    if cursor:
+        value, doc_id = decode_cursor(cursor, sort_field)
+        query = {"$and": [query, keyset_filter(sort_field, direction, value, doc_id)]}
+        skip = 0
+
+    sort = [(sort_field, direction), ("_id", direction)]
+    if projection is not None:
+        projection = {**projection, sort_field: 1}
+        find_query = model.get_motor_collection().find(query, projection, **find_kwargs).sort(sort)
+    else:
+        find_query = model.find(query, **find_kwargs).sort(sort)
+    if skip:
+        find_query = find_query.skip(skip)
+    docs = await find_query.limit(limit + 1).to_list(limit + 1)
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor(sort_field, _sort_value(last, sort_field), _doc_id(last))
+    return docs, next_cursor
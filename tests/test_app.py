@@ -1,20 +1,24 @@
 import pytest
-from src.app import app
+from fastapi.testclient import TestClient
+from app import app
 
 @pytest.fixture
-def client():
-    with app.test_client() as client:
-        yield client
+def client(db):
+    # No context manager: the lifespan (real MongoDB connection) is not started,
+    # the db fixture provides an in-memory database instead
+    return TestClient(app)
 
 def test_home_page(client):
     response = client.get('/')
     assert response.status_code == 200
-    assert b'Welcome to the API' in response.data
+    assert response.json() == {"message": "CineCheck API is running!"}
 
 def test_users_endpoint(client):
-    response = client.get('/api/v1/users')
-    assert response.status_code == 200
+    response = client.get('/api/v1/users/nobody@example.com')
+    assert response.status_code == 404
 
 def test_items_endpoint(client):
-    response = client.get('/api/v1/items')
-    assert response.status_code == 200
\ No newline at end of file
+    response = client.get('/api/v1/movies/')
+    assert response.status_code == 200
+    assert response.json() == []
+    assert response.headers["X-Total-Count"] == "0"
@@ -0,0 +1,146 @@
+import asyncio
+from core.cache import MemoryCacheBackend, RedisCacheBackend, ResponseCache, response_cache
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_memory_backend_evicts_least_recently_used_and_expires():
+    clock = FakeClock()
+    backend = MemoryCacheBackend(max_entries=2, clock=clock)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(backend.set("a", b"1", ttl=10))
+    loop.run_until_complete(backend.set("b", b"2", ttl=10))
+    assert loop.run_until_complete(backend.get("a")) == b"1"  # "a" is now most recent
+    loop.run_until_complete(backend.set("c", b"3", ttl=10))
+    assert loop.run_until_complete(backend.get("b")) is None
+    assert backend.evictions == 1
+
+    clock.now = 11
+    assert loop.run_until_complete(backend.get("a")) is None
+    assert backend.expirations == 1
+    loop.close()
+
+def test_generation_bump_orphans_old_entries(fake_redis):
+    loop = asyncio.new_event_loop()
+    for backend in (MemoryCacheBackend(), RedisCacheBackend(fake_redis)):
+        cache = ResponseCache(backend, ttl=30)
+        builds = []
+
+        async def build():
+            builds.append(1)
+            return b"[]", {"X-Total-Count": "0"}
+
+        params = {"genre": "Drama", "limit": 20}
+        first = loop.run_until_complete(cache.cached("movies", "movies", params, build))
+        again = loop.run_until_complete(cache.cached("movies", "movies", dict(reversed(params.items())), build))
+        assert again.body == first.body and again.headers["X-Total-Count"] == "0"
+        assert len(builds) == 1
+
+        loop.run_until_complete(cache.invalidate_movie("abc", lists=True))
+        loop.run_until_complete(cache.cached("movies", "movies", params, build))
+        assert len(builds) == 2
+        assert (cache.hits, cache.misses) == (1, 2)
+    loop.close()
+
+def test_shared_backend_revalidates_expired_entries_without_rebuilding(fake_redis):
+    loop = asyncio.new_event_loop()
+    for backend, short_circuits in ((RedisCacheBackend(fake_redis), True), (MemoryCacheBackend(), False)):
+        cache = ResponseCache(backend, ttl=30)
+        builds = []
+
+        async def build():
+            builds.append(1)
+            return b'[{"title": "Heat"}]' * 100, {}
+
+        first = loop.run_until_complete(cache.cached("movies", "movies", {}, build, accept_encoding="gzip"))
+        assert first.headers["ETag"].endswith('-gzip"')
+        key = loop.run_until_complete(cache.make_key("movies", "movies", {}))
+        loop.run_until_complete(backend.delete(key))  # the entry's TTL ran out
+
+        again = loop.run_until_complete(cache.cached(
+            "movies", "movies", {}, build, if_none_match=first.headers["ETag"], accept_encoding="gzip"
+        ))
+        assert again.status_code == 304 and again.headers["ETag"] == first.headers["ETag"]
+        assert len(builds) == (1 if short_circuits else 2)
+
+        # a bumped generation is a new key: its validators are not inherited
+        loop.run_until_complete(cache.invalidate_movie("abc", lists=True))
+        loop.run_until_complete(cache.cached("movies", "movies", {}, build, if_none_match=first.headers["ETag"]))
+        assert len(builds) == (2 if short_circuits else 3)
+    loop.close()
+
+def test_approving_a_movie_invalidates_cached_lists(db, admin_headers):
+    from fastapi.testclient import TestClient
+    from app import app
+    from models.movie import Movie
+
+    movie = Movie(title="Queued", description="d", status="pending")
+    _run(movie.insert())
+    client = TestClient(app, headers=admin_headers)
+
+    assert client.get("/api/v1/movies/").json() == []
+    assert client.get("/api/v1/movies/").json() == []
+    assert response_cache.hits == 1
+
+    assert client.post(f"/api/v1/admin/movies/{movie.id}/approve").status_code == 200
+    assert [m["title"] for m in client.get("/api/v1/movies/").json()] == ["Queued"]
+    assert client.get(f"/api/v1/movies/{movie.id}").json()["status"] == "approved"
+
+def test_matching_etag_gets_304_until_the_movie_changes(db):
+    from fastapi.testclient import TestClient
+    from app import app
+    from models.movie import Movie
+
+    movie = Movie(title="Tagged", description="d", genres=["Drama"], status="approved")
+    _run(movie.insert())
+    client = TestClient(app)
+    paths = (f"/api/v1/movies/{movie.id}", "/api/v1/movies/?genre=Drama")
+    etags = {}
+
+    for path in paths:
+        first = client.get(path)
+        etag = etags[path] = first.headers["etag"]
+        assert first.status_code == 200 and first.headers["cache-control"] == "no-cache"
+        assert client.get(path, headers={"If-None-Match": f'W/{etag}, "other"'}).status_code == 304
+        not_modified = client.get(path, headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304 and not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+    assert response_cache.not_modified == 4
+    assert response_cache.misses == 2  # the 304s were answered from the cache entries, not MongoDB
+
+    # invalidation alone does not change the tag: it names the content, not the generation
+    _run(response_cache.invalidate_movie(movie.id, lists=True))
+    assert client.get(paths[0], headers={"If-None-Match": etags[paths[0]]}).status_code == 304
+
+    _run(Movie.get_motor_collection().update_one({"_id": movie.id}, {"$set": {"title": "Retagged"}}))
+    _run(response_cache.invalidate_movie(movie.id, lists=True))
+    for path in paths:
+        changed = client.get(path, headers={"If-None-Match": etags[path]})
+        assert changed.status_code == 200 and changed.headers["etag"] != etags[path]
+
+def test_worker_that_missed_an_invalidation_cannot_revalidate_changed_content(db):
+    from fastapi.testclient import TestClient
+    from app import app
+    from core.cache import MemoryCacheBackend
+    from models.movie import Movie
+
+    movie = Movie(title="Before", description="d", status="approved")
+    _run(movie.insert())
+    client = TestClient(app)
+    path = f"/api/v1/movies/{movie.id}"
+    stale = client.get(path).headers["etag"]
+
+    # another worker (own memory backend) changed the movie; this one rebuilds under the same generation
+    _run(Movie.get_motor_collection().update_one({"_id": movie.id}, {"$set": {"title": "After"}}))
+    generations = {k: v for k, v in response_cache.backend._entries.items() if k.startswith("gen:")}
+    response_cache.backend = MemoryCacheBackend()
+    response_cache.backend._entries.update(generations)
+    response = client.get(path, headers={"If-None-Match": stale})
+    assert response.status_code == 200 and response.json()["title"] == "After"
@@ -0,0 +1,85 @@
+import asyncio
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from core.compression import CompressionMiddleware, choose_encoding
+
+def test_accept_encoding_negotiation():
+    assert choose_encoding("gzip, deflate, br", ["br", "gzip"]) == "br"
+    assert choose_encoding("br;q=0, gzip;q=0.5", ["br", "gzip"]) == "gzip"
+    assert choose_encoding("*", ["gzip"]) == "gzip"
+    assert choose_encoding("identity", ["br", "gzip"]) is None
+    assert choose_encoding(None, ["gzip"]) is None
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, min_size=100)
+
+    @app.get("/big")
+    def big():
+        return PlainTextResponse("x" * 5000, headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/stream")
+    def stream():
+        async def lines():
+            for n in range(200):
+                yield f'{{"n": {n}}}\n'.encode()
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+def test_middleware_compresses_above_threshold_and_streams():
+    client = TestClient(_app(), headers={"Accept-Encoding": "gzip"})
+
+    big = client.get("/big")
+    assert big.headers["content-encoding"] == "gzip"
+    assert big.headers["etag"] == '"v1-gzip"'
+    assert big.headers["vary"] == "Accept-Encoding"
+    assert int(big.headers["content-length"]) < 100 and big.text == "x" * 5000
+
+    assert "content-encoding" not in client.get("/small").headers
+    assert "content-encoding" not in client.get("/big", headers={"Accept-Encoding": "identity"}).headers
+
+    streamed = client.get("/stream")
+    assert streamed.headers["content-encoding"] == "gzip"
+    assert len(streamed.text.splitlines()) == 200
+
+def test_cached_movie_lists_are_stored_compressed(db):
+    from app import app
+    from core.cache import response_cache
+    from models.movie import Movie
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(Movie.insert_many([
+        Movie(title=f"Movie {n}", description="A long description " * 20, genres=["Drama"], status="approved")
+        for n in range(30)
+    ]))
+    client = TestClient(app)
+
+    compressed = client.get("/api/v1/movies/", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"].endswith('-gzip"')
+    assert len(compressed.json()) == 20
+
+    [(_, raw)] = [entry for key, entry in response_cache.backend._entries.items() if not key.startswith("gen:")]
+    assert raw.split(b"\n", 1)[1][:2] == b"\x1f\x8b"  # gzip magic: compressed once, at build time
+
+    plain = client.get("/api/v1/movies/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == compressed.json()
+    assert (response_cache.hits, response_cache.misses) == (1, 1)
+
+    revalidated = client.get(
+        "/api/v1/movies/", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == compressed.headers["etag"]  # the 304 names the variant it validates
+
+    identity = client.get(
+        "/api/v1/movies/", headers={"Accept-Encoding": "identity", "If-None-Match": plain.headers["etag"]}
+    )
+    assert identity.status_code == 304 and identity.headers["etag"] == plain.headers["etag"]
@@ -0,0 +1,53 @@
+import pytest
+from types import SimpleNamespace
+
+def test_client_options_come_from_settings(monkeypatch):
+    from core import db
+    from core.config import settings
+
+    monkeypatch.setattr(settings, "MONGO_MAX_POOL_SIZE", 50)
+    monkeypatch.setattr(settings, "MONGO_COMPRESSORS", "zstd, zlib")
+    options = db.client_options("mongodb+srv://cluster.example.net/")
+    assert options["maxPoolSize"] == 50
+    assert options["compressors"] == ["zstd", "zlib"]
+    assert "tls" not in options
+    assert db.client_options("mongodb://localhost:27017")["tls"] is True
+
+def test_pool_stats_track_checked_out_connections():
+    from core.db import PoolStats
+
+    stats = PoolStats()
+    event = SimpleNamespace()
+    stats.connection_created(event)
+    stats.connection_checked_out(event)
+    stats.connection_checked_out(event)
+    stats.connection_checked_in(event)
+    snapshot = stats.snapshot()
+    assert (snapshot["open"], snapshot["in_use"], snapshot["checkouts"]) == (1, 1, 2)
+
+def test_readiness_reports_ping_and_pool(db, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app import app
+    from core import db as core_db
+
+    client = TestClient(app)
+    assert client.get("/health/ready").status_code == 503
+
+    async def fake_ping():
+        return 1.5
+
+    monkeypatch.setattr(core_db, "ping", fake_ping)
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["ping_ms"] == 1.5
+    assert "in_use" in response.json()["pool"]
+
+def test_startup_fails_fast_without_database(monkeypatch):
+    from fastapi.testclient import TestClient
+    from app import app
+    from core.config import settings
+
+    monkeypatch.setattr(settings, "MONGODB_URI", "")
+    with pytest.raises(ValueError):
+        with TestClient(app):
+            pass
@@ -0,0 +1,59 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from models.movie import Movie, CastMember
+
+def _seed(db):
+    base = datetime(2024, 1, 1)
+    movies = [
+        Movie(title=f"Movie {i}", description="desc", genres=["Drama", "Crime"],
+              cast=[CastMember(name="Actor", role="Lead")], status="approved",
+              created_at=base + timedelta(days=i))
+        for i in range(7)
+    ]
+    movies.append(Movie(title="Hidden", description="desc", status="pending", created_at=base))
+    asyncio.get_event_loop().run_until_complete(Movie.insert_many(movies))
+
+def test_export_movies_ndjson_streams_every_document(db, admin_headers):
+    from fastapi.testclient import TestClient
+    from app import app
+
+    _seed(db)
+    client = TestClient(app, headers=admin_headers)
+
+    response = client.get("/api/v1/admin/export/movies", params={"status": "approved", "batch_size": 3})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == [f"Movie {i}" for i in range(7)]
+    assert rows[0]["cast"] == [{"name": "Actor", "role": "Lead"}]
+
+    response = client.get("/api/v1/admin/export/movies", params={"fields": "title", "status": "pending"})
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 1
+    assert set(rows[0]) == {"id", "title"}
+    assert rows[0]["title"] == "Hidden"
+
+def test_export_movies_csv_has_header_and_flattened_values(db, admin_headers):
+    from fastapi.testclient import TestClient
+    from app import app
+
+    _seed(db)
+    client = TestClient(app, headers=admin_headers)
+
+    response = client.get(
+        "/api/v1/admin/export/movies",
+        params={"format": "csv", "fields": "title,genres,cast", "batch_size": 2},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 8
+    assert list(rows[0]) == ["id", "title", "genres", "cast"]
+    assert rows[0]["genres"] == "Drama|Crime"
+    assert json.loads(rows[0]["cast"]) == [{"name": "Actor", "role": "Lead"}]
+
+    assert client.get("/api/v1/admin/export/movies", params={"format": "xml"}).status_code == 422
+    assert client.get("/api/v1/admin/export/movies", params={"fields": "password"}).status_code == 400
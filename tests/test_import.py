@@ -0,0 +1,125 @@
+import asyncio
+import json
+from models.movie import title_key_of
+from services.import_service import parse_records
+
+def test_title_key_folds_case_punctuation_and_spacing():
+    assert title_key_of("  The Matrix: Reloaded!") == "the matrix reloaded"
+    assert title_key_of("the   matrix reloaded") == "the matrix reloaded"
+
+def test_parse_records_accepts_ndjson_and_arrays():
+    ndjson = b'{"title": "A"}\n\nnot json\n{"title": "B"}\n'
+    records = list(parse_records(ndjson))
+    assert [number for number, _ in records] == [0, 1, 2]
+    assert isinstance(records[1][1], Exception)
+    assert list(parse_records(b' [{"title": "A"}, {"title": "B"}]')) == [(0, {"title": "A"}), (1, {"title": "B"})]
+
+def test_import_upserts_by_natural_key_and_reports_errors(db, admin_headers):
+    from fastapi.testclient import TestClient
+    from app import app
+    from models.movie import Movie
+
+    client = TestClient(app, headers=admin_headers)
+    records = [
+        {"title": "Heat", "description": "d", "genres": ["Crime"], "release_date": "1995-12-15"},
+        {"title": "Heat", "description": "d", "genres": ["Crime"], "release_date": "1986-03-14"},
+        {"title": "No Description", "genres": []},
+        {"title": "Alien", "description": "d", "genres": ["Horror"], "cast": [{"name": "Sigourney Weaver"}]},
+        {"title": "HEAT!", "description": "newer copy", "genres": ["Crime"], "release_date": "1995-01-01"},
+    ]
+    body = "\n".join(json.dumps(r) for r in records) + "\nnot json\n"
+    response = client.post("/api/v1/admin/movies/import", content=body, params={"status": "approved"})
+    assert response.status_code == 200
+    report = response.json()
+    assert report["received"] == 6
+    assert report["inserted"] == 2
+    assert report["duplicates"] == 1
+    assert report["failed"] == 3
+    assert [error["record"] for error in report["errors"]] == [2, 3, 5]
+
+    loop = asyncio.get_event_loop()
+    heat = loop.run_until_complete(Movie.find_one({"title_key": "heat", "release_year": 1995}))
+    assert heat.description == "newer copy"
+    assert heat.status == "approved"
+
+    # Re-importing updates the existing document in place and keeps its moderation state
+    loop.run_until_complete(Movie.get_motor_collection().update_one({"_id": heat.id}, {"$set": {"featured": True}}))
+    update = [{"title": "heat", "description": "edited", "genres": ["Crime"], "release_date": "1995-12-15"}]
+    report = client.post("/api/v1/admin/movies/import", json=update).json()
+    assert (report["inserted"], report["updated"]) == (0, 1)
+    heat = loop.run_until_complete(Movie.find_one({"_id": heat.id}))
+    assert (heat.description, heat.status, heat.featured) == ("edited", "approved", True)
+    assert loop.run_until_complete(Movie.find_all().count()) == 2
+
+def _rebuild_natural_key_index(loop):
+    # mongomock drops partialFilterExpression from IndexModels; rebuild the index the way the server has it
+    from models.movie import Movie
+
+    collection = Movie.get_motor_collection()
+    [index] = [index.index.document for index in Movie.get_settings().indexes
+               if index.name == "title_key_release_year_unique"]
+    loop.run_until_complete(collection.drop_index(index["name"]))
+    loop.run_until_complete(collection.create_index(
+        list(index["key"].items()), **{k: v for k, v in index.items() if k != "key"}
+    ))
+
+def test_import_matches_movies_stored_before_title_key_existed(db, admin_headers):
+    from fastapi.testclient import TestClient
+    from app import app
+    from models.movie import Movie
+
+    collection = Movie.get_motor_collection()
+    loop = asyncio.get_event_loop()
+    _rebuild_natural_key_index(loop)
+    legacy = {"description": "old", "genres": [], "release_date": "1995-12-15", "status": "approved"}
+    first = loop.run_until_complete(collection.insert_one({"title": "Heat", **legacy})).inserted_id
+    second = loop.run_until_complete(collection.insert_one({"title": "HEAT", **legacy})).inserted_id
+
+    client = TestClient(app, headers=admin_headers)
+    update = [{"title": "Heat", "description": "imported", "genres": ["Crime"], "release_date": "1995-12-15"}]
+    report = client.post("/api/v1/admin/movies/import", json=update).json()
+    assert (report["inserted"], report["updated"]) == (0, 1)
+    assert loop.run_until_complete(collection.count_documents({})) == 2
+    heat = loop.run_until_complete(collection.find_one({"_id": first}))
+    assert (heat["title_key"], heat["release_year"], heat["description"]) == ("heat", 1995, "imported")
+    # the second copy cannot take the same natural key; it stays unkeyed for a manual merge
+    assert loop.run_until_complete(collection.find_one({"_id": second})).get("title_key") is None
+
+    duplicate = {"title": "heat!", "description": "d", "genres": [], "release_date": "1995-01-01"}
+    assert client.post("/api/v1/movies/", json=duplicate).status_code == 409
+
+def test_rejected_movies_do_not_block_resubmission(db, admin_headers):
+    from fastapi.testclient import TestClient
+    from app import app
+    from models.movie import Movie
+
+    loop = asyncio.get_event_loop()
+    _rebuild_natural_key_index(loop)
+    client = TestClient(app, headers=admin_headers)
+    submission = {"title": "Heat", "description": "d", "genres": ["Crime"], "release_date": "1995-12-15"}
+    first = client.post("/api/v1/movies/", json=submission).json()["id"]
+    assert client.post("/api/v1/movies/", json=submission).status_code == 409  # still pending: a duplicate
+    assert client.post(f"/api/v1/movies/admin/{first}/reject").status_code == 200
+
+    second = client.post("/api/v1/movies/", json=submission)
+    assert second.status_code == 200 and second.json()["id"] != first
+    # imports match the live copy, never the rejected one
+    report = client.post("/api/v1/admin/movies/import", json=[{**submission, "description": "imported"}]).json()
+    assert (report["inserted"], report["updated"]) == (0, 1)
+    rejected = loop.run_until_complete(Movie.get(first))
+    assert (rejected.status, rejected.description) == ("rejected", "d")
+
+def test_approved_imports_reach_leaderboards_and_similar_movies(db, admin_headers):
+    from fastapi.testclient import TestClient
+    from app import app
+
+    client = TestClient(app, headers=admin_headers)
+    records = [
+        {"title": title, "description": "d", "genres": ["Crime"], "director": "Michael Mann"}
+        for title in ("Heat", "Thief")
+    ]
+    report = client.post("/api/v1/admin/movies/import", json=records, params={"status": "approved"}).json()
+    assert report["inserted"] == 2
+    assert {m["title"] for m in client.get("/api/v1/movies/top-rated").json()} == {"Heat", "Thief"}
+    heat = next(m for m in client.get("/api/v1/movies/").json() if m["title"] == "Heat")
+    assert [m["title"] for m in client.get(f"/api/v1/movies/{heat['id']}/similar").json()] == ["Thief"]
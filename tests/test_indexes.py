@@ -0,0 +1,65 @@
+import asyncio
+from core.indexes import _plan_stages, create_indexes, find_duplicates, index_failures, verify_indexes
+
+def test_release_year_is_derived_from_release_date(db):
+    from models.movie import Movie, release_year_of
+
+    assert Movie(title="T", description="D", release_date="1994-09-23").release_year == 1994
+    assert release_year_of("unknown") is None
+    assert release_year_of(None) is None
+
+def test_plan_stages_walks_nested_plans():
+    plan = {"stage": "LIMIT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "COLLSCAN"}}}
+    assert _plan_stages(plan) == ["LIMIT", "FETCH", "COLLSCAN"]
+
+def test_verify_indexes_reports_missing_and_undeclared(db):
+    from models.review import Review
+
+    loop = asyncio.get_event_loop()
+    collection = Review.get_motor_collection()
+    loop.run_until_complete(collection.drop_index("user_created_at"))
+    loop.run_until_complete(collection.create_index("username", name="username_1"))
+
+    report = loop.run_until_complete(verify_indexes(explain=False))
+    assert report["collections"]["reviews"]["missing"] == ["user_created_at"]
+    assert report["collections"]["reviews"]["undeclared"] == ["username_1"]
+    assert report["collections"]["movies"]["missing"] == []
+    assert report["collections"]["users"]["missing"] == []
+
+def test_duplicates_degrade_one_unique_index_instead_of_startup(db, monkeypatch):
+    from datetime import datetime
+    from bson import ObjectId
+    from fastapi.testclient import TestClient
+    from app import app
+    from core import db as core_db
+    from models.review import Review
+
+    loop = asyncio.get_event_loop()
+    collection = Review.get_motor_collection()
+    loop.run_until_complete(collection.drop_index("movie_user_unique"))
+    loop.run_until_complete(collection.drop_index("user_created_at"))
+    movie_id = ObjectId()
+    review = {"movie_id": movie_id, "user_id": "twice@example.com", "username": "t", "rating": 4, "created_at": datetime.utcnow()}
+    loop.run_until_complete(collection.insert_many([dict(review), dict(review)]))
+
+    failures = loop.run_until_complete(create_indexes())
+    assert [(f["collection"], f["index"]) for f in failures] == [("reviews", "movie_user_unique")]
+    # the indexes declared after the failing one were still built
+    assert "user_created_at" in loop.run_until_complete(collection.index_information())
+
+    (group,) = loop.run_until_complete(find_duplicates())
+    assert group["index"] == "movie_user_unique"
+    assert group["key"] == {"movie_id": movie_id, "user_id": "twice@example.com"}
+    assert len(group["ids"]) == 2
+
+    async def fake_ping():
+        return 1.0
+
+    monkeypatch.setattr(core_db, "ping", fake_ping)
+    body = TestClient(app).get("/health/ready").json()
+    assert body["status"] == "degraded"
+    assert body["index_failures"][0]["index"] == "movie_user_unique"
+
+    loop.run_until_complete(collection.delete_one({"_id": group["ids"][1]}))
+    assert loop.run_until_complete(create_indexes()) == []
+    assert index_failures == []
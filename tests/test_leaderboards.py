@@ -0,0 +1,137 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from conftest import auth_headers
+from services.leaderboard_service import NO_TRENDING, bayesian_score, trending_now, trending_weight
+
+def test_scores():
+    # one 5-star review sits near the mean; a hundred 4.5-star averages keep most of theirs
+    assert bayesian_score(5, 1, 3.0, prior_votes=10) == pytest.approx(35 / 11)
+    assert bayesian_score(450, 100, 3.0, prior_votes=10) > bayesian_score(5, 1, 3.0, prior_votes=10)
+
+    now = datetime(2027, 3, 1)
+    assert trending_now(trending_weight(5, now), now) == pytest.approx(1.0)
+    assert trending_now(trending_weight(5, now - timedelta(hours=72)), now) == pytest.approx(0.5)
+    assert trending_weight(None, now) == NO_TRENDING
+    assert trending_now(NO_TRENDING, now) == 0.0
+
+def test_trending_survives_short_half_lives_far_from_the_epoch(db, monkeypatch):
+    from core.config import settings
+    from models.leaderboard import LeaderboardEntry
+    from models.movie import Movie
+    from models.review import Review
+    from services.leaderboard_service import leaderboard, rebuild_leaderboards, record_review
+
+    # 6 hour half-life, decades after TRENDING_EPOCH: 2 ** half-lives alone would overflow a float
+    monkeypatch.setattr(settings, "LEADERBOARD_TRENDING_HALF_LIFE_HOURS", 6)
+    loop = asyncio.get_event_loop()
+    reviewed_at = datetime.utcnow() + timedelta(days=365 * 30)
+    with pytest.raises(OverflowError):
+        2.0 ** ((reviewed_at - datetime(2026, 1, 1)).total_seconds() / (6 * 3600))
+
+    movie = Movie(title="Far Future", description="d", genres=["Drama"], status="approved", rating_sum=4, rating_count=1)
+    loop.run_until_complete(movie.insert())
+    loop.run_until_complete(Review(movie_id=movie.id, user_id="u", username="u", rating=4, created_at=reviewed_at).insert())
+    loop.run_until_complete(rebuild_leaderboards())
+    stored = loop.run_until_complete(LeaderboardEntry.find_one({"movie_id": movie.id})).trending_score
+    assert trending_now(stored, reviewed_at) == pytest.approx(0.8)
+    assert trending_now(stored, reviewed_at + timedelta(hours=6)) == pytest.approx(0.4)
+
+    doc = {"_id": movie.id, "status": "approved", "rating_sum": 5, "rating_count": 1}
+    loop.run_until_complete(record_review(doc, 4, 5, reviewed_at))
+    stored = loop.run_until_complete(LeaderboardEntry.find_one({"movie_id": movie.id})).trending_score
+    assert trending_now(stored, reviewed_at) == pytest.approx(1.0)
+    loop.run_until_complete(record_review(doc, 5, None, reviewed_at))
+    assert loop.run_until_complete(LeaderboardEntry.find_one({"movie_id": movie.id})).trending_score == NO_TRENDING
+    assert len(loop.run_until_complete(leaderboard("trending"))) == 1
+
+def test_leaderboards_follow_reviews_and_moderation(db, admin_headers):
+    from app import app
+    from models.movie import Movie
+
+    loop = asyncio.get_event_loop()
+    def movie(title, genres, status="approved"):
+        doc = Movie(title=title, description="A film", genres=genres, status=status)
+        loop.run_until_complete(doc.insert())
+        return doc
+
+    classic = movie("Classic", ["Drama"])
+    one_hit = movie("One Hit", ["Comedy"])
+    pending = movie("Pending", ["Drama"], status="pending")
+    admin = TestClient(app, headers=admin_headers)
+    for m in (classic, one_hit):
+        # approving an already-approved movie is a no-op, so go through pending
+        loop.run_until_complete(Movie.get_motor_collection().update_one({"_id": m.id}, {"$set": {"status": "pending"}}))
+        assert admin.post(f"/api/v1/movies/admin/{m.id}/approve").status_code == 200
+
+    def review(m, user, rating):
+        client = TestClient(app, headers=auth_headers(email=f"{user}@example.com", username=user))
+        response = client.post("/api/v1/reviews/", json={"movie_id": str(m.id), "rating": rating})
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    for n in range(6):
+        review(classic, f"fan{n}", 4)
+    review(one_hit, "fan0", 5)
+    review(pending, "fan0", 5)
+
+    client = TestClient(app)
+    top = client.get("/api/v1/movies/top-rated").json()
+    assert [m["title"] for m in top] == ["Classic", "One Hit"]  # raw rating would put One Hit first
+    assert top[0]["rating_count"] == 6 and top[0]["rating"] == 4.0
+    assert [m["title"] for m in client.get("/api/v1/movies/top-rated?genre=Comedy").json()] == ["One Hit"]
+    trending = client.get("/api/v1/movies/trending").json()
+    assert [m["title"] for m in trending] == ["Classic", "One Hit"]
+    assert trending[0]["score"] == pytest.approx(6 * 0.8, rel=1e-3)
+
+    # rating edits and deletes swap the review's contribution in place
+    edited = review(classic, "fan0", 1)
+    assert client.get("/api/v1/movies/trending").json()[0]["score"] == pytest.approx(5 * 0.8 + 0.2, rel=1e-3)
+    token = auth_headers(email="fan0@example.com", username="fan0")
+    assert TestClient(app, headers=token).delete(f"/api/v1/reviews/{edited['id']}").status_code == 200
+    assert client.get("/api/v1/movies/trending").json()[0]["score"] == pytest.approx(5 * 0.8, rel=1e-3)
+
+    # approval brings the existing reviews along; rejection takes the movie off every board
+    assert admin.post(f"/api/v1/movies/admin/{pending.id}/approve").status_code == 200
+    drama = client.get("/api/v1/movies/trending?genre=Drama").json()
+    assert [m["title"] for m in drama] == ["Classic", "Pending"]
+    assert admin.post(f"/api/v1/movies/admin/{classic.id}/reject").status_code == 200
+    assert [m["title"] for m in client.get("/api/v1/movies/top-rated?genre=Drama").json()] == ["Pending"]
+
+def test_rebuild_matches_incremental(db):
+    from models.leaderboard import LeaderboardEntry
+    from models.movie import Movie
+    from models.review import Review
+    from services.leaderboard_service import rebuild_leaderboards
+
+    loop = asyncio.get_event_loop()
+    movies = [Movie(title=f"Movie {n}", description="A film", genres=["Drama", "Crime"], status="approved") for n in range(2)]
+    for m in movies:
+        loop.run_until_complete(m.insert())
+    loop.run_until_complete(Review.insert_many([
+        Review(movie_id=movies[0].id, user_id="a", username="a", rating=5, created_at=datetime.utcnow()),
+        Review(movie_id=movies[1].id, user_id="a", username="a", rating=3, created_at=datetime.utcnow()),
+    ]))
+
+    report = loop.run_until_complete(rebuild_leaderboards())
+    assert (report["movies"], report["reviews"]) == (2, 2)
+    assert loop.run_until_complete(LeaderboardEntry.find().count()) == 6  # all + two genres, per movie
+
+def test_leaderboard_failure_does_not_skip_cache_invalidation(db, monkeypatch):
+    from app import app
+    from api.v1 import review_routes
+    from models.movie import Movie
+
+    movie = Movie(title="Heat", description="A film", genres=["Crime"], status="approved")
+    asyncio.get_event_loop().run_until_complete(movie.insert())
+    client = TestClient(app)
+    assert client.get(f"/api/v1/movies/{movie.id}").json()["rating"] is None  # now cached
+
+    async def broken(*args, **kwargs):
+        raise RuntimeError("leaderboard down")
+
+    monkeypatch.setattr(review_routes, "record_review", broken)
+    reviewer = TestClient(app, headers=auth_headers())
+    assert reviewer.post("/api/v1/reviews/", json={"movie_id": str(movie.id), "rating": 4}).status_code == 200
+    assert client.get(f"/api/v1/movies/{movie.id}").json()["rating"] == 4.0
@@ -0,0 +1,65 @@
+import io
+import logging
+import queue
+import orjson
+
+def _record(msg, *args, level=logging.INFO, **extra):
+    record = logging.LogRecord("cinecheck.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+def test_json_formatter_includes_request_id_and_extra_fields():
+    from core.log import DroppingQueueHandler, JsonFormatter, request_id_var
+
+    handler = DroppingQueueHandler(queue.Queue())
+    token = request_id_var.set("req-1")
+    try:
+        record = handler.prepare(_record("Imported %d movies", 3, chunk=2))
+    finally:
+        request_id_var.reset(token)
+    entry = orjson.loads(JsonFormatter().format(record))
+    assert entry["msg"] == "Imported 3 movies"
+    assert entry["request_id"] == "req-1"
+    assert entry["chunk"] == 2
+    assert entry["level"] == "INFO"
+
+def test_full_queue_drops_instead_of_blocking():
+    from core.log import DroppingQueueHandler, SampleDebug
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    for n in range(5):
+        handler.handle(_record("event %d", n))
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+    sampler = SampleDebug(0.0)
+    assert sampler.filter(_record("hot path", level=logging.DEBUG)) is False
+    assert sampler.filter(_record("rare", level=logging.WARNING)) is True
+
+def test_request_id_is_returned_and_logged(db, caplog):
+    from fastapi.testclient import TestClient
+    from app import app
+
+    client = TestClient(app)
+    with caplog.at_level(logging.INFO, logger="cinecheck.access"):
+        response = client.get("/", headers={"X-Request-ID": "abc-123"})
+    assert response.headers["x-request-id"] == "abc-123"
+    [access] = [r for r in caplog.records if r.name == "cinecheck.access"]
+    assert (access.method, access.path, access.status) == ("GET", "/", 200)
+
+    # malformed IDs are replaced rather than echoed back
+    assert client.get("/", headers={"X-Request-ID": "bad id\n"}).headers["x-request-id"] != "bad id\n"
+
+def test_setup_logging_writes_json_lines_from_the_writer_thread():
+    from core import log
+
+    previous = (log._handler, log._listener)
+    log._handler = log._listener = None
+    stream = io.StringIO()
+    try:
+        log.setup_logging(fmt="json", stream=stream)
+        logging.getLogger("cinecheck.test").warning("disk %s", "slow")
+        log.shutdown_logging()
+    finally:
+        log._handler, log._listener = previous
+    assert orjson.loads(stream.getvalue().splitlines()[-1])["msg"] == "disk slow"
@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+def _command(name, micros=2000):
+    return SimpleNamespace(command_name=name, duration_micros=micros)
+
+def test_histogram_renders_cumulative_buckets():
+    from core.metrics import Histogram
+
+    histogram = Histogram("latency_seconds", "test", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(3, "/a")
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+
+def test_command_listener_accounts_to_current_request():
+    from core.metrics import RequestDBStats, command_metrics, current_db_stats, mongo_commands
+
+    before = mongo_commands.value("find", "success")
+    stats = RequestDBStats()
+    token = current_db_stats.set(stats)
+    try:
+        for _ in range(3):
+            command_metrics.started(_command("find"))
+            command_metrics.succeeded(_command("find"))
+    finally:
+        current_db_stats.reset(token)
+    command_metrics.succeeded(_command("find"))  # outside a request: global counters only
+
+    assert stats.commands == 3
+    assert abs(stats.seconds - 0.006) < 1e-9
+    assert mongo_commands.value("find", "success") == before + 4
+
+def test_metrics_endpoint_reports_route_templates(db, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app import app
+    from core.config import settings
+    from core.metrics import http_request_duration
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+
+    client = TestClient(app)
+    before = http_request_duration.count("GET", "/api/v1/movies/{movie_id}", "404")
+    response = client.get("/api/v1/movies/507f1f77bcf86cd799439011")
+    assert response.status_code == 404
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert http_request_duration.count("GET", "/api/v1/movies/{movie_id}", "404") == before + 1
+
+    body = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'route="/api/v1/movies/{movie_id}",status="404"' in body
+    assert 'http_requests_in_flight{method="GET"} 0' in body
+
+def test_metrics_endpoint_requires_the_token(db, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app import app
+    from core.config import settings
+
+    client = TestClient(app)
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+
+def test_route_template_uses_the_public_route_and_a_bounded_fallback():
+    from fastapi import APIRouter, FastAPI
+    from core.metrics import route_template
+
+    app = FastAPI()
+    router = APIRouter(prefix="/movies")
+
+    @router.get("/{movie_id}")
+    def movie(movie_id: str):
+        return {}
+
+    app.include_router(router, prefix="/api/v1")
+    (route,) = router.routes
+    assert route_template({"path": "/api/v1/movies/abc", "route": route}) == "/api/v1/movies/{movie_id}"
+    # Cached per route: later ids reuse the same label
+    assert route_template({"path": "/api/v1/movies/xyz", "route": route}) == "/api/v1/movies/{movie_id}"
+    assert route_template({"path": "/api/v1/nothing/here"}) == "unmatched"
@@ -0,0 +1,136 @@
+import asyncio
+from datetime import datetime, timedelta
+from bson import ObjectId
+
+def _seed(db):
+    from models.movie import Movie
+
+    base = datetime(2024, 1, 1)
+    movies = [
+        Movie(title=f"Pending {i}", description="d", genres=["Drama" if i % 2 else "Comedy"],
+              status="pending", created_at=base + timedelta(days=i))
+        for i in range(5)
+    ]
+    movies.append(Movie(title="Live", description="d", status="approved", created_at=base))
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(Movie.insert_many(movies))
+    docs = loop.run_until_complete(Movie.find_all().sort("created_at", "title").to_list())
+    return {movie.title: str(movie.id) for movie in docs}
+
+def test_bulk_approve_by_ids_reports_each_outcome(db, admin_headers):
+    from fastapi.testclient import TestClient
+    from app import app
+    from core.cache import response_cache
+    from models.movie import Movie
+
+    ids = _seed(db)
+    client = TestClient(app, headers=admin_headers)
+    lists_before = asyncio.get_event_loop().run_until_complete(response_cache.generation(response_cache.LISTS))
+
+    missing = str(ObjectId())
+    requested = [ids["Pending 0"], ids["Pending 1"], ids["Live"], missing, "not-an-id", ids["Pending 0"]]
+    response = client.post("/api/v1/admin/movies/bulk/approve", json={"ids": requested})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["updated"] == 2
+    outcomes = {result["id"]: result["outcome"] for result in body["results"]}
+    assert outcomes == {
+        ids["Pending 0"]: "updated",
+        ids["Pending 1"]: "updated",
+        ids["Live"]: "unchanged",
+        missing: "not_found",
+        "not-an-id": "invalid_id",
+    }
+    loop = asyncio.get_event_loop()
+    assert loop.run_until_complete(Movie.find({"status": "approved"}).count()) == 3
+    assert loop.run_until_complete(response_cache.generation(response_cache.LISTS)) != lists_before
+
+def test_bulk_reject_by_filter_takes_oldest_matches(db, admin_headers):
+    from fastapi.testclient import TestClient
+    from app import app
+    from models.movie import Movie
+
+    ids = _seed(db)
+    client = TestClient(app, headers=admin_headers)
+    response = client.post(
+        "/api/v1/admin/movies/bulk/reject", json={"filter": {"genre": "Comedy", "limit": 2}}
+    )
+    assert response.status_code == 200
+    assert [result["id"] for result in response.json()["results"]] == [ids["Pending 0"], ids["Pending 2"]]
+    rejected = asyncio.get_event_loop().run_until_complete(Movie.find({"status": "rejected"}).to_list())
+    assert {movie.title for movie in rejected} == {"Pending 0", "Pending 2"}
+
+    assert client.post("/api/v1/admin/movies/bulk/delete", json={"ids": []}).status_code == 404
+    assert client.post("/api/v1/admin/movies/bulk/approve", json={}).status_code == 400
+
+def test_single_moderation_routes(db, admin_headers):
+    from fastapi.testclient import TestClient
+    from app import app
+
+    ids = _seed(db)
+    client = TestClient(app, headers=admin_headers)
+    assert client.post(f"/api/v1/admin/movies/{ids['Pending 3']}/approve").status_code == 200
+    assert client.post(f"/api/v1/admin/movies/{ObjectId()}/reject").status_code == 404
+
+    response = client.post(f"/api/v1/movies/admin/{ids['Live']}/feature")
+    assert response.json()["featured"] is True
+    response = client.post(f"/api/v1/movies/admin/{ids['Live']}/feature")
+    assert response.json()["featured"] is False
+    assert client.post("/api/v1/movies/admin/bogus/feature").status_code == 404
+
+def test_approvals_build_content_neighbors_from_shared_tokens_only(db, admin_headers, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app import app
+    from models.movie import Movie
+    import services.recommendation_service as recommendation_service
+
+    # no batch recompute (and no numpy) involved; each approval reads a bounded candidate set
+    monkeypatch.setattr(recommendation_service, "CANDIDATES_PER_TOKEN", 2)
+    loop = asyncio.get_event_loop()
+    movies = {}
+    for title, genres, director in [
+        ("Heat", ["Crime"], "Michael Mann"), ("Collateral", ["Crime"], "Michael Mann"),
+        ("Thief", ["Crime"], "Michael Mann"), ("Amelie", ["Romance"], None),
+    ]:
+        movies[title] = Movie(title=title, description="d", genres=genres, director=director, status="pending")
+        loop.run_until_complete(movies[title].insert())
+
+    client = TestClient(app, headers=admin_headers)
+    for title in movies:
+        assert client.post(f"/api/v1/movies/admin/{movies[title].id}/approve").status_code == 200
+
+    def similar(title):
+        return [m["title"] for m in client.get(f"/api/v1/movies/{movies[title].id}/similar").json()]
+    assert similar("Thief") == ["Heat", "Collateral"]  # equal scores: older id first
+    assert sorted(similar("Heat")) == ["Collateral", "Thief"]
+    assert similar("Amelie") == []
+    heat = loop.run_until_complete(Movie.get(movies["Heat"].id))
+    assert heat.content_tokens == ["director:michael mann", "genre:crime"]
+
+def test_movies_moderated_concurrently_are_left_alone(db, monkeypatch):
+    from models.movie import Movie
+    import services.moderation_service as moderation
+
+    ids = _seed(db)
+    loop = asyncio.get_event_loop()
+    collection = Movie.get_motor_collection()
+    update_many = collection.update_many
+
+    async def reject_first_then_update(query, update, **kwargs):
+        # another moderator rejects "Pending 0" after this batch has read it as pending
+        await update_many({"_id": ObjectId(ids["Pending 0"])}, {"$set": {"status": "rejected"}})
+        return await update_many(query, update, **kwargs)
+
+    views = []
+
+    async def record_views(action, movie_ids):
+        views.append((action, sorted(str(movie_id) for movie_id in movie_ids)))
+
+    monkeypatch.setattr(collection, "update_many", reject_first_then_update)
+    monkeypatch.setattr(moderation, "update_catalog_views", record_views)
+    report = loop.run_until_complete(moderation.moderate_movies("approve", [ids["Pending 0"], ids["Pending 1"]]))
+
+    assert report["updated"] == 1
+    assert [result["outcome"] for result in report["results"]] == ["conflict", "updated"]
+    assert loop.run_until_complete(Movie.get(ids["Pending 0"])).status == "rejected"
+    assert views == [("approve", [ids["Pending 1"]])]
@@ -0,0 +1,122 @@
+import pytest
+from datetime import datetime, timedelta
+from services.movie_service import build_movie_filter, movie_sort
+
+def test_build_movie_filter_defaults_to_approved():
+    assert build_movie_filter() == {"status": "approved"}
+
+def test_build_movie_filter_combines_parameters():
+    query = build_movie_filter(search="god.father", genre="Drama", year=1972, min_rating=4.0, featured=True)
+    assert query["status"] == "approved"
+    assert query["featured"] is True
+    assert query["genres"] == "Drama"
+    assert query["release_year"] == 1972
+    assert query["rating"] == {"$gte": 4.0}
+    # user input is escaped before it reaches the regex engine
+    assert query["$or"][0]["title"]["$regex"] == r"god\.father"
+
+def test_movie_sort_falls_back_to_created_at():
+    assert movie_sort("rating") == ("rating", -1)
+    assert movie_sort("bogus") == ("created_at", -1)
+
+def _seed_movies(db):
+    import asyncio
+    from models.movie import Movie
+
+    base = datetime(2024, 1, 1)
+    movies = [
+        Movie(title=f"Movie {i}", description="desc", genres=["Drama" if i % 2 else "Comedy"],
+              release_date=f"{2000 + i % 3}-01-01", rating=float(i % 5 + 1), status="approved",
+              created_at=base + timedelta(days=i))
+        for i in range(12)
+    ]
+    movies.append(Movie(title="Hidden", description="desc", status="pending", created_at=base))
+    asyncio.get_event_loop().run_until_complete(Movie.insert_many(movies))
+
+def test_get_all_movies_pages_in_database(db):
+    from fastapi.testclient import TestClient
+    from app import app
+
+    _seed_movies(db)
+    client = TestClient(app)
+
+    response = client.get("/api/v1/movies/", params={"limit": 5})
+    assert response.status_code == 200
+    assert response.headers["X-Total-Count"] == "12"
+    titles = [m["title"] for m in response.json()]
+    assert titles == ["Movie 11", "Movie 10", "Movie 9", "Movie 8", "Movie 7"]
+
+    response = client.get("/api/v1/movies/", params={"limit": 5, "page": 3})
+    assert [m["title"] for m in response.json()] == ["Movie 1", "Movie 0"]
+
+    response = client.get("/api/v1/movies/", params={"genre": "Drama", "year": 2001})
+    assert response.headers["X-Total-Count"] == "2"
+    assert {m["title"] for m in response.json()} == {"Movie 1", "Movie 7"}
+
+def test_batch_and_watchlist_keep_requested_order(db, admin_headers):
+    import asyncio
+    from fastapi.testclient import TestClient
+    from app import app
+    from models.movie import Movie
+    from models.user import User
+
+    loop = asyncio.get_event_loop()
+    approved = [Movie(title=f"A{i}", description="d", status="approved") for i in range(3)]
+    pending = Movie(title="P", description="d", status="pending")
+    for movie in approved + [pending]:
+        loop.run_until_complete(movie.insert())
+    order = [approved[2].id, pending.id, approved[0].id, approved[1].id]
+    loop.run_until_complete(User(username="u", email="u@example.com", password="x", watchlist=order).insert())
+
+    client = TestClient(app, headers=admin_headers)
+    response = client.post("/api/v1/movies/batch", json={"ids": [str(i) for i in order]})
+    assert [m["title"] for m in response.json()] == ["A2", "A0", "A1"]
+    assert client.post("/api/v1/movies/batch", json={"ids": ["nope"]}).status_code == 400
+
+    response = client.get("/api/v1/watchlist/u@example.com", params={"offset": 1, "limit": 2})
+    assert response.headers["X-Total-Count"] == "4"
+    assert [m["title"] for m in response.json()] == ["A0"]
+    response = client.get("/api/v1/watchlist/u@example.com", params={"offset": 10})
+    assert response.json() == [] and response.headers["X-Total-Count"] == "4"
+    assert client.get("/api/v1/watchlist/missing@example.com").status_code == 404
+
+def test_sparse_fieldsets_only_return_requested_fields(db, admin_headers):
+    import asyncio
+    from fastapi.testclient import TestClient
+    from app import app
+    from models.movie import Movie
+    from models.user import User
+
+    loop = asyncio.get_event_loop()
+    movie = Movie(title="Card", description="long text", genres=["Drama"], poster_url="p.jpg",
+                  rating=4.0, cast=[{"name": "A", "role": "B"}], status="approved")
+    pending = Movie(title="Queued", description="d", status="pending")
+    loop.run_until_complete(Movie.insert_many([movie, pending]))
+    movie = loop.run_until_complete(Movie.find_one(Movie.title == "Card"))
+    pending = loop.run_until_complete(Movie.find_one(Movie.title == "Queued"))
+    loop.run_until_complete(User(username="u", email="u@example.com", password="x", watchlist=[movie.id]).insert())
+
+    client = TestClient(app, headers=admin_headers)
+    card = {"id": str(movie.id), "title": "Card", "poster_url": "p.jpg", "rating": 4.0, "genres": ["Drama"]}
+    assert client.get("/api/v1/movies/", params={"fields": "card"}).json() == [card]
+    assert client.get("/api/v1/watchlist/u@example.com", params={"fields": "card"}).json() == [card]
+    assert client.get("/api/v1/movies/", params={"fields": "title,id"}).json() == [{"id": str(movie.id), "title": "Card"}]
+
+    pending_page = client.get("/api/v1/admin/movies/pending", params={"fields": "title", "limit": 1})
+    assert pending_page.json() == [{"id": str(pending.id), "title": "Queued"}]
+
+    assert client.get("/api/v1/movies/", params={"fields": "password"}).status_code == 400
+
+def test_serialize_movie_matches_movie_out_schema():
+    import json
+    from bson import ObjectId
+    from core.serialization import dumps, serialize_movie
+    from schemas.movie import MovieOut
+
+    doc = {"_id": ObjectId(), "title": "T", "description": "D", "cast": [{"name": "A", "role": "B"}],
+           "status": "approved", "created_at": datetime(2024, 1, 1, 12, 0, 0, 123000),
+           "updated_at": datetime(2024, 1, 2), "rating_sum": 9}
+    payload = json.loads(dumps(serialize_movie(doc)))
+    assert MovieOut(**payload).model_dump(mode="json") == payload
+    assert payload["genres"] == [] and payload["featured"] is False
+    assert "rating_sum" not in payload
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from bson import ObjectId
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor, paginate
+
+def test_cursor_round_trip():
+    doc_id = ObjectId()
+    when = datetime(2024, 5, 1, 12, 30)
+    cursor = encode_cursor("created_at", when, doc_id)
+    value, decoded_id = decode_cursor(cursor, "created_at")
+    assert value.replace(tzinfo=None) == when
+    assert decoded_id == doc_id
+
+def test_cursor_rejects_other_sort_field_and_garbage():
+    cursor = encode_cursor("rating", 4.5, ObjectId())
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "created_at")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor", "rating")
+
+def _walk(model, query, field, direction, limit):
+    loop = asyncio.get_event_loop()
+    seen, cursor = [], None
+    while True:
+        docs, cursor = loop.run_until_complete(paginate(model, query, field, direction, limit, cursor=cursor))
+        seen.extend(docs)
+        if not cursor:
+            return seen
+
+def test_paginate_walks_every_document_once_with_null_sort_values(db):
+    from models.movie import Movie
+
+    ratings = [5.0, 4.0, None, 4.0, 3.0, None, 4.0, 1.0]
+    movies = [Movie(title=f"M{i}", description="d", rating=r, status="approved") for i, r in enumerate(ratings)]
+    asyncio.get_event_loop().run_until_complete(Movie.insert_many(movies))
+
+    seen = _walk(Movie, {"status": "approved"}, "rating", -1, 3)
+    assert len(seen) == len(ratings)
+    assert len({m.id for m in seen}) == len(ratings)
+    assert [m.rating for m in seen] == [5.0, 4.0, 4.0, 4.0, 3.0, 1.0, None, None]
+
+def test_review_listing_returns_next_cursor(db):
+    from fastapi.testclient import TestClient
+    from app import app
+    from models.review import Review
+
+    movie_id = ObjectId()
+    base = datetime(2024, 1, 1)
+    reviews = [Review(movie_id=movie_id, user_id=f"u{i}", username=f"u{i}", rating=3,
+                      created_at=base + timedelta(hours=i)) for i in range(5)]
+    asyncio.get_event_loop().run_until_complete(Review.insert_many(reviews))
+
+    client = TestClient(app)
+    first = client.get(f"/api/v1/reviews/movie/{movie_id}", params={"limit": 3})
+    assert [r["user_id"] for r in first.json()] == ["u4", "u3", "u2"]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get(f"/api/v1/reviews/movie/{movie_id}", params={"limit": 3, "cursor": cursor})
+    assert [r["user_id"] for r in second.json()] == ["u1", "u0"]
+    assert "X-Next-Cursor" not in second.headers
+
+    assert client.get(f"/api/v1/reviews/movie/{movie_id}", params={"cursor": "bogus"}).status_code == 400
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+
+@pytest.fixture
+def fast_rounds(monkeypatch):
+    from core.config import settings
+
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", 5)
+    return settings
+
+def test_hash_and_verify(fast_rounds):
+    from core.passwords import hash_password, hash_rounds, verify_password
+
+    async def run():
+        stored = await hash_password("s3cret")
+        assert stored.startswith("$2b$") and hash_rounds(stored) == 5
+        assert await verify_password("s3cret", stored) == (True, False)
+        assert await verify_password("wrong", stored) == (False, False)
+        assert await verify_password("s3cret", None) == (False, False)
+        # legacy plaintext still verifies but asks for an upgrade
+        assert await verify_password("s3cret", "s3cret") == (True, True)
+        assert await verify_password("wrong", "s3cret") == (False, False)
+        fast_rounds.PASSWORD_BCRYPT_ROUNDS = 6
+        assert await verify_password("s3cret", stored) == (True, True)
+
+    asyncio.run(run())
+
+def test_login_upgrades_plaintext_passwords(db, fast_rounds):
+    from fastapi.testclient import TestClient
+    from app import app
+    from models.user import User
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(User(username="old", email="old@example.com", password="hunter2").insert())
+    client = TestClient(app)
+
+    assert client.post("/api/v1/auth/login", json={"email": "old@example.com", "password": "nope"}).status_code == 401
+    assert client.post("/api/v1/auth/login", json={"email": "old@example.com", "password": "hunter2"}).status_code == 200
+    stored = loop.run_until_complete(User.find_one({"email": "old@example.com"})).password
+    assert stored.startswith("$2b$05$")
+    assert client.post("/api/v1/auth/login", json={"email": "old@example.com", "password": "hunter2"}).status_code == 200
+
+    response = client.post(
+        "/api/v1/auth/signup", json={"username": "new", "email": "new@example.com", "password": "pw"}
+    )
+    assert response.status_code == 200
+    assert loop.run_until_complete(User.find_one({"email": "new@example.com"})).password.startswith("$2b$")
+    assert client.post("/api/v1/auth/login", json={"email": "nobody@example.com", "password": "pw"}).status_code == 401
+
+def test_unknown_users_pay_the_configured_cost(fast_rounds):
+    from core.passwords import dummy_hash, hash_rounds
+
+    assert hash_rounds(dummy_hash()) == 5
+    fast_rounds.PASSWORD_BCRYPT_ROUNDS = 6
+    assert hash_rounds(dummy_hash()) == 6
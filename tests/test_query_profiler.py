@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+
+def _started(name, command, request_id, connection=("db", 27017)):
+    return SimpleNamespace(command_name=name, command=command, request_id=request_id,
+                           connection_id=connection, database_name="cinecheck")
+
+def _succeeded(name, reply, request_id, micros=1000, connection=("db", 27017)):
+    return SimpleNamespace(command_name=name, reply=reply, request_id=request_id,
+                           connection_id=connection, duration_micros=micros)
+
+def test_queries_differing_only_in_values_share_a_shape():
+    from core.query_profiler import command_shape
+
+    a = command_shape("find", {"find": "movies", "filter": {"genres": "Drama", "rating": {"$gte": 4}}, "sort": {"rating": -1}})
+    b = command_shape("find", {"find": "movies", "filter": {"genres": "Comedy", "rating": {"$gte": 2}}, "sort": {"rating": -1}})
+    assert a == b == ("movies", {"filter": {"genres": "?", "rating": {"$gte": "?"}}, "sort": {"rating": -1}})
+    _, ids = command_shape("find", {"find": "movies", "filter": {"_id": {"$in": [1, 2, 3]}}})
+    assert ids == {"filter": {"_id": {"$in": "?"}}}
+
+def test_profiler_aggregates_shapes_and_follows_cursors(caplog):
+    from core.query_profiler import QueryProfiler
+
+    profiler = QueryProfiler(slow_ms=50)
+    for request_id, genre in enumerate(["Drama", "Comedy"]):
+        profiler.started(_started("find", {"find": "movies", "filter": {"genres": genre}}, request_id))
+        profiler.succeeded(_succeeded("find", {"cursor": {"id": 7 + request_id, "firstBatch": [{}] * 101}}, request_id))
+    profiler.started(_started("getMore", {"getMore": 7, "collection": "movies"}, 10))
+    profiler.succeeded(_succeeded("getMore", {"cursor": {"id": 0, "nextBatch": [{}] * 20}}, 10, micros=80_000))
+    profiler.started(_started("hello", {"hello": 1}, 11))
+    profiler.succeeded(_succeeded("hello", {}, 11))
+
+    [stats] = profiler.top()
+    assert (stats.count, stats.docs, stats.slow) == (3, 222, 1)
+    assert stats.max_ms == 80
+    assert stats.sample == {"find": "movies", "filter": {"genres": "Comedy"}}
+    assert "Slow query (80.0 ms)" in caplog.text
+    assert 7 not in profiler._cursors and 8 in profiler._cursors
+
+def test_admin_query_shapes_endpoint(db, admin_headers):
+    from app import app
+    from core.query_profiler import query_profiler
+
+    query_profiler.reset()
+    query_profiler.started(_started("count", {"count": "reviews", "query": {"movie_id": "abc"}}, 1))
+    query_profiler.succeeded(_succeeded("count", {"n": 4}, 1))
+
+    client = TestClient(app, headers=admin_headers)
+    shapes = client.get("/api/v1/admin/queries").json()["shapes"]
+    assert shapes[0]["collection"] == "reviews"
+    assert shapes[0]["shape"] == {"query": {"movie_id": "?"}}
+    assert shapes[0]["docs_returned"] == 4
+
+    assert client.delete("/api/v1/admin/queries").status_code == 200
+    assert client.get("/api/v1/admin/queries").json()["shapes"] == []
@@ -0,0 +1,113 @@
+import asyncio
+import pytest
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_memory_bucket_allows_burst_then_refills():
+    from core.rate_limit import MemoryBucketBackend
+
+    clock = Clock()
+    backend = MemoryBucketBackend(clock=clock)
+
+    async def run():
+        results = [await backend.take("login:1.2.3.4", rate=1, burst=3) for _ in range(4)]
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        assert results[-1][1] == pytest.approx(1.0)
+        clock.now += 1
+        assert (await backend.take("login:1.2.3.4", rate=1, burst=3))[0] is True
+        # other clients have their own budget
+        assert (await backend.take("login:5.6.7.8", rate=1, burst=3))[0] is True
+
+    asyncio.run(run())
+
+def test_redis_backend_shares_a_window_budget(fake_redis):
+    from core.rate_limit import RedisBucketBackend
+
+    clock = Clock()
+    worker_a = RedisBucketBackend(fake_redis, clock=clock)
+    worker_b = RedisBucketBackend(fake_redis, clock=clock)
+
+    async def run():
+        assert (await worker_a.take("review_write:c", rate=1, burst=2))[0] is True
+        assert (await worker_b.take("review_write:c", rate=1, burst=2))[0] is True
+        allowed, retry_after = await worker_a.take("review_write:c", rate=1, burst=2)
+        assert allowed is False and 0 < retry_after <= 2
+        assert set(fake_redis.expiry.values()) == {2}
+        clock.now += 2
+        assert (await worker_b.take("review_write:c", rate=1, burst=2))[0] is True
+
+    asyncio.run(run())
+
+def test_load_shedder_queues_then_rejects():
+    from core.rate_limit import LoadShedder
+
+    shedder = LoadShedder(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+
+    async def run():
+        assert await shedder.acquire() is True
+        waiting = asyncio.create_task(shedder.acquire())
+        await asyncio.sleep(0)
+        assert shedder.queued == 1
+        # queue is full: turned away without waiting
+        assert await shedder.acquire() is False
+        assert await waiting is False  # timed out in the queue
+        shedder.release()
+        assert await shedder.acquire() is True
+        assert (shedder.shed_queue_full, shedder.shed_timeout, shedder.max_queued_seen) == (1, 1, 1)
+
+    asyncio.run(run())
+
+def test_middleware_returns_429_with_retry_after(db, admin_headers, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app import app
+    from core.config import settings
+
+    # unknown emails are checked against a dummy hash at the configured cost
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", 4)
+
+    client = TestClient(app)
+    credentials = {"email": "nobody@example.com", "password": "pw"}
+    statuses = [client.post("/api/v1/auth/login", json=credentials).status_code for _ in range(6)]
+    assert statuses == [401] * 5 + [429]
+    response = client.post("/api/v1/auth/login", json=credentials)
+    assert int(response.headers["Retry-After"]) >= 1
+
+    # budgets are per client and per route
+    other = client.post("/api/v1/auth/login", json=credentials, headers={"X-Forwarded-For": "10.0.0.9"})
+    assert other.status_code == 401
+    assert client.get("/api/v1/movies/").status_code == 200
+    assert client.get("/health/live").status_code == 200
+
+    stats = client.get("/api/v1/admin/load/stats", headers=admin_headers).json()
+    assert stats["rate_limited"] == {"login": 2}
+    assert stats["queue_depth"] == 0
+
+def test_spoofed_forwarded_for_does_not_get_a_fresh_bucket(db, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app import app
+    from core.config import settings
+    from core.rate_limit import client_id
+
+    # unknown emails are checked against a dummy hash at the configured cost
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", 4)
+
+    scope = {"headers": [(b"x-forwarded-for", b"1.1.1.1, 203.0.113.7")], "client": ("10.0.0.1", 5000)}
+    assert client_id(scope, trusted_hops=1) == "203.0.113.7"
+    assert client_id(scope, trusted_hops=2) == "1.1.1.1"
+    assert client_id(scope, trusted_hops=0) == "10.0.0.1"
+    assert client_id({"headers": [], "client": ("10.0.0.1", 5000)}, trusted_hops=1) == "10.0.0.1"
+
+    client = TestClient(app)
+    credentials = {"email": "nobody@example.com", "password": "pw"}
+    statuses = [
+        client.post(
+            "/api/v1/auth/login", json=credentials, headers={"X-Forwarded-For": f"192.0.2.{n}, 203.0.113.7"}
+        ).status_code
+        for n in range(8)
+    ]
+    assert statuses == [401] * 5 + [429] * 3
@@ -0,0 +1,95 @@
+import asyncio
+from services.rating_service import apply_rating_change, rebuild_rating_aggregates
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+def test_rating_changes_adjust_aggregates_by_delta(db):
+    from models.movie import Movie
+
+    movie = Movie(title="Heat", description="d", status="approved")
+    _run(movie.insert())
+    movie_id = str(movie.id)
+
+    _run(apply_rating_change(movie_id, None, 5))
+    _run(apply_rating_change(movie_id, None, 4))
+    after = _run(apply_rating_change(movie_id, None, 4))
+    assert after["rating_sum"] == 13
+    assert after["rating_count"] == 3
+    assert after["rating"] == 4.3
+    assert after["rating_histogram"] == {"4": 2, "5": 1}
+
+    # editing a review moves one vote between buckets without changing the count
+    after = _run(apply_rating_change(movie_id, 5, 1))
+    assert (after["rating_sum"], after["rating_count"]) == (9, 3)
+    assert after["rating_histogram"] == {"1": 1, "4": 2, "5": 0}
+
+    _run(apply_rating_change(movie_id, 4, None))
+    _run(apply_rating_change(movie_id, 4, None))
+    after = _run(apply_rating_change(movie_id, 1, None))
+    assert after["rating_count"] == 0
+    assert after["rating"] is None
+
+def test_rebuild_rating_aggregates_from_reviews(db):
+    from models.movie import Movie
+    from models.review import Review
+
+    rated = Movie(title="Rated", description="d", status="approved")
+    stale = Movie(title="Stale", description="d", status="approved", rating=5.0, rating_sum=5, rating_count=1)
+    _run(Movie.insert_many([rated, stale]))
+    rated = _run(Movie.find_one(Movie.title == "Rated"))
+    _run(Review.insert_many([
+        Review(movie_id=rated.id, user_id="a", username="a", rating=3),
+        Review(movie_id=rated.id, user_id="b", username="b", rating=4),
+    ]))
+
+    assert _run(rebuild_rating_aggregates()) == 1
+
+    rated = _run(Movie.find_one(Movie.title == "Rated"))
+    assert (rated.rating_sum, rated.rating_count, rated.rating) == (7, 2, 3.5)
+    assert rated.rating_histogram == {"1": 0, "2": 0, "3": 1, "4": 1, "5": 0}
+    stale = _run(Movie.find_one(Movie.title == "Stale"))
+    assert (stale.rating_count, stale.rating) == (0, None)
+    # unrated movies are reset by the run's stamp, not by a list of every rated id
+    assert stale.ratings_rebuilt_at == rated.ratings_rebuilt_at is not None
+
+def test_concurrent_review_writes_keep_aggregates_consistent(db, monkeypatch):
+    from fastapi import HTTPException
+    from api.v1.review_routes import create_review, delete_review
+    from core.security import TokenUser
+    from models.movie import Movie
+    from models.review import Review
+    from schemas.review import ReviewCreate
+
+    movie = Movie(title="Heat", description="d", status="approved")
+    _run(movie.insert())
+    user = TokenUser(email="a@example.com", username="a", role="user")
+
+    # mongomock never yields to the loop; make document writes do so, the way a real round trip would
+    for name in ("save", "insert", "delete"):
+        original = getattr(Review, name)
+        async def yielding(self, *args, _original=original, **kwargs):
+            await asyncio.sleep(0)
+            return await _original(self, *args, **kwargs)
+        monkeypatch.setattr(Review, name, yielding)
+
+    def write(rating):
+        return create_review(ReviewCreate(movie_id=str(movie.id), rating=rating), user)
+
+    async def edits():
+        await write(3)
+        await asyncio.gather(write(5), write(1), write(4))
+
+    _run(edits())
+    [review] = _run(Review.find(Review.movie_id == movie.id).to_list())
+    after = _run(Movie.get(movie.id))
+    assert (after.rating_sum, after.rating_count) == (review.rating, 1)
+    assert sum(after.rating_histogram.values()) == 1 and min(after.rating_histogram.values()) == 0
+
+    async def deletes():
+        return await asyncio.gather(*(delete_review(str(review.id), user) for _ in range(2)), return_exceptions=True)
+
+    results = _run(deletes())
+    assert sum(isinstance(result, HTTPException) and result.status_code == 404 for result in results) <= 1
+    after = _run(Movie.get(movie.id))
+    assert (after.rating_sum, after.rating_count, after.rating) == (0, 0, None)
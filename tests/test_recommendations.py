@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+
+# The batch recompute's optional dependencies (requirements-recs.txt)
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy.sparse")
+
+from services.recommendation_service import item_neighbors
+
+def test_item_neighbors_cosine_top_k():
+    # users 0-2 liked items 0 and 1; user 3 liked items 1 and 2; item 3 has no co-likes
+    users = np.array([0, 0, 1, 1, 2, 2, 3, 3, 4], dtype=np.int32)
+    items = np.array([0, 1, 0, 1, 0, 1, 1, 2, 3], dtype=np.int32)
+    result = {
+        item: (neighbours.tolist(), scores.tolist())
+        for item, neighbours, scores in item_neighbors(users, items, 5, 4, top_k=2, min_support=1, max_batch_cells=4)
+    }
+
+    assert sorted(result) == [0, 1, 2]  # item 3 shares no users with anything
+    assert result[0][0] == [1] and result[0][1][0] == pytest.approx(3 / np.sqrt(3 * 4))
+    assert result[1][0] == [0, 2]
+    assert result[2][0] == [1] and result[2][1][0] == pytest.approx(1 / np.sqrt(1 * 4))
+
+    supported = {item: neighbours.tolist() for item, neighbours, _ in item_neighbors(users, items, 5, 4, min_support=2)}
+    assert supported == {0: [1], 1: [0]}
+
+def test_recompute_and_serve_similar_movies(db):
+    from app import app
+    from models.movie import Movie
+    from models.review import Review
+    from services.recommendation_service import recompute_collaborative
+
+    loop = asyncio.get_event_loop()
+    movies = [Movie(title=f"Movie {n}", description="A film", genres=["Drama"], status="approved") for n in range(3)]
+    for movie in movies:
+        loop.run_until_complete(movie.insert())
+    reviews = [
+        Review(movie_id=movies[m].id, user_id=f"user{u}", username=f"user{u}", rating=rating)
+        for u, m, rating in [(0, 0, 5), (0, 1, 4), (1, 0, 4), (1, 1, 5), (1, 2, 2), (2, 2, 5), (2, 0, 5)]
+    ]
+    loop.run_until_complete(Review.insert_many(reviews))
+
+    report = loop.run_until_complete(recompute_collaborative(min_support=2))
+    assert (report["movies"], report["users"], report["likes"], report["movies_with_neighbors"]) == (3, 3, 6, 2)
+
+    client = TestClient(app)
+    similar = client.get(f"/api/v1/movies/{movies[0].id}/similar").json()
+    assert [(entry["id"], entry["title"]) for entry in similar] == [(str(movies[1].id), "Movie 1")]
+    assert similar[0]["score"] == pytest.approx(2 / np.sqrt(3 * 2), abs=1e-4)
+
+    assert client.get(f"/api/v1/movies/{movies[2].id}/similar").json() == []
+    assert client.get("/api/v1/movies/not-an-id/similar").status_code == 400
+
+def test_content_neighbors_from_metadata():
+    from services.recommendation_service import content_neighbors, content_tokens, feature_matrix
+
+    movies = [
+        {"genres": ["Sci-Fi", "Action"], "director": "Lana Wachowski", "cast": [{"name": "Keanu Reeves"}], "release_year": 1999},
+        {"genres": ["sci fi", "Action"], "director": "Lana Wachowski", "cast": [{"name": "Keanu Reeves"}], "release_year": 2003},
+        {"genres": ["Action"], "cast": [{"name": "Keanu Reeves"}], "release_year": 2014},
+        {"genres": ["Romance"], "language": "French"},
+    ]
+    assert content_tokens(movies[0])["genre:sci fi"] == pytest.approx(1 / np.sqrt(2))
+
+    result = {row: neighbours.tolist() for row, neighbours, _ in content_neighbors(feature_matrix([content_tokens(m) for m in movies]))}
+    assert result == {0: [1, 2], 1: [0, 2], 2: [0, 1]}  # nothing shares a feature with the French romance
+
+def test_approval_updates_content_neighbors_incrementally(db, admin_headers):
+    from app import app
+    from models.movie import CastMember, Movie
+    from models.movie_similarity import MovieSimilarity
+    from services.recommendation_service import CONTENT, recompute_content
+
+    loop = asyncio.get_event_loop()
+    def movie(title, status="approved", **fields):
+        doc = Movie(title=title, description="A film", status=status, **fields)
+        loop.run_until_complete(doc.insert())
+        return doc
+
+    heat = movie("Heat", genres=["Crime"], director="Michael Mann", cast=[CastMember(name="Al Pacino", role="Vincent")])
+    collateral = movie("Collateral", genres=["Crime"], director="Michael Mann")
+    amelie = movie("Amelie", genres=["Romance"], language="French")
+    loop.run_until_complete(recompute_content())
+    client = TestClient(app, headers=admin_headers)
+    assert [m["id"] for m in client.get(f"/api/v1/movies/{collateral.id}/similar").json()] == [str(heat.id)]
+
+    thief = movie("Thief", status="pending", genres=["Crime"], director="Michael Mann", cast=[CastMember(name="Al Pacino", role="x")])
+    assert client.get(f"/api/v1/movies/{thief.id}/similar").json() == []
+    assert client.post(f"/api/v1/movies/admin/{thief.id}/approve").status_code == 200
+
+    # the new movie gets its own list and enters its neighbours' lists, without a full recompute
+    incremental = client.get(f"/api/v1/movies/{thief.id}/similar?kind=content").json()
+    assert [m["title"] for m in incremental] == ["Heat", "Collateral"]
+    assert [m["title"] for m in client.get(f"/api/v1/movies/{heat.id}/similar").json()] == ["Thief", "Collateral"]
+    assert loop.run_until_complete(MovieSimilarity.find({"movie_id": amelie.id, "kind": CONTENT}).count()) == 0
+
+    # and scores the way the full recompute does
+    loop.run_until_complete(recompute_content())
+    assert client.get(f"/api/v1/movies/{thief.id}/similar?kind=content").json() == incremental
+
+    assert client.post(f"/api/v1/movies/admin/{thief.id}/reject").status_code == 200
+    assert [m["title"] for m in client.get(f"/api/v1/movies/{heat.id}/similar").json()] == ["Collateral"]
+    assert client.get(f"/api/v1/movies/{thief.id}/similar").json() == []
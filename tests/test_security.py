@@ -0,0 +1,128 @@
+import asyncio
+import jwt
+import pytest
+from conftest import auth_headers
+
+def test_token_verifier_caches_and_honours_revocations():
+    from types import SimpleNamespace
+    from core.security import RevocationList, TokenVerifier, create_access_token
+
+    revocations = RevocationList()
+    verifier = TokenVerifier(revocations, max_entries=2)
+    token = create_access_token(SimpleNamespace(email="a@example.com", username="a", role="user", token_version=0))
+
+    assert verifier.verify(token)["sub"] == "a@example.com"
+    assert verifier.verify(token)["role"] == "user"
+    assert (verifier.hits, verifier.misses) == (1, 1)
+
+    revocations.set("a@example.com", 1)
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(token)
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(token + "x")
+
+def test_expired_and_forged_tokens_are_rejected():
+    from datetime import datetime, timedelta, timezone
+    from core.config import settings
+    from core.security import RevocationList, TokenVerifier
+
+    verifier = TokenVerifier(RevocationList())
+    expired = jwt.encode(
+        {"sub": "a@example.com", "exp": datetime.now(timezone.utc) - timedelta(minutes=1)},
+        settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM,
+    )
+    forged = jwt.encode({"sub": "a@example.com", "exp": 4102444800, "role": "admin"}, "not-the-secret", algorithm="HS256")
+    for token in (expired, forged):
+        with pytest.raises(jwt.InvalidTokenError):
+            verifier.verify(token)
+
+def test_login_token_scopes_user_routes(db, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app import app
+    from core.config import settings
+    from models.user import User
+
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", 4)
+    client = TestClient(app)
+    client.post("/api/v1/auth/signup", json={"username": "ann", "email": "ann@example.com", "password": "pw"})
+    login = client.post("/api/v1/auth/login", json={"email": "ann@example.com", "password": "pw"}).json()
+    assert login["token_type"] == "bearer"
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+
+    assert client.get("/api/v1/watchlist/ann@example.com").status_code == 401
+    assert client.get("/api/v1/watchlist/ann@example.com", headers=headers).status_code == 200
+    assert client.get("/api/v1/watchlist/bob@example.com", headers=headers).status_code == 403
+    assert client.get("/api/v1/admin/movies/pending", headers=headers).status_code == 403
+    assert client.get("/api/v1/admin/movies/pending", headers=auth_headers(role="admin")).status_code == 200
+
+    # Authentication never reads the users collection
+    async def no_lookup(*args, **kwargs):
+        raise AssertionError("auth must not query users")
+
+    monkeypatch.setattr(User, "find_one", no_lookup)
+    assert client.get("/api/v1/admin/movies/pending", headers=auth_headers(role="admin")).status_code == 200
+    monkeypatch.undo()
+
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == 200
+    assert client.get("/api/v1/watchlist/ann@example.com", headers=headers).status_code == 401
+    version = asyncio.get_event_loop().run_until_complete(User.find_one({"email": "ann@example.com"})).token_version
+    assert version == 1
+
+def test_signup_cannot_choose_its_role(db, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app import app
+    from core.config import settings
+    from services.user_service import set_role
+
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", 4)
+    client = TestClient(app)
+    signup = client.post(
+        "/api/v1/auth/signup",
+        json={"username": "eve", "email": "eve@example.com", "password": "pw", "role": "admin"},
+    ).json()
+    assert signup["user"]["role"] == "user"
+    headers = {"Authorization": f"Bearer {signup['access_token']}"}
+    assert client.get("/api/v1/admin/", headers=headers).status_code == 403
+
+    # promotion is server-side only, and revokes tokens minted with the old role
+    assert asyncio.get_event_loop().run_until_complete(set_role("eve@example.com", "admin"))
+    assert client.get("/api/v1/admin/", headers=headers).status_code == 401
+    login = client.post("/api/v1/auth/login", json={"email": "eve@example.com", "password": "pw"}).json()
+    assert login["user"]["role"] == "admin"
+    assert client.get("/api/v1/admin/", headers={"Authorization": f"Bearer {login['access_token']}"}).status_code == 200
+
+def test_placeholder_secret_is_refused(monkeypatch):
+    from types import SimpleNamespace
+    from fastapi.testclient import TestClient
+    from app import app
+    from core.config import settings
+    from core.security import InsecureSecretError, PLACEHOLDER_JWT_SECRET, create_access_token
+
+    monkeypatch.setattr(settings, "JWT_SECRET", PLACEHOLDER_JWT_SECRET)
+    with pytest.raises(InsecureSecretError):
+        create_access_token(SimpleNamespace(email="a@example.com", username="a", role="user", token_version=0))
+    with pytest.raises(InsecureSecretError):
+        with TestClient(app):  # startup
+            pass
+
+def test_revocations_from_other_workers_are_picked_up(db, monkeypatch):
+    from datetime import datetime
+    from fastapi.testclient import TestClient
+    from app import app
+    from core.config import settings
+    from core.security import revocations
+    from models.user import User
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(User(username="ann", email="ann@example.com", password="x").insert())
+    headers = auth_headers(email="ann@example.com")
+    client = TestClient(app)
+    assert client.get("/api/v1/watchlist/ann@example.com", headers=headers).status_code == 200
+
+    # a logout handled by another worker only touches the database
+    loop.run_until_complete(User.get_motor_collection().update_one(
+        {"email": "ann@example.com"}, {"$inc": {"token_version": 1}, "$set": {"token_revoked_at": datetime.utcnow()}}
+    ))
+    monkeypatch.setattr(settings, "TOKEN_REVOCATION_REFRESH_SECONDS", 0)
+    revocations._next_refresh = 0
+    assert client.get("/api/v1/watchlist/ann@example.com", headers=headers).status_code == 401
@@ -0,0 +1,51 @@
+import asyncio
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def api(db, monkeypatch):
+    from vercel_api import api
+
+    # The db fixture has already initialised Beanie, as a warm instance would have
+    monkeypatch.setattr(api, "_db_ready", True)
+    return api
+
+def test_app_serves_the_fastapi_app(api):
+    from fastapi.testclient import TestClient
+
+    client = TestClient(api.app)
+    response = client.get("/")
+    assert response.status_code == 200
+    assert response.json()["message"] == "CineCheck API is running!"
+
+    response = client.get("/api/v1/movies/", params={"limit": 5})
+    assert response.status_code == 200
+    assert response.headers["x-total-count"] == "0"
+    assert response.json() == []
+
+def test_asgi_app_is_the_only_entry_point(api):
+    # @vercel/python prefers a module-level `handler` over `app`
+    assert not hasattr(api, "handler")
+
+def test_database_is_initialised_once(monkeypatch):
+    from vercel_api import api
+    import core.db
+
+    calls = []
+
+    async def fake_init_db():
+        calls.append(1)
+
+    monkeypatch.setattr(api, "_db_ready", False)
+    monkeypatch.setattr(api, "_db_lock", None)
+    monkeypatch.setattr(core.db, "init_db", fake_init_db)
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(api.ensure_db())
+        loop.run_until_complete(api.ensure_db())
+    finally:
+        loop.close()
+    assert calls == [1]
@@ -1,8 +1,67 @@
-import json
-
-def handler(event, context):
-    return {
-        'statusCode': 200,
-        'headers': {'Content-Type': 'text/plain'},
-        'body': 'OK'
-    }
\ No newline at end of file
+"""
+Serverless entry point for Vercel.
+
+Serves the FastAPI app from src/app.py. Module import is kept to the standard
+library: the app (FastAPI, Beanie, Motor...) is imported on the first invocation,
+and the database is initialised on the first request that reaches the app.
+Both are then kept for every warm invocation of the same instance.
+
+The only entry point is `app`, an ASGI callable: @vercel/python looks for a
+`handler` first, so none is defined here.
+"""
+import asyncio
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+# Index creation/verification belongs in deploy tooling (manage.py), not every cold start
+os.environ.setdefault("INDEX_SETUP_ON_STARTUP", "false")
+
+_asgi_app = None
+_db_ready = False
+_db_lock = None
+
+def get_app():
+    """Import src/app.py on first use; later calls return the same instance"""
+    global _asgi_app
+    if _asgi_app is None:
+        from app import app as fastapi_app
+
+        _asgi_app = fastapi_app
+    return _asgi_app
+
+async def ensure_db():
+    """Initialise the shared Motor client and Beanie once per instance"""
+    global _db_ready, _db_lock
+    if _db_ready:
+        return
+    if _db_lock is None:
+        _db_lock = asyncio.Lock()
+    async with _db_lock:
+        if not _db_ready:
+            from core.db import init_db
+
+            await init_db()
+            _db_ready = True
+
+async def _lifespan(receive, send):
+    # Startup is lazy (ensure_db) and serverless instances are frozen rather than
+    # shut down, so lifespan events are acknowledged without running the app's lifespan
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    fastapi_app = get_app()
+    await ensure_db()
+    await fastapi_app(scope, receive, send)